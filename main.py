@@ -14,6 +14,7 @@ Created on Sat Dec  6 11:03:27 2025
 
 import sys
 import os
+import argparse
 
 # Add strategies directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'strategies'))
@@ -22,11 +23,62 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'strategies'))
 from strategies import strategies, list_strategies
 from utils.simulator import simulate, compare_strategies
 from utils.visualizer import render, visualize_results
-from utils.analyzer import generate_report
+from utils.analyzer import (generate_report, generate_monte_carlo_report,
+                            generate_verification_report)
+from utils.budget import StepBudget
+from utils.storage import save_results
 
 
-def main():
+def parse_args(argv=None):
+    """Command line options for the simulation sweep"""
+    parser = argparse.ArgumentParser(description="Train Carriage Problem Simulator")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes for the sweep "
+                             "(1 = serial, 0 = one per CPU)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-simulate everything instead of reusing "
+                             "cached results")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted sweep from "
+                             "simulation_results/simulation_results.jsonl")
+    parser.add_argument("--fixed-budget", action="store_true",
+                        help="give every run max_steps instead of a budget "
+                             "predicted from the strategy's earlier runs")
+    parser.add_argument("--profile-phases", action="store_true",
+                        help="record steps, toggles, reversals and time per "
+                             "strategy phase")
+    parser.add_argument("--tuned", metavar="PATH",
+                        help="register the Pareto-optimal Random-Signature "
+                             "variants from a tuning results file "
+                             "(python -m utils.tuning --save PATH)")
+    parser.add_argument("--monte-carlo", action="store_true",
+                        help="sample random configurations per n until the "
+                             "confidence intervals are narrow enough")
+    parser.add_argument("--ci-width", type=float, default=0.02,
+                        help="Monte Carlo target half-width of the mean steps "
+                             "interval, relative to the mean")
+    parser.add_argument("--verify", type=int, metavar="N",
+                        help="run every strategy on all 2^n initial "
+                             "configurations for n = 1..N and report "
+                             "counterexamples")
+    parser.add_argument("--seeding", choices=["legacy", "stream"], default="legacy",
+                        help="random lamp rings as in older versions (legacy) "
+                             "or from an independent NumPy stream per config")
+    parser.add_argument("--run", metavar="NAME",
+                        help="partition name under simulation_results/runs "
+                             "(default: start time)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
+    
+    if args.tuned:
+        from utils.tuning import register_winners
+        for name in register_winners(args.tuned):
+            print(f"Registered tuned strategy: {name}")
+    
     print("Verfügbare Strategien:")
     for i, name in enumerate(list_strategies(), 1):
         print(f"  {i}. {name}")
@@ -74,6 +126,31 @@ def main():
         (17, 1),
         
     ]
+    if args.monte_carlo:
+        # Imported here: pulls in the batch engine and its strategy modules
+        from utils.montecarlo import monte_carlo
+        sizes = sorted({n for n, _ in test_configs})
+        print(f"\nMonte Carlo: {len(sizes)} train lengths with {len(strategies)} strategies")
+        print("="*80)
+        mc_df = monte_carlo(sizes, strategies, max_steps=5000, rel_width=args.ci_width)
+        os.makedirs("simulation_results", exist_ok=True)
+        mc_df.to_csv(os.path.join("simulation_results", "monte_carlo_results.csv"), index=False)
+        save_results(mc_df, "simulation_results/runs", run=args.run, name="monte_carlo")
+        generate_monte_carlo_report(mc_df)
+        return
+    
+    if args.verify:
+        from utils.verify import verify_strategies
+        print(f"\nExhaustive verification up to n={args.verify} with {len(strategies)} strategies")
+        print("="*80)
+        verify_df = verify_strategies(range(1, args.verify + 1), strategies,
+                                      max_steps=5000, workers=args.jobs)
+        os.makedirs("simulation_results", exist_ok=True)
+        verify_df.to_csv(os.path.join("simulation_results", "verification_results.csv"), index=False)
+        save_results(verify_df, "simulation_results/runs", run=args.run, name="verification")
+        generate_verification_report(verify_df)
+        return
+    
     print(f"\nTeste {len(test_configs)} Konfigurationen mit {len(strategies)} Strategien")
     print("="*80)
     
@@ -88,8 +165,15 @@ def main():
         max_steps=5000,
         save_images=True,
         output_dir="simulation_results",
-        abort_incorrect_strategies = True
+        abort_incorrect_strategies = True,
+        workers=args.jobs,
+        cache_dir=None if args.no_cache else "simulation_results/cache",
+        resume=args.resume,
+        budget=None if args.fixed_budget else StepBudget(max_steps=5000),
+        profile_phases=args.profile_phases,
+        seeding=args.seeding
     )
+    save_results(results_df, "simulation_results/runs", run=args.run)
     
     # Generate detailed report
     generate_report(results_df)
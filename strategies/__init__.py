@@ -6,48 +6,190 @@ Created on Sun Dec  7 15:16:04 2025
 """
 
 """
-Strategies package - automatically collects all strategy modules.
+Strategies package - lazily collects all strategy modules.
+
+Strategy modules are scanned with ``ast`` instead of being imported: every
+top-level function whose first parameters are ``(lamp_state, memory)`` is a
+strategy, as is every instance of a ``Strategy`` subclass (protocol v2, see
+``base_strategy``). Only functions that compute their own title
+(``get_title``), transition tables and v2 instances need an import to learn
+their name. The resulting
+manifest (name → module:attribute) is cached in ``__pycache__`` and keyed by
+the module sources, so later starts import nothing until a strategy is
+actually requested through ``get_strategy`` or iteration.
+
+A transition table or v2 instance titled like a function strategy of the
+same module is a faster port of that algorithm; it takes the function's
+place in the registry, so every algorithm is swept once, on its fastest
+engine.
 """
-import os
+import ast
+import hashlib
 import importlib
-from typing import Dict, Callable
-
-# Dictionary to hold all strategies
-strategies: Dict[str, Callable] = {}
+import json
+import os
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-# Automatically import all .py files in this directory (except __init__.py)
 package_dir = os.path.dirname(__file__)
+_EXCLUDED = ['__init__.py', 'base_strategy.py', 'transition_table.py']
+_MANIFEST_PATH = os.path.join(package_dir, '__pycache__', 'strategy_manifest.json')
+
+
+def _module_files() -> List[str]:
+    return sorted(f for f in os.listdir(package_dir)
+                  if f.endswith('.py') and f not in _EXCLUDED)
+
+
+def _scan_module(source: str) -> List[Tuple[str, str, bool]]:
+    """
+    Find strategy attributes of a module without importing it.
 
-for filename in os.listdir(package_dir):
-    if filename.endswith('.py') and filename not in ['__init__.py', 'base_strategy.py']:
-        module_name = filename[:-3]  # Remove .py extension
-        
+    Returns:
+        List of (attribute, function it refers to, needs_import_for_title,
+        is_port), is_port marking tables and v2 instances
+    """
+    tree = ast.parse(source)
+    functions = {}
+    classes = set()
+    found = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            params = [a.arg for a in node.args.args]
+            if len(params) >= 2 and params[0] == 'lamp_state' and params[1] == 'memory':
+                keyword_params = params + [a.arg for a in node.args.kwonlyargs]
+                functions[node.name] = 'get_title' in keyword_params
+                found.append((node.name, node.name, functions[node.name], False))
+        elif isinstance(node, ast.ClassDef):
+            bases = {getattr(b, 'id', getattr(b, 'attr', None)) for b in node.bases}
+            if 'Strategy' in bases or bases & classes:
+                classes.add(node.name)
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            value = node.value
+            if isinstance(value, ast.Name) and value.id in functions:
+                # Alias of a strategy function
+                found.append((name, value.id, functions[value.id], False))
+            elif isinstance(value, ast.Call) and \
+                    getattr(value.func, 'id', getattr(value.func, 'attr', None)) == 'TransitionTable':
+                # Declarative table: title lives in its spec
+                found.append((name, name, True, True))
+            elif isinstance(value, ast.Call) and getattr(value.func, 'id', None) in classes:
+                # Protocol v2 instance: title is a class attribute
+                found.append((name, name, True, True))
+    return [entry for entry in found if not entry[0].startswith('_')]
+
+
+def _build_manifest(sources: Dict[str, str]) -> List[Tuple[str, str, str]]:
+    """
+    Build the ordered manifest [(strategy name, module, attribute)].
+
+    Names follow the original eager loader: the title returned by
+    ``get_title`` if supported, else the module name in title case. A port
+    (table or v2 instance) wins over a function of the same name.
+    """
+    manifest: Dict[str, Tuple[str, str]] = {}
+    ports = set()
+    for module_name, source in sources.items():
         try:
-            # Import the module
-            module = importlib.import_module(f'.{module_name}', package='strategies')
-            
-            # Look for strategy functions in the module
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                # Check if it's a callable function (not a class or built-in)
-                if callable(attr) and not attr_name.startswith('_'):
-                    # Check if it has the right signature (lamp_state, memory) params
-                    try:
-                        import inspect
-                        sig = inspect.signature(attr)
-                        params = list(sig.parameters.keys())
-                        if len(params) >= 2 and params[0] == 'lamp_state' and params[1] == 'memory':
-                            # Use module name or function name as key
-                            if "get_title" in params:
-                                strategy_name = attr(None,None,get_title=True)
-                            else:
-                                strategy_name = module_name.replace('_', '-').title()
-                            strategies[strategy_name] = attr
-                            print(f"Loaded strategy: {strategy_name} from {module_name}.py")
-                    except:
-                        pass
+            entries = _scan_module(source)
+            module = None
+            # Alphabetical like dir(); later attributes win on equal names
+            for attr_name, _, needs_import, is_port in sorted(entries):
+                if needs_import:
+                    if module is None:
+                        module = importlib.import_module(f'.{module_name}', package='strategies')
+                    strategy_name = getattr(module, attr_name)(None, None, get_title=True)
+                else:
+                    strategy_name = module_name.replace('_', '-').title()
+                if strategy_name in ports and not is_port:
+                    continue
+                if is_port:
+                    ports.add(strategy_name)
+                manifest[strategy_name] = (module_name, attr_name)
         except Exception as e:
             print(f"Error loading module {module_name}: {e}")
+    return [(name, module, attr) for name, (module, attr) in manifest.items()]
+
+
+def _load_manifest() -> List[Tuple[str, str, str]]:
+    """Cached manifest, rebuilt whenever a strategy module changes."""
+    sources = {}
+    for filename in _module_files():
+        with open(os.path.join(package_dir, filename), encoding='utf-8') as f:
+            sources[filename[:-3]] = f.read()
+    digest = hashlib.sha256(json.dumps(sources, sort_keys=True).encode('utf-8')).hexdigest()
+
+    try:
+        with open(_MANIFEST_PATH, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('digest') == digest:
+            return [tuple(entry) for entry in cached['strategies']]
+    except (OSError, ValueError):
+        pass
+
+    manifest = _build_manifest(sources)
+    try:
+        os.makedirs(os.path.dirname(_MANIFEST_PATH), exist_ok=True)
+        with open(_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'digest': digest, 'strategies': manifest}, f, indent=1)
+    except OSError:
+        pass  # read-only install: rebuild next time
+    return manifest
+
+
+class LazyStrategyRegistry(MutableMapping):
+    """
+    Mapping of strategy name → strategy callable.
+
+    Holds "module:attribute" references from the manifest and imports a
+    strategy module the first time one of its strategies is accessed.
+    """
+
+    def __init__(self, manifest: List[Tuple[str, str, str]]):
+        self._refs: Dict[str, Optional[Tuple[str, str]]] = {name: (module, attr)
+                                                  for name, module, attr in manifest}
+        self._loaded: Dict[str, Callable] = {}
+
+    def reference(self, name: str) -> str:
+        """'module:attribute' of a registered strategy (no import)."""
+        if self._refs[name] is None:
+            return repr(self._loaded[name])  # registered manually
+        return '{}:{}'.format(*self._refs[name])
+
+    def __getitem__(self, name: str) -> Callable:
+        if name not in self._loaded:
+            module_name, attr_name = self._refs[name]
+            module = importlib.import_module(f'.{module_name}', package='strategies')
+            self._loaded[name] = getattr(module, attr_name)
+        return self._loaded[name]
+
+    def __setitem__(self, name: str, strategy_func: Callable):
+        if name not in self._refs:
+            self._refs[name] = None  # registered manually, nothing to import
+        self._loaded[name] = strategy_func
+
+    def __delitem__(self, name: str):
+        del self._refs[name]
+        self._loaded.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._refs))
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __contains__(self, name) -> bool:
+        return name in self._refs
+
+    def __repr__(self) -> str:
+        return f"LazyStrategyRegistry({list(self._refs)})"
+
+
+# Dictionary-like registry of all strategies (imported on first access)
+strategies = LazyStrategyRegistry(_load_manifest())
+
 
 # Alternative: Manual registration for more control
 def register_strategy(name: str, strategy_func: Callable):
@@ -55,12 +197,12 @@ def register_strategy(name: str, strategy_func: Callable):
     strategies[name] = strategy_func
 
 def get_strategy(name: str) -> Callable:
-    """Get a strategy by name."""
+    """Get a strategy by name (imports its module on first use)."""
     return strategies.get(name)
 
 def list_strategies() -> list:
-    """List all available strategies."""
+    """List all available strategies (without importing them)."""
     return list(strategies.keys())
 
 # Export
-__all__ = ['strategies', 'register_strategy', 'get_strategy', 'list_strategies']
\ No newline at end of file
+__all__ = ['strategies', 'register_strategy', 'get_strategy', 'list_strategies']
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Strategy protocol v2: class-based strategies with typed, slotted state.
+
+A v2 strategy subclasses ``Strategy``, keeps its state in ``__slots__``
+attributes, and implements:
+
+    reset()            → start a new run (clear all state)
+    step(lamp_state)   → (toggle, move, done); on done, set self.estimate
+
+Instead of ``True``/``False``, ``done`` may be a ``Walk``: after this step's
+toggle and move, the agent keeps walking in bulk (e.g. "move on until a
+lamp is ON, switching lamps OFF on the way") without calling ``step()``
+for every wagon. Every wagon of a walk is still one step.
+
+``simulate()`` drives v2 strategies through a lean loop: no memory dict,
+no ``memory == {}`` check, and a 3-tuple per step. Every v2 strategy is
+also callable through the original ``(lamp_state, memory)`` protocol, and
+``FunctionStrategy`` wraps an original function strategy as a v2 object.
+"""
+import copy
+from typing import Callable, Optional, Tuple, Union
+
+StepResult = Tuple[bool, int, Union[bool, "Walk"]]
+
+
+class Walk:
+    """
+    Macro action: move one wagon per step in ``direction``.
+
+    Before every step the walk ends if ``limit`` steps have been taken or
+    the lamp equals ``until``; otherwise the lamp is set to ``set_to`` (if
+    given) and the agent moves on. Afterwards ``distance`` holds the steps
+    taken and ``found`` whether an ``until`` lamp stopped the walk.
+    ``step()`` is called next at the wagon where the walk ended.
+    """
+
+    __slots__ = ("direction", "until", "set_to", "limit", "distance", "found")
+
+    def __init__(self, direction: int = +1, until: Optional[int] = None,
+                 set_to: Optional[int] = None, limit: Optional[int] = None):
+        if direction not in (-1, 1):
+            raise ValueError("Walk direction must be -1 or +1.")
+        self.direction = direction
+        self.until = until
+        self.set_to = set_to
+        self.limit = limit
+        self.distance = 0
+        self.found = False
+
+    def __repr__(self) -> str:
+        return (f"Walk(direction={self.direction:+d}, until={self.until}, "
+                f"set_to={self.set_to}, limit={self.limit})")
+
+
+class Strategy:
+    """
+    Base class for v2 strategies.
+
+    Subclasses set ``title`` (registry name) and add their own state to
+    ``__slots__``. ``phase_names`` labels integer phases for profiling.
+    """
+
+    __slots__ = ("estimate",)
+    title: str = "Strategy"
+    phase_names: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Prepare for a new run."""
+        self.estimate: Optional[int] = None
+
+    def step(self, lamp_state: int) -> StepResult:
+        """Process one wagon, return (toggle, move, done or Walk)."""
+        raise NotImplementedError
+
+    def __call__(self, lamp_state, memory, get_title: bool = False):
+        """
+        Original (lamp_state, memory) protocol; run state lives in memory.
+
+        Walks are expanded here one step per call.
+        """
+        if get_title:
+            return self.title
+        if memory == {}:
+            instance = copy.copy(self)
+            instance.reset()
+            memory["instance"] = instance
+            memory["walk"] = None
+        walk = memory["walk"]
+        if walk is not None:
+            if walk.limit is not None and walk.distance >= walk.limit:
+                memory["walk"] = None
+            elif walk.until is not None and lamp_state == walk.until:
+                walk.found = True
+                memory["walk"] = None
+            else:
+                walk.distance += 1
+                toggle = walk.set_to is not None and lamp_state != walk.set_to
+                return toggle, walk.direction, memory, False, None
+        instance = memory["instance"]
+        toggle, move, done = instance.step(lamp_state)
+        if isinstance(done, Walk):
+            done.distance = 0
+            done.found = False
+            memory["walk"] = done
+            return toggle, move, memory, False, None
+        return toggle, move, memory, done, instance.estimate if done else None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.title!r})"
+
+
+class FunctionStrategy(Strategy):
+    """Adapter running an original function strategy as a v2 strategy."""
+
+    __slots__ = ("func", "title", "memory")
+
+    def __init__(self, func: Callable, title: Optional[str] = None):
+        self.func = func
+        self.title = title or getattr(func, "__name__", repr(func))
+        super().__init__()
+
+    def reset(self) -> None:
+        self.estimate = None
+        self.memory = {}
+
+    def step(self, lamp_state: int) -> StepResult:
+        toggle, move, self.memory, done, estimate = self.func(lamp_state, self.memory)
+        if done:
+            self.estimate = estimate
+        return toggle, move, done
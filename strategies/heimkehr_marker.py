@@ -5,6 +5,9 @@ Created on Sun Dec  7 15:20:19 2025
 @author: mjustus
 """
 
+from .base_strategy import Strategy, Walk
+
+
 def simple_marker_strategy(lamp_state, memory):
     """
     Strategy algorithm:
@@ -61,4 +64,52 @@ def simple_marker_strategy(lamp_state, memory):
             return toggle, -1, memory, done, estimated_n
         
         
-heimkehr_marker = simple_marker_strategy
\ No newline at end of file
+heimkehr_marker = simple_marker_strategy
+
+
+# Phases of HeimkehrMarker (protocol v2)
+START, FOUND_OFF, AT_START = range(3)
+
+
+class HeimkehrMarker(Strategy):
+    """
+    simple_marker_strategy on the v2 protocol.
+
+    Searching forward for an OFF lamp and walking back home are Walk macro
+    actions, so each cycle costs two step() calls however long it is.
+    """
+
+    __slots__ = ("phase", "last_cycle_length", "walk")
+    title = "Heimkehr-Marker"
+    phase_names = ("start", "found_off", "at_start")
+
+    def reset(self):
+        self.estimate = None
+        self.phase = START
+        self.walk = None
+        self.last_cycle_length = 0
+
+    def step(self, lamp_state):
+        if self.phase == FOUND_OFF:
+            # Turn the OFF lamp ON, walk back to start
+            self.last_cycle_length = self.walk.distance + 1
+            self.phase = AT_START
+            return True, -1, Walk(-1, limit=self.last_cycle_length - 1)
+
+        if self.phase == AT_START:
+            if lamp_state == 1:
+                self.estimate = self.last_cycle_length
+                return False, 0, True
+            return False, 1, self._search()
+
+        # Start: turn lamp OFF, search forward
+        return lamp_state == 1, 1, self._search()
+
+    def _search(self):
+        self.phase = FOUND_OFF
+        self.walk = Walk(+1, until=0)
+        return self.walk
+
+
+# Registered as "Heimkehr-Marker" in place of the function above
+heimkehr_marker_v2 = HeimkehrMarker()
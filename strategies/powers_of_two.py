@@ -4,6 +4,8 @@ Created on Sun Dec  7 15:30:19 2025
 
 @author: mjustus
 """
+from .base_strategy import Strategy, Walk
+
 
 def powers_of_two_strategy(lamp_state, memory):
     """
@@ -103,4 +105,66 @@ def powers_of_two_strategy(lamp_state, memory):
         # Keep moving forward
         return toggle, +1, memory, done, estimated_n
     
-powers_of_two = powers_of_two_strategy
\ No newline at end of file
+powers_of_two = powers_of_two_strategy
+
+# Phases of PowersOfTwo (protocol v2)
+INIT_ON, FORWARD_END, RETURN_END, COUNT_PREP, COUNT_END = range(5)
+
+
+class PowersOfTwo(Strategy):
+    """
+    powers_of_two_strategy on the v2 protocol: same walk, state in slots.
+
+    The forward, return and counting stretches are Walk macro actions, so
+    step() only runs at their ends.
+    """
+
+    __slots__ = ("phase", "power", "target_distance", "walk")
+    title = "Powers-Of-Two"
+    phase_names = ("init_on", "forward_end", "return_end", "count_prep", "count_end")
+
+    def reset(self):
+        self.estimate = None
+        self.phase = INIT_ON
+        self.power = 0
+        self.target_distance = 1
+        self.walk = None
+
+    def step(self, lamp_state):
+        phase = self.phase
+
+        if phase == FORWARD_END:
+            # Last wagon of the forward phase: turn it OFF, walk back
+            self.phase = RETURN_END
+            return lamp_state == 1, -1, Walk(-1, limit=self.target_distance - 1)
+
+        if phase == RETURN_END:
+            if lamp_state == 0:
+                # All lights are OFF
+                self.phase = COUNT_PREP
+                return False, 1, False
+            self.power += 1
+            return False, 1, self._forward()
+
+        if phase == COUNT_END:
+            # Found the ON light after a full loop
+            self.estimate = self.walk.distance + 1
+            return False, 0, True
+
+        if phase == INIT_ON:
+            return lamp_state == 0, 1, self._forward()
+
+        # COUNT_PREP: turn ON the light of the counting start, count to it
+        self.phase = COUNT_END
+        self.walk = Walk(+1, until=1)
+        return lamp_state == 0, 1, self.walk
+
+    def _forward(self):
+        """Walk forward 2**power wagons turning lights OFF (last one in step())."""
+        self.phase = FORWARD_END
+        self.target_distance = 2 ** self.power
+        return Walk(+1, set_to=0, limit=self.target_distance - 1)
+
+
+# Registered as "Powers-Of-Two" in place of the function above
+powers_of_two_v2 = PowersOfTwo()
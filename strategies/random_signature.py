@@ -16,17 +16,21 @@ Notes on internal state:
   It is *not* reduced modulo ``n`` because ``n`` is unknown until termination.
 - ``written`` stores the intended signature bits in write order, regardless of
   whether the lamp had to be toggled to realize that bit.
-- ``observed`` stores the lamp states seen while moving forward.
-- ``history`` currently records the first seen lamp state for each logical step.
-  The verification path ultimately compares against ``written``. ``history`` is
-  retained for compatibility and future diagnostics.
+  It is a bit-packed ``_BitBuffer`` (one bit per signature bit).
+- ``matcher`` keeps the observed/written prefix-suffix match length online
+  (KMP automaton). The lamp states seen while moving forward are consumed
+  by it directly, so no ``observed`` buffer is kept at all.
+- ``visited`` counts the logical steps seen so far. Steps are visited
+  contiguously from 0, so "step was visited" is ``step < visited``; the
+  lamp states themselves were never read back and are not stored.
+- ``memory_footprint(memory)`` reports the bytes held by these buffers.
 """
 
 from __future__ import annotations
 
 import math
-from collections import deque
-from typing import Deque, Dict, List, Optional, Tuple
+import sys
+from typing import Dict, List, Optional, Tuple
 
 StrategyResult = Tuple[bool, int, dict, bool, Optional[int]]
 
@@ -51,8 +55,8 @@ def train_strategy_random_signature(
     move = memory.get("last_move", +1) or +1
 
     global_step = memory["global_step"]
-    pos_key = _position_key(global_step)
-    memory["history"].setdefault(pos_key, lamp_state)
+    if _position_key(global_step) == memory["visited"]:
+        memory["visited"] += 1
 
     phase = memory["phase"]
 
@@ -67,17 +71,14 @@ def train_strategy_random_signature(
         return toggle, move, memory, done, estimated_n
 
     if phase == "search":
-        observed: Deque[int] = memory["observed"]
-        observed.append(lamp_state)
+        matcher: _SignatureMatcher = memory["matcher"]
+        matcher.observe(lamp_state)
 
         k = memory["global_step"]
         min_required_match = _compute_required_match_length(memory, k)
 
-        if len(observed) >= min_required_match and len(memory["written"]) >= min_required_match:
-            matching_len = _matching_prefix_suffix_len(
-                observed=list(observed),
-                written=memory["written"],
-            )
+        if matcher.observed_len >= min_required_match and len(memory["written"]) >= min_required_match:
+            matching_len = matcher.matching_len()
             memory["matching_len"] = matching_len
 
             if matching_len >= min_required_match:
@@ -107,7 +108,7 @@ def train_strategy_random_signature(
         current_step = memory["global_step"]
         pos = _position_key(current_step)
 
-        if pos in memory["history"]:
+        if 0 <= pos < memory["visited"]:
             # The current repository logic ultimately verifies against the
             # signature bit written at the same logical index. We keep that
             # behaviour explicit here.
@@ -190,10 +191,9 @@ def _initialize_memory(memory: Dict, a: float, b: float, min_l: int) -> None:
     memory["last_move"] = +1
     memory["toggle_done"] = False
 
-    memory["written"] = []
-    memory["observed"] = deque()
-    memory["history"] = {}
-    memory["pattern"] = []
+    memory["written"] = _BitBuffer()
+    memory["matcher"] = _SignatureMatcher(memory["written"])
+    memory["visited"] = 0
 
 
 def _prng_next_bit(memory: Dict) -> int:
@@ -220,6 +220,10 @@ def _matching_prefix_suffix_len(observed: List[int], written: List[int]) -> int:
     """
     Return the helper result used by the current repository implementation.
 
+    Reference implementation, quadratic per call. The strategy itself uses
+    ``_SignatureMatcher``, which yields the same value in amortized O(1)
+    (tests/test_random_signature.py compares the two).
+
     Important: this intentionally preserves the original semantics, including
     the unusual ``test_len = 0`` case where ``observed[-0:]`` means the full
     list in Python and therefore never contributes useful evidence. This keeps
@@ -232,10 +236,149 @@ def _matching_prefix_suffix_len(observed: List[int], written: List[int]) -> int:
     return best
 
 
+class _BitBuffer:
+    """Append-only bit sequence packed eight bits per byte."""
+
+    __slots__ = ("data", "length")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.length = 0
+
+    def append(self, bit: int) -> None:
+        i = self.length
+        if i & 7 == 0:
+            self.data.append(0)
+        if bit:
+            self.data[i >> 3] |= 1 << (i & 7)
+        self.length = i + 1
+
+    def __getitem__(self, i: int) -> int:
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("bit index out of range")
+        return (self.data[i >> 3] >> (i & 7)) & 1
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self):
+        data = self.data
+        for i in range(self.length):
+            yield (data[i >> 3] >> (i & 7)) & 1
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data)
+
+
+# Byte of _SignatureMatcher.pi marking a border stored in its wide dict
+_WIDE = 255
+
+
+class _SignatureMatcher:
+    """
+    Online KMP automaton for ``_matching_prefix_suffix_len``.
+
+    Tracks the longest suffix of the observed stream that is a prefix of
+    the written signature while both grow. ``pi`` is the prefix function of
+    ``written``, extended one bit at a time, and ``state`` is the usual KMP
+    match length. The answer is the first length on the border chain of
+    ``state`` that fits below ``len(written) - 1``, which is exactly the
+    range scanned by the reference function; its ``test_len = 0`` case
+    never matches a non-empty observation and so maps to 0 as well.
+
+    ``pi`` takes one byte per signature bit: borders of a pseudo-random
+    signature are short, and the rare ones of ``_WIDE`` or more are kept in
+    the ``wide`` dict with ``_WIDE`` as their byte.
+
+    The signature may grow by at most one bit between two observations
+    (search writes one bit per observation, a write phase one bit after a
+    match). Larger jumps could create matches the automaton cannot see, so
+    they are rejected.
+    """
+
+    __slots__ = ("written", "pi", "wide", "state", "observed_len", "_growth")
+
+    def __init__(self, written: _BitBuffer):
+        self.written = written
+        self.pi = bytearray()
+        self.wide: Dict[int, int] = {}
+        self.state = 0
+        self.observed_len = 0
+        self._growth = 0
+
+    def border(self, i: int) -> int:
+        """Prefix function value of ``written[:i + 1]``."""
+        value = self.pi[i]
+        return self.wide[i] if value == _WIDE else value
+
+    def extend_signature(self) -> None:
+        """Account for the bit just appended to ``written``."""
+        written, pi, wide = self.written, self.pi, self.wide
+        data = written.data
+        i = len(pi)
+        if i != len(written) - 1:
+            raise ValueError("signature must be extended one bit at a time")
+        if self.observed_len and self._growth >= 1:
+            raise ValueError("signature may grow by at most one bit per observation")
+        self._growth += 1
+
+        border = self.border(i - 1) if i > 0 else 0
+        bit = (data[i >> 3] >> (i & 7)) & 1
+        while border > 0 and (data[border >> 3] >> (border & 7)) & 1 != bit:
+            border = pi[border - 1] if pi[border - 1] != _WIDE else wide[border - 1]
+        if i > 0 and (data[border >> 3] >> (border & 7)) & 1 == bit:
+            border += 1
+        if border >= _WIDE:
+            wide[i] = border
+            border = _WIDE
+        pi.append(border)
+
+    def observe(self, bit: int) -> None:
+        """Feed the next observed lamp state."""
+        data, pi, wide = self.written.data, self.pi, self.wide
+        length = self.written.length
+        q = self.state
+        while q > 0 and (q == length or (data[q >> 3] >> (q & 7)) & 1 != bit):
+            q = pi[q - 1] if pi[q - 1] != _WIDE else wide[q - 1]
+        if q < length and (data[q >> 3] >> (q & 7)) & 1 == bit:
+            q += 1
+        self.state = q
+        self.observed_len += 1
+        self._growth = 0
+
+    def matching_len(self) -> int:
+        """Same value as ``_matching_prefix_suffix_len(observed, written)``."""
+        cap = len(self.written) - 2
+        q = self.state
+        while q > cap and q > 0:
+            q = self.border(q - 1)
+        return max(q, 0)
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.pi) + (sys.getsizeof(self.wide) if self.wide else 0)
+
+
+def memory_footprint(memory: Dict) -> Dict[str, int]:
+    """
+    Bytes held by the growing buffers of a random-signature run.
+
+    ``written`` costs one bit per signature bit, the KMP prefix function
+    of the signature about one byte per signature bit.
+    """
+    footprint = {
+        "written": memory["written"].nbytes(),
+        "matcher": memory["matcher"].nbytes(),
+    }
+    footprint["total"] = sum(footprint.values())
+    return footprint
+
+
 def _append_next_signature_bit(memory: Dict) -> int:
     desired = _prng_next_bit(memory)
-    memory["pattern"].append(desired)
     memory["written"].append(desired)
+    memory["matcher"].extend_signature()
     memory["written_len"] += 1
     return desired
 
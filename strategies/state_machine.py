@@ -5,6 +5,9 @@ Created on Sun Dec  7 15:29:12 2025
 @author: mjustus
 """
 
+from .transition_table import TransitionTable
+
+
 def state_machine_strategy(lamp_state, memory):
     """
     State machine based strategy:
@@ -55,5 +58,41 @@ def state_machine_strategy(lamp_state, memory):
             return toggle, -1, memory, done, estimated_n   
 
 
+state_machine = state_machine_strategy
+
+
+# Same machine as a declarative transition table (runs on the fast path)
+STATE_MACHINE_TABLE = {
+    "title": "State-Machine",
+    "start": "start",
+    "counters": {"steps": 0, "found_at": 0, "count": 0},
+    "states": {
+        # Initial state: turn the start lamp OFF and move
+        "start": {
+            "rules": [
+                {"lamp": 1, "toggle": True, "set": {"steps": 1}, "move": +1, "next": "seek"},
+                {"lamp": 0, "set": {"steps": 1}, "move": +1, "next": "seek"},
+            ],
+        },
+        # Looking for OFF
+        "seek": {
+            "rules": [
+                {"lamp": 0, "toggle": True, "copy": {"found_at": "steps"},
+                 "add": {"steps": -1}, "move": -1, "next": "return"},
+                {"add": {"steps": +1}, "move": +1},
+            ],
+        },
+        # Returning to start
+        "return": {
+            "rules": [
+                {"if": ("steps", "==", 0), "lamp": 1, "done": "found_at"},
+                {"if": ("steps", "==", 0), "add": {"count": 1}, "set": {"steps": 1},
+                 "move": +1, "next": "seek"},
+                {"add": {"steps": -1}, "move": -1},
+            ],
+        },
+    },
+}
 
-state_machine = state_machine_strategy
\ No newline at end of file
+# Registered as "State-Machine" in place of the function above
+state_machine_table = TransitionTable(STATE_MACHINE_TABLE)
\ No newline at end of file
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Declarative transition-table strategies.
+
+A table strategy is a plain dict describing a finite-state machine with a
+few integer counters:
+
+    {
+        "title": "My-Strategy",
+        "start": "search",
+        "counters": {"steps": 0, "found_at": 0},
+        "states": {
+            "search": {
+                "add": {"steps": +1},              # applied on every step
+                "rules": [                         # first match wins
+                    {"lamp": 0, "toggle": True, "copy": {"found_at": "steps"},
+                     "move": -1, "next": "back"},
+                    {"move": +1},
+                ],
+            },
+            ...
+        },
+    }
+
+Rule keys (all optional):
+    lamp:   only match if the lamp is 0 or 1
+    if:     guard (counter, op, value) with op in ==, !=, <, <=, >, >=;
+            value is an int or the name of another counter
+    toggle: toggle the current lamp
+    copy:   {counter: other_counter}, applied first
+    set:    {counter: int}, applied second
+    add:    {counter: int}, applied last
+    move:   -1, 0 or +1 (default +1, 0 when done)
+    next:   name of the next state (default: stay)
+    done:   name of the counter holding the estimated n; terminates
+
+``TransitionTable`` compiles the dict into integer-indexed tuples. It is
+callable through the usual ``(lamp_state, memory)`` protocol, and the
+simulator runs it through ``run()``: a loop generated from the table with
+counters as local variables, so there is no per-step function call or
+dict lookup.
+"""
+from typing import Dict, List, Optional, Tuple
+
+_OPS = {"==": 0, "!=": 1, "<": 2, "<=": 3, ">": 4, ">=": 5}
+
+
+def _compare(op: int, lhs: int, rhs: int) -> bool:
+    if op == 0:
+        return lhs == rhs
+    if op == 1:
+        return lhs != rhs
+    if op == 2:
+        return lhs < rhs
+    if op == 3:
+        return lhs <= rhs
+    if op == 4:
+        return lhs > rhs
+    return lhs >= rhs
+
+
+class TransitionTable:
+    """
+    Compiled form of a declarative transition-table strategy.
+
+    Attributes:
+        title: Strategy name used for registration
+        state_names: State names, index = compiled state id
+        counter_names: Counter names, index = compiled counter slot
+        dispatch: dispatch[state * 2 + lamp] = (state_adds, rules)
+    """
+
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        self.title = spec["title"]
+        self.state_names: List[str] = list(spec["states"])
+        self.counter_names: List[str] = list(spec.get("counters", {}))
+        self.initial_counters = [int(v) for v in spec.get("counters", {}).values()]
+        self.start = self._state_id(spec["start"])
+        self._runner = None
+
+        self.dispatch: List[Tuple] = []
+        for name in self.state_names:
+            state = spec["states"][name]
+            adds = self._pairs(state.get("add", {}))
+            for lamp in (0, 1):
+                rules = tuple(self._compile_rule(name, rule)
+                              for rule in state["rules"]
+                              if rule.get("lamp") in (None, lamp))
+                self.dispatch.append((adds, rules))
+
+    def _state_id(self, name: str) -> int:
+        if name not in self.state_names:
+            raise ValueError(f"Unknown state '{name}' in table '{self.title}'")
+        return self.state_names.index(name)
+
+    def _counter_id(self, name: str) -> int:
+        if name not in self.counter_names:
+            raise ValueError(f"Unknown counter '{name}' in table '{self.title}'")
+        return self.counter_names.index(name)
+
+    def _pairs(self, values: Dict[str, int]) -> Tuple:
+        return tuple((self._counter_id(c), int(v)) for c, v in values.items())
+
+    def _compile_rule(self, state: str, rule: Dict) -> Tuple:
+        guard = None
+        if "if" in rule:
+            counter, op, value = rule["if"]
+            if op not in _OPS:
+                raise ValueError(f"Unknown operator '{op}' in state '{state}'")
+            if isinstance(value, str):
+                guard = (self._counter_id(counter), _OPS[op], self._counter_id(value), True)
+            else:
+                guard = (self._counter_id(counter), _OPS[op], int(value), False)
+
+        done = self._counter_id(rule["done"]) if "done" in rule else None
+        move = rule.get("move", 0 if done is not None else +1)
+        if move not in (-1, 0, +1):
+            raise ValueError(f"Rule move must be -1, 0, or +1 in state '{state}'")
+        next_state = self._state_id(rule["next"]) if "next" in rule \
+            else self._state_id(state)
+
+        copies = tuple((self._counter_id(dst), self._counter_id(src))
+                       for dst, src in rule.get("copy", {}).items())
+        return (guard, bool(rule.get("toggle", False)), copies,
+                self._pairs(rule.get("set", {})), self._pairs(rule.get("add", {})),
+                move, next_state, done)
+
+    # ------------------------------------------------------------------
+    # Callable (lamp_state, memory) protocol
+    # ------------------------------------------------------------------
+    def __call__(self, lamp_state, memory, get_title: bool = False):
+        if get_title:
+            return self.title
+
+        if memory == {}:
+            memory["phase"] = self.state_names[self.start]
+            memory["counters"] = list(self.initial_counters)
+
+        state = self.state_names.index(memory["phase"])
+        counters = memory["counters"]
+        toggle, move, next_state, done = self._step(state, lamp_state, counters)
+        memory["phase"] = self.state_names[next_state]
+        estimated_n = counters[done] if done is not None else None
+        return toggle, move, memory, done is not None, estimated_n
+
+    def _step(self, state: int, lamp: int, c: List[int]):
+        adds, rules = self.dispatch[state * 2 + lamp]
+        for i, delta in adds:
+            c[i] += delta
+        for guard, toggle, copies, sets, radds, move, next_state, done in rules:
+            if guard is not None:
+                gi, op, value, is_counter = guard
+                if not _compare(op, c[gi], c[value] if is_counter else value):
+                    continue
+            for dst, src in copies:
+                c[dst] = c[src]
+            for i, value in sets:
+                c[i] = value
+            for i, delta in radds:
+                c[i] += delta
+            return toggle, move, next_state, done
+        raise ValueError(f"No rule of state '{self.state_names[state]}' "
+                         f"matches lamp={lamp} in table '{self.title}'")
+
+    # ------------------------------------------------------------------
+    # Fast path used by utils.simulator.simulate
+    # ------------------------------------------------------------------
+    def run(self, lamps: List[int], max_steps: int,
+            history=None) -> Tuple[bool, Optional[int], int]:
+        """
+        Run the table directly on a lamp ring (modified in place).
+
+        Args:
+            lamps: Initial lamp ring
+            max_steps: Maximum steps before timeout
+            history: Optional StepHistory receiving (pos, toggle) events
+
+        Returns:
+            Tuple: (success, estimate, steps_used)
+        """
+        if self._runner is None:
+            namespace = {}
+            exec(compile(self.source(), f"<table {self.title}>", "exec"), namespace)
+            self._runner = namespace["run"]
+        record = history.append if history is not None else None
+        return self._runner(lamps, max_steps, record)
+
+    def source(self) -> str:
+        """
+        Python source of the specialised run loop for this table.
+
+        Counters become local variables and states/lamps an if/elif chain,
+        so the loop needs no function call or dict lookup per step.
+        """
+        ops = {v: k for k, v in _OPS.items()}
+        lines = [
+            "def run(lamps, max_steps, record):",
+            "    n = len(lamps)",
+        ]
+        lines += [f"    c{i} = {value}" for i, value in enumerate(self.initial_counters)]
+        lines += [
+            f"    state = {self.start}",
+            "    pos = 0",
+            "    for step in range(max_steps):",
+            "        lamp = lamps[pos]",
+        ]
+        for state, name in enumerate(self.state_names):
+            lines.append(f"        {'if' if state == 0 else 'elif'} state == {state}:")
+            adds = self.dispatch[state * 2][0]
+            lines += [f"            c{i} += {delta}" for i, delta in adds]
+            for lamp in (0, 1):
+                lines.append("            if lamp == 0:" if lamp == 0 else "            else:")
+                lines += self._rule_source(name, lamp, ops)
+        lines += [
+            "        if record is not None:",
+            "            record(pos, toggle)",
+            "        if toggle:",
+            "            lamps[pos] = lamp ^ 1",
+            "        if done:",
+            "            return True, estimate, step + 1",
+            "        pos = (pos + move) % n",
+            "    return False, None, max_steps",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _rule_source(self, name: str, lamp: int, ops: Dict[int, str]) -> List[str]:
+        """if/elif chain for the rules of one (state, lamp) pair."""
+        lines = []
+        indent = "                "
+        rules = self.dispatch[self.state_names.index(name) * 2 + lamp][1]
+        for r, (guard, toggle, copies, sets, radds, move, next_state, done) \
+                in enumerate(rules):
+            if guard is None:
+                if r > 0:
+                    lines.append(f"{indent}else:")
+                else:
+                    indent = indent[4:]
+            else:
+                gi, op, value, is_counter = guard
+                rhs = f"c{value}" if is_counter else str(value)
+                lines.append(f"{indent}{'if' if r == 0 else 'elif'} c{gi} {ops[op]} {rhs}:")
+            body = [f"c{dst} = c{src}" for dst, src in copies]
+            body += [f"c{i} = {value}" for i, value in sets]
+            body += [f"c{i} += {delta}" for i, delta in radds]
+            body += [f"toggle = {toggle}", f"move = {move}", f"state = {next_state}",
+                     f"done = {done is not None}"]
+            if done is not None:
+                body.append(f"estimate = c{done}")
+            lines += [f"{indent}    {stmt}" for stmt in body]
+            if guard is None:
+                return lines
+        if lines:
+            lines.append(f"{indent}else:")
+        else:
+            indent = indent[4:]
+        lines.append(f"{indent}    raise ValueError(\"No rule of state '{name}' "
+                     f"matches lamp={lamp} in table {self.title!r}\")")
+        return lines
+
+    def __getstate__(self):
+        # The generated runner is rebuilt lazily after unpickling
+        state = self.__dict__.copy()
+        state["_runner"] = None
+        return state
+
+    def __repr__(self) -> str:
+        return f"TransitionTable({self.title!r}, states={len(self.state_names)})"
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the simulator, its engines and the sweep tooling.
+
+Run from the repository root with ``python -m pytest``.
+"""
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark rows and baseline comparison, including runs too fast to time.
+"""
+import pandas as pd
+
+import utils.benchmark as benchmark
+from strategies.counter import counter_strategy
+
+
+def _row(steps, rate, strategy="Counter"):
+    return {"n": 12, "k": 0, "strategy": strategy, "steps": steps,
+            "steps_per_sec": rate, "peak_memory": 1000, "history_bytes": 100}
+
+
+def test_untimed_run_is_printed(monkeypatch, capsys):
+    monkeypatch.setattr(benchmark.time, "perf_counter", lambda: 1.0)
+    df = benchmark.run_benchmarks({"Counter": counter_strategy}, [(12, 0)], repeat=1)
+    assert df["steps_per_sec"].isna().all()
+    assert "- steps/s" in capsys.readouterr().out
+
+
+def test_compare_handles_missing_rates():
+    current = pd.DataFrame([_row(10, None, "a"), _row(10, 200.0, "b"),
+                            _row(10, 50.0, "c"), _row(11, None, "d")])
+    baseline = pd.DataFrame([_row(10, 100.0, "a"), _row(10, None, "b"),
+                             _row(10, 100.0, "c"), _row(10, 100.0, "d")])
+    comparison = benchmark.compare_to_baseline(current, baseline).set_index("strategy")
+    assert comparison["status"].to_dict() == {"a": "not timed", "b": "not timed",
+                                              "c": "slower", "d": "behaviour changed"}
+    assert comparison["speedup"].isna().tolist() == [True, True, False, True]
+    benchmark.print_comparison(comparison.reset_index())
+
+
+def test_compare_all_rates_missing():
+    current = pd.DataFrame([_row(10, None)])
+    comparison = benchmark.compare_to_baseline(current, current)
+    assert comparison["status"].tolist() == ["not timed"]
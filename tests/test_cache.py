@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Result cache: keys, storage and reuse by iter_results().
+"""
+import functools
+
+import pytest
+
+import utils.simulator as simulator
+from strategies.counter import counter_strategy
+from strategies.powers_of_two import PowersOfTwo, powers_of_two_strategy
+from strategies.state_machine import state_machine_table
+from utils.cache import ResultCache, strategy_fingerprint
+
+
+def test_fingerprint_distinguishes_strategies_and_parameters():
+    fingerprints = {strategy_fingerprint(powers_of_two_strategy),
+                    strategy_fingerprint(PowersOfTwo()),
+                    strategy_fingerprint(state_machine_table),
+                    strategy_fingerprint(counter_strategy),
+                    strategy_fingerprint(functools.partial(counter_strategy)),
+                    strategy_fingerprint(functools.partial(counter_strategy, get_title=False))}
+    assert None not in fingerprints
+    assert len(fingerprints) == 6
+
+
+def test_fingerprint_is_none_without_source():
+    assert strategy_fingerprint(len) is None
+    assert ResultCache("unused").key(len, 5, 2, 1, 100) is None
+
+
+def test_key_depends_on_every_field():
+    cache = ResultCache("unused")
+    key = cache.key(powers_of_two_strategy, 10, 2, 10002, 500)
+    assert key == cache.key(powers_of_two_strategy, 10, 2, 10002, 500, "legacy")
+    others = [cache.key(powers_of_two_strategy, 11, 2, 10002, 500),
+              cache.key(powers_of_two_strategy, 10, 3, 10002, 500),
+              cache.key(powers_of_two_strategy, 10, 2, 10003, 500),
+              cache.key(powers_of_two_strategy, 10, 2, 10002, 501),
+              cache.key(powers_of_two_strategy, 10, 2, 10002, 500, "stream"),
+              cache.key(counter_strategy, 10, 2, 10002, 500)]
+    assert key not in others
+    assert len(set(others)) == len(others)
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache.key(powers_of_two_strategy, 10, 2, 10002, 500)
+    assert cache.get(key) is None
+    row = {"n": 10, "estimate": 10, "success": True, "efficiency": None}
+    cache.put(key, row)
+    assert cache.get(key) == row
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def _sweep(tmp_path, **kwargs):
+    strategies = {"Powers-Of-Two": PowersOfTwo(), "State-Machine": state_machine_table}
+    return list(simulator.iter_results(
+        [(3, 0), (8, 2), (20, 3)], strategies, save_images=False,
+        output_dir=str(tmp_path / "out"), **kwargs))
+
+
+def test_sweep_reuses_cached_rows(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    first = _sweep(tmp_path, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        pytest.fail("cached configuration simulated again")
+
+    monkeypatch.setattr(simulator, "_simulate_config", fail)
+    assert _sweep(tmp_path, cache_dir=cache_dir) == first
+
+
+MODULE = '''
+SCALE = {scale}
+
+
+def helper(x):
+    return x * SCALE
+
+
+def strategy_a(lamp_state, memory):
+    return False, 1, memory, True, helper(1)
+
+
+def strategy_b(lamp_state, memory):
+    return False, 1, memory, True, {b}
+'''
+
+
+def _load(tmp_path, name, **values):
+    import importlib.util
+    path = tmp_path / f"{name}.py"
+    path.write_text(MODULE.format(**values))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_fingerprint_covers_own_code_and_helpers_only(tmp_path):
+    base = _load(tmp_path, "base", scale=2, b=1)
+    other_b = _load(tmp_path, "other_b", scale=2, b=5)
+    other_scale = _load(tmp_path, "other_scale", scale=3, b=1)
+
+    # Editing another strategy of the module keeps the key
+    assert strategy_fingerprint(other_b.strategy_a) == strategy_fingerprint(base.strategy_a)
+    assert strategy_fingerprint(other_b.strategy_b) != strategy_fingerprint(base.strategy_b)
+    # Editing a helper or constant it uses changes it
+    assert strategy_fingerprint(other_scale.strategy_a) != strategy_fingerprint(base.strategy_a)
+    assert strategy_fingerprint(other_scale.strategy_b) == strategy_fingerprint(base.strategy_b)
+
+
+def test_sweep_reports_hits_and_misses(tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    _sweep(tmp_path, cache_dir=cache_dir)
+    assert "0 of 6 rows reused" in capsys.readouterr().out
+    _sweep(tmp_path, cache_dir=cache_dir)
+    assert "6 of 6 rows reused from " + cache_dir + " (6 hits, 0 misses)" in capsys.readouterr().out
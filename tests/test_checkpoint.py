@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Results log: torn lines, and resuming an interrupted sweep.
+"""
+import pytest
+
+import utils.simulator as simulator
+from strategies.powers_of_two import PowersOfTwo
+from strategies.state_machine import state_machine_table
+from utils.checkpoint import ResultLog
+
+CONFIGS = [(3, 0), (8, 2), (20, 3)]
+STRATEGIES = {"Powers-Of-Two": PowersOfTwo(), "State-Machine": state_machine_table}
+
+
+def test_log_skips_torn_line_and_continues(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = ResultLog(path)
+    log.append({"n": 1})
+    log.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"n": 2, "k"')
+    log = ResultLog(path, resume=True)
+    assert log.load() == [{"n": 1}]
+    log.append({"n": 3})
+    log.close()
+    assert ResultLog(path, resume=True).load() == [{"n": 1}, {"n": 3}]
+
+
+def test_log_without_resume_starts_fresh(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = ResultLog(path)
+    log.append({"n": 1})
+    log.close()
+    assert ResultLog(path).load() == []
+
+
+def _sweep(tmp_path, **kwargs):
+    return simulator.iter_results(CONFIGS, STRATEGIES, save_images=False,
+                                  output_dir=str(tmp_path), **kwargs)
+
+
+def test_resume_continues_interrupted_sweep(tmp_path, monkeypatch):
+    full = list(_sweep(tmp_path / "reference"))
+
+    # Interrupt after three rows
+    rows = _sweep(tmp_path)
+    partial = [next(rows) for _ in range(3)]
+    rows.close()
+    assert partial == full[:3]
+
+    calls = []
+    simulate_config = simulator._simulate_config
+
+    def counting(*args, **kwargs):
+        calls.append(args[:3])
+        return simulate_config(*args, **kwargs)
+
+    monkeypatch.setattr(simulator, "_simulate_config", counting)
+    resumed = list(_sweep(tmp_path, resume=True))
+    assert resumed == full
+    assert len(calls) == len(full) - 3
+    log = ResultLog(str(tmp_path / "simulation_results.jsonl"), resume=True)
+    assert len(log.load()) == len(full)
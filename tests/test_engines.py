@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Every fast engine must reproduce simulate() on the reference function.
+
+Ports covered: the transition table (State-Machine), the v2 Walk classes
+(Heimkehr-Marker, Powers-Of-Two), the NumPy batch engine and the packed
+large-n ring.
+"""
+import pytest
+
+from strategies import strategies
+from strategies.heimkehr_marker import HeimkehrMarker, simple_marker_strategy
+from strategies.optimized_powers import optimized_powers_strategy
+from strategies.powers_of_two import PowersOfTwo, powers_of_two_strategy
+from strategies.state_machine import state_machine_strategy, state_machine_table
+from utils.batch import batch_lamps, simulate_batch, supports_batch
+from utils.bitring import simulate_packed
+from utils.simulator import simulate
+
+# (n, k) pairs: all OFF, all ON and random rings, including tiny trains
+CONFIGS = [(1, 0), (1, 1), (2, 2), (3, 0), (3, 1), (5, 2), (12, 3), (37, 4), (64, 5)]
+
+PORTS = [
+    ("State-Machine", state_machine_strategy, state_machine_table),
+    ("Heimkehr-Marker", simple_marker_strategy, HeimkehrMarker()),
+    ("Powers-Of-Two", powers_of_two_strategy, PowersOfTwo()),
+]
+
+MAX_STEPS = 20000
+
+
+def _seed(n, k):
+    return n * 1000 + k
+
+
+@pytest.mark.parametrize("name, reference, port", PORTS, ids=[p[0] for p in PORTS])
+@pytest.mark.parametrize("n, k", CONFIGS)
+def test_port_matches_reference(name, reference, port, n, k):
+    expected = simulate(n, reference, MAX_STEPS, _seed(n, k), k)
+    result = simulate(n, port, MAX_STEPS, _seed(n, k), k)
+    assert result[1:] == expected[1:]
+    assert list(result[0]) == list(expected[0])
+
+
+@pytest.mark.parametrize("name, reference, port", PORTS, ids=[p[0] for p in PORTS])
+def test_port_is_registered(name, reference, port):
+    assert type(strategies[name]) is type(port)
+
+
+@pytest.mark.parametrize("name, reference, port", PORTS, ids=[p[0] for p in PORTS])
+def test_port_timeout_matches_reference(name, reference, port):
+    expected = simulate(40, reference, 57, 7, 2)
+    assert simulate(40, port, 57, 7, 2)[1:] == expected[1:]
+
+
+@pytest.mark.parametrize("reference, port", [
+    (simple_marker_strategy, HeimkehrMarker()),
+    (powers_of_two_strategy, PowersOfTwo()),
+    (optimized_powers_strategy, optimized_powers_strategy),
+])
+@pytest.mark.parametrize("n", [1, 2, 5, 23])
+def test_batch_matches_simulate(reference, port, n):
+    assert supports_batch(port)
+    ks = list(range(40))
+    seeds = [_seed(n, k) for k in ks]
+    results = simulate_batch(port, batch_lamps(n, ks, seeds), MAX_STEPS)
+    expected = [tuple(simulate(n, reference, MAX_STEPS, seed, k)[1:])
+                for k, seed in zip(ks, seeds)]
+    assert [tuple(result) for result in results] == expected
+
+
+def test_batch_rejects_unsupported_strategy():
+    assert not supports_batch(state_machine_strategy)
+    with pytest.raises(ValueError):
+        simulate_batch(state_machine_strategy, [[0, 1, 0]])
+
+
+@pytest.mark.parametrize("strategy", [powers_of_two_strategy, PowersOfTwo(),
+                                      state_machine_table, HeimkehrMarker()])
+@pytest.mark.parametrize("n, k", [(1, 1), (9, 0), (50, 2), (129, 3)])
+def test_packed_matches_simulate(strategy, n, k):
+    history, success, estimate, correct, steps = simulate_packed(
+        n, strategy, MAX_STEPS, _seed(n, k), k, sample_every=1)
+    expected = simulate(n, strategy, MAX_STEPS, _seed(n, k), k)
+    assert (success, estimate, correct, steps) == expected[1:]
+    assert [(pos, toggle) for _, pos, toggle in history] == \
+        [(pos, toggle) for pos, _, toggle in expected[0]]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+StepHistory against a plain list of full lamp snapshots.
+"""
+import random
+
+import pytest
+
+from utils.history import StepHistory
+
+
+def _record(n, steps, interval, seed=0):
+    """A random walk recorded both as StepHistory and as snapshots."""
+    rng = random.Random(seed)
+    lamps = [rng.randint(0, 1) for _ in range(n)]
+    history = StepHistory(lamps, checkpoint_interval=interval)
+    snapshots = []
+    pos = 0
+    for _ in range(steps):
+        toggle = rng.random() < 0.5
+        snapshots.append(list(lamps))
+        history.append(pos, toggle)
+        if toggle:
+            lamps[pos] ^= 1
+        pos = (pos + rng.choice((-1, 0, 1))) % n
+    snapshots.append(list(lamps))
+    return history, snapshots
+
+
+@pytest.mark.parametrize("steps", [0, 1, 7, 8, 9, 16, 24])
+def test_lamps_at_every_step(steps):
+    history, snapshots = _record(5, steps, interval=8)
+    for step in range(steps + 1):
+        assert history.lamps_at(step) == snapshots[step]
+
+
+def test_lamps_at_end_on_checkpoint_boundary():
+    # len(history) is a multiple of the interval: the checkpoint for that
+    # step is only created by the next append
+    history, snapshots = _record(6, 16, interval=8)
+    assert history.lamps_at(16) == snapshots[16] == history.final_lamps()
+    history.append(0, True)
+    assert history.lamps_at(16) == snapshots[16]
+
+
+def test_lamps_at_negative_and_out_of_range():
+    history, snapshots = _record(4, 10, interval=4)
+    assert history.lamps_at(-1) == snapshots[9]
+    with pytest.raises(IndexError):
+        history.lamps_at(11)
+    with pytest.raises(IndexError):
+        history.lamps_at(-12)
+
+
+def test_getitem_and_iter_match_snapshots():
+    history, snapshots = _record(7, 50, interval=4)
+    assert [lamps for _, lamps, _ in history] == snapshots[:-1]
+    assert history[-1][1] == snapshots[-2]
+    assert [entry[1] for entry in history[10:20]] == snapshots[10:20]
+
+
+def test_extend_run_matches_append():
+    lamps = [1, 0, 1, 1, 0, 0, 1, 0, 1, 1]
+    toggles = bytes([1, 1, 0, 1, 0, 1])
+    bulk = StepHistory(lamps, checkpoint_interval=4)
+    single = StepHistory(lamps, checkpoint_interval=4)
+    bulk.append(0, False)
+    single.append(0, False)
+    bulk.extend_run(8, -1, toggles)
+    for i, toggle in enumerate(toggles):
+        single.append(8 - i, toggle)
+    assert list(bulk) == list(single)
+    assert bulk.final_lamps() == single.final_lamps()
+    for step in range(len(single) + 1):
+        assert bulk.lamps_at(step) == single.lamps_at(step)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+The incremental signature matcher against the quadratic reference.
+"""
+import random
+
+import pytest
+
+from strategies.random_signature import (_BitBuffer, _SignatureMatcher,
+                                         _matching_prefix_suffix_len)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matcher_matches_reference(seed):
+    # Signatures grow by at most one bit per observation, as in the
+    # strategy; observations mostly replay the signature from a random
+    # offset so that long matches occur
+    rng = random.Random(seed)
+    for _ in range(20):
+        written = _BitBuffer()
+        matcher = _SignatureMatcher(written)
+        written_bits, observed = [], []
+        for _ in range(rng.randint(0, 3)):
+            bit = rng.getrandbits(1)
+            written.append(bit)
+            written_bits.append(bit)
+            matcher.extend_signature()
+        replay = 0
+        for _ in range(150):
+            if rng.random() < 0.1:
+                replay = rng.randrange(max(1, len(written_bits)))
+            if written_bits and rng.random() < 0.85:
+                bit = written_bits[replay % len(written_bits)]
+                replay += 1
+            else:
+                bit = rng.getrandbits(1)
+            matcher.observe(bit)
+            observed.append(bit)
+            if rng.random() < 0.6:
+                bit = rng.getrandbits(1)
+                written.append(bit)
+                written_bits.append(bit)
+                matcher.extend_signature()
+            assert matcher.matching_len() == _matching_prefix_suffix_len(observed, written_bits)
+
+
+@pytest.mark.parametrize("period", [[0], [1, 0], [1, 1, 0]])
+def test_matcher_long_borders(period):
+    # A periodic signature has borders far beyond one byte
+    written = _BitBuffer()
+    matcher = _SignatureMatcher(written)
+    written_bits, observed = [], []
+    for i in range(700):
+        bit = period[i % len(period)]
+        written.append(bit)
+        written_bits.append(bit)
+        matcher.extend_signature()
+        matcher.observe(bit)
+        observed.append(bit)
+        if i % 50 == 49 or i > 650:
+            assert matcher.matching_len() == _matching_prefix_suffix_len(observed, written_bits)
+    assert matcher.wide
+    assert matcher.border(699) == 700 - len(period)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Row-stream consumers: the CSV writer keeps every column.
+"""
+import pandas as pd
+
+from utils.reporting import CsvResultWriter
+
+
+def test_csv_writer_adds_new_columns(tmp_path):
+    path = str(tmp_path / "results.csv")
+    rows = [{"n": 3, "strategy": "a", "estimate": None},
+            {"n": 4, "strategy": "a", "estimate": 4, "seeding": "stream"},
+            {"n": 5, "strategy": "b"},
+            {"n": 6, "strategy": "b", "phases": '{"main": 1}', "seeding": "legacy"}]
+    with CsvResultWriter(path) as writer:
+        for row in rows:
+            writer.write(row)
+        # Readable while open, with the columns known so far
+        assert list(pd.read_csv(path).columns) == ["n", "strategy", "estimate",
+                                                   "seeding", "phases"]
+    table = pd.read_csv(path, keep_default_na=False, dtype=str)
+    assert table.to_dict("records") == [
+        {"n": "3", "strategy": "a", "estimate": "", "seeding": "", "phases": ""},
+        {"n": "4", "strategy": "a", "estimate": "4", "seeding": "stream", "phases": ""},
+        {"n": "5", "strategy": "b", "estimate": "", "seeding": "", "phases": ""},
+        {"n": "6", "strategy": "b", "estimate": "", "seeding": "legacy",
+         "phases": '{"main": 1}'},
+    ]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Initial rings are replayable: legacy seeding reproduces the random module,
+stream seeding is deterministic per (seed, n, k).
+"""
+import random
+
+import numpy as np
+import pytest
+
+from utils.rng import lamp_chunks, legacy_random_bits, random_bits
+from utils.simulator import initial_lamps
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42, 12003, 2**40 + 5])
+@pytest.mark.parametrize("n", [0, 1, 31, 1000])
+def test_legacy_matches_random_module(seed, n):
+    random.seed(seed)
+    expected = [random.choice([0, 1]) for _ in range(n)]
+    assert legacy_random_bits(n, seed).tolist() == expected
+
+
+def test_legacy_default_seed_uses_k():
+    random.seed(42 + 5)
+    expected = [random.choice([0, 1]) for _ in range(64)]
+    assert initial_lamps(64, 5) == expected
+
+
+def test_global_random_state_untouched():
+    random.seed(123)
+    before = random.getstate()
+    initial_lamps(100, 3, 999)
+    initial_lamps(100, 3, 999, seeding="stream")
+    assert random.getstate() == before
+
+
+@pytest.mark.parametrize("k", [0, 1])
+def test_constant_rings(k):
+    assert initial_lamps(10, k, 7) == [k] * 10
+    assert initial_lamps(10, k, 7, seeding="stream") == [k] * 10
+
+
+def test_stream_is_replayable_and_independent():
+    first = random_bits(500, 3, 1234, "stream")
+    assert np.array_equal(first, random_bits(500, 3, 1234, "stream"))
+    assert not np.array_equal(first, random_bits(500, 4, 1234, "stream"))
+    assert not np.array_equal(first, random_bits(500, 3, 1235, "stream"))
+
+
+@pytest.mark.parametrize("seeding", ["legacy", "stream"])
+def test_chunks_concatenate_to_full_ring(seeding):
+    whole = random_bits(1000, 2, 77, seeding)
+    chunks = list(lamp_chunks(1000, 2, 77, seeding, chunk=64))
+    assert np.array_equal(np.concatenate(chunks), whole)
+
+
+def test_unknown_seeding_rejected():
+    with pytest.raises(ValueError):
+        initial_lamps(5, 2, 1, seeding="other")
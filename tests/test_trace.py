@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Trace files replay exactly the run that simulate() recorded.
+"""
+import pytest
+
+from strategies.counter import counter_strategy
+from strategies.powers_of_two import PowersOfTwo, powers_of_two_strategy
+from strategies.state_machine import state_machine_table
+from utils.simulator import simulate
+from utils.trace import HEADER, Trace, TraceWriter
+
+
+@pytest.mark.parametrize("strategy", [powers_of_two_strategy, PowersOfTwo(),
+                                      state_machine_table, counter_strategy])
+@pytest.mark.parametrize("n, k", [(1, 1), (12, 0), (30, 2), (75, 3)])
+def test_trace_round_trip(tmp_path, strategy, n, k):
+    path = str(tmp_path / "run.trace")
+    history, success, estimate, correct, steps = simulate(n, strategy, 5000, 1000 * n + k, k)
+    result = simulate(n, strategy, 5000, 1000 * n + k, k, trace=path)
+    assert result[1:] == (success, estimate, correct, steps)
+
+    trace = Trace(path)
+    assert (trace.n, trace.steps) == (n, steps)
+    assert (trace.success, trace.estimate, trace.correct) == (success, estimate, correct)
+    assert list(trace) == list(history)
+    assert trace.final_lamps() == history.final_lamps()
+    for step in (0, steps // 2, steps - 1, steps):
+        assert trace.lamps_at(step) == history.lamps_at(step)
+    assert trace[-1] == history[-1]
+
+
+def test_timeout_trace_has_no_estimate(tmp_path):
+    path = str(tmp_path / "run.trace")
+    simulate(50, powers_of_two_strategy, 20, 7, 2, trace=path)
+    trace = Trace(path)
+    assert (trace.success, trace.estimate, trace.steps) == (False, None, 20)
+
+
+def test_unfinished_trace_is_readable(tmp_path):
+    path = str(tmp_path / "run.trace")
+    writer = TraceWriter(path, [0, 1, 1], "partial", buffer_steps=2)
+    for pos in range(5):
+        writer.append(pos % 3, pos == 1, +1)
+    writer.flush()
+    trace = Trace(path)
+    assert trace.steps == 5
+    assert trace.estimate is None and not trace.success
+    assert trace.lamps_at(5) == [0, 0, 1]
+    writer.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * HEADER.size)
+    with pytest.raises(ValueError):
+        Trace(str(path))
+
+
+def test_header_is_64_bytes():
+    assert HEADER.size == 64
+
+
+@pytest.mark.parametrize("estimate", [None, -1, 0, 7])
+def test_estimate_round_trip(tmp_path, estimate):
+    path = str(tmp_path / "run.trace")
+    with TraceWriter(path, [1, 0, 1], "fixed") as writer:
+        writer.append(0, True, +1)
+        writer.close(estimate is not None, estimate, False)
+    trace = Trace(path)
+    assert trace.estimate == estimate
+    assert trace.success == (estimate is not None)
+    assert trace.strategy == "fixed"
+    assert trace.lamps_at(1) == [0, 0, 1]
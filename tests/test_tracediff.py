@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+diff_runs() and diff_traces() find the first step where two runs differ.
+"""
+from strategies.powers_of_two import PowersOfTwo, powers_of_two_strategy
+from strategies.state_machine import state_machine_strategy
+from utils.simulator import simulate
+from utils.tracediff import diff_runs, diff_traces
+
+
+def _first_difference(n, a, b, seed, k):
+    history_a = list(simulate(n, a, 5000, seed, k)[0])
+    history_b = list(simulate(n, b, 5000, seed, k)[0])
+    for step, (event_a, event_b) in enumerate(zip(history_a, history_b)):
+        if event_a != event_b:
+            return step
+    return min(len(history_a), len(history_b))
+
+
+def test_identical_versions():
+    diff = diff_runs(40, powers_of_two_strategy, PowersOfTwo(), 2, 40002)
+    assert diff.identical and diff.step is None
+    summary = diff.summary().set_index("metric")
+    assert summary.loc["steps", "delta"] == 0
+    assert summary.loc["estimate", "a"] == summary.loc["estimate", "b"] == 40
+    assert (diff.phase_deltas()["steps_a"].sum()
+            == simulate(40, powers_of_two_strategy, 5000, 40002, 2)[4])
+
+
+def test_first_divergent_step():
+    diff = diff_runs(30, powers_of_two_strategy, state_machine_strategy, 3, 30003,
+                     names=("powers", "machine"))
+    assert not diff.identical
+    assert diff.step == _first_difference(30, powers_of_two_strategy,
+                                           state_machine_strategy, 30003, 3)
+    assert diff.summary_a.name == "powers"
+    assert diff.summary_a.steps == simulate(30, powers_of_two_strategy, 5000, 30003, 3)[4]
+    assert diff.summary_b.steps == simulate(30, state_machine_strategy, 5000, 30003, 3)[4]
+
+
+def test_traces_agree_with_runs(tmp_path):
+    path_a, path_b = str(tmp_path / "a.trace"), str(tmp_path / "b.trace")
+    simulate(30, powers_of_two_strategy, 5000, 30003, 3, trace=path_a)
+    simulate(30, state_machine_strategy, 5000, 30003, 3, trace=path_b)
+    from_traces = diff_traces(path_a, path_b)
+    from_runs = diff_runs(30, powers_of_two_strategy, state_machine_strategy, 3, 30003)
+    assert from_traces.step == from_runs.step
+    assert from_traces.a["pos"] == from_runs.a["pos"]
+    assert from_traces.b["pos"] == from_runs.b["pos"]
+    assert from_traces.summary_a.steps == from_runs.summary_a.steps
+    assert from_traces.summary_b.toggles == from_runs.summary_b.toggles
+
+    assert diff_traces(path_a, path_a).identical
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+The forking exhaustive verifier against simulating all 2^n rings.
+"""
+from itertools import product
+
+import pytest
+
+from strategies.heimkehr_marker import simple_marker_strategy
+from strategies.powers_of_two import powers_of_two_strategy
+from utils.simulator import simulate
+from utils.verify import verify, verify_strategies
+
+
+def walk_to_first_off(lamp_state, memory):
+    """Wrong on purpose: reports the distance to the first OFF lamp."""
+    memory["steps"] = memory.get("steps", 0) + 1
+    if lamp_state == 0:
+        return False, 0, memory, True, memory["steps"]
+    return False, 1, memory, False, None
+
+
+def _brute_force(n, strategy, max_steps):
+    correct = wrong = timeouts = 0
+    for lamps in product((0, 1), repeat=n):
+        _, success, estimate, is_correct, _ = simulate(n, strategy, max_steps, lamps=lamps,
+                                                       record=False)
+        if is_correct:
+            correct += 1
+        elif success:
+            wrong += 1
+        else:
+            timeouts += 1
+    return correct, wrong, timeouts
+
+
+@pytest.mark.parametrize("strategy, max_steps", [
+    (powers_of_two_strategy, 5000),
+    (simple_marker_strategy, 5000),
+    (simple_marker_strategy, 12),
+    (walk_to_first_off, 100),
+])
+@pytest.mark.parametrize("n", [1, 2, 5, 8])
+def test_matches_brute_force(strategy, max_steps, n):
+    result = verify(n, strategy, max_steps)
+    assert result.configurations == 2 ** n
+    assert (result.correct, result.wrong, result.timeouts) == \
+        _brute_force(n, strategy, max_steps)
+    assert result.simulated_steps <= result.independent_steps
+
+
+def test_counterexample_fails():
+    result = verify(6, walk_to_first_off, 100)
+    assert not result.verified
+    for example in result.counterexamples:
+        _, success, estimate, correct, _ = simulate(6, walk_to_first_off, 100,
+                                                    lamps=example["lamps"])
+        assert not correct
+
+
+def test_workers_give_same_counts():
+    serial = verify(7, simple_marker_strategy, 5000)
+    parallel = verify(7, simple_marker_strategy, 5000, workers=2)
+    assert (parallel.correct, parallel.wrong, parallel.timeouts, parallel.branches) == \
+        (serial.correct, serial.wrong, serial.timeouts, serial.branches)
+
+
+def test_verify_strategies_stops_failed_strategy():
+    table = verify_strategies([3, 4], {"walk": walk_to_first_off,
+                                       "powers": powers_of_two_strategy},
+                              max_steps=100, verbose=False)
+    assert list(zip(table["n"], table["strategy"])) == [(3, "walk"), (3, "powers"),
+                                                        (4, "powers")]
+    assert table["verified"].tolist() == [False, True, True]
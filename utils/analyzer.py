@@ -8,7 +8,22 @@ Created on Sun Dec  7 18:15:11 2025
 """
 Data analysis and reporting functions
 """
+import numpy as np
 import pandas as pd
+from typing import Callable, Dict, Iterable
+
+from .profiling import PhaseProfile, FIELDS
+
+# Candidate growth models for steps(n), simplest first
+COMPLEXITY_MODELS: Dict[str, Callable] = {
+    'n': lambda n: n,
+    'n log n': lambda n: n * np.log2(n),
+    'n^1.5': lambda n: n ** 1.5,
+    'n^2': lambda n: n ** 2,
+}
+
+# Train lengths the complexity report extrapolates to
+EXTRAPOLATE_TO = (10**3, 10**4, 10**5, 10**6)
 
 
 def generate_report(df: pd.DataFrame):
@@ -21,28 +36,328 @@ def generate_report(df: pd.DataFrame):
     
     # Success rate by n
     print("\n1. Success Rate by Wagon Count:")
-    success_by_n = df.groupby('n')['success'].mean().round(3)
+    success_by_n = df.groupby('n', observed=True)['success'].mean().round(3)
     for n, rate in success_by_n.items():
         print(f"  n={n:3d}: {rate:.1%}")
     
     # Success rate by k
     print("\n2. Success Rate by Initial Configuration (k):")
-    success_by_k = df.groupby('k')['success'].mean().round(3)
+    success_by_k = df.groupby('k', observed=True)['success'].mean().round(3)
     for k, rate in success_by_k.items():
         k_desc = "All OFF" if k == 0 else "All ON" if k == 1 else f"Random (seed+{k})"
         print(f"  k={k}: {k_desc:20s} - {rate:.1%}")
     
     # Best strategy by efficiency
     print("\n3. Average Steps per Wagon (lower is better):")
-    efficiency = df[df['success']].groupby('strategy')['efficiency'].mean().sort_values()
+    efficiency = df[df['success']].groupby('strategy', observed=True)['efficiency'].mean().sort_values()
     for strategy, eff in efficiency.items():
         print(f"  {strategy:25s}: {eff:.1f} steps/wagon")
     
     # Find problematic configurations
     print("\n4. Failed Simulations:")
     failed = df[~df['success']]
+    if len(failed) > 0:
+        for n, k, strategy in zip(failed['n'], failed['k'], failed['strategy']):
+            print(f"  n={n}, k={k}, strategy={strategy}")
+    else:
+        print("  None! All simulations succeeded.")
+    
+    # Timeouts (budget exhausted) vs. wrong answers
+    if 'timeout' in df.columns:
+        print("\n5. Timeouts and Wasted Steps:")
+        wasted = df.groupby('strategy', observed=True).agg({'timeout': 'sum', 'wasted_steps': 'sum'})
+        wasted = wasted[(wasted['timeout'] > 0) | (wasted['wasted_steps'] > 0)]
+        if len(wasted) > 0:
+            for strategy, row in wasted.iterrows():
+                print(f"  {strategy:25s}: {int(row['timeout'])} timeouts, "
+                      f"{int(row['wasted_steps'])} steps without a correct result")
+        else:
+            print("  None! No step budget was exhausted or wasted.")
+    
+    # Growth of steps with n
+    print("\n6. Asymptotic Complexity (best fitting model):")
+    print_complexity(fit_complexity(df))
+    
+    # Where the steps go inside each strategy
+    if 'phases' in df.columns:
+        print("\n7. Phase Breakdown (all configurations):")
+        print_phase_breakdown(phase_breakdown(df))
+
+
+def _weighted_median(values: np.ndarray, counts: np.ndarray) -> float:
+    """np.median of values, each repeated counts times."""
+    order = np.argsort(values, kind='stable')
+    values, ends = values[order], np.cumsum(counts[order])
+    total = int(ends[-1])
+    low = values[np.searchsorted(ends, (total - 1) // 2, side='right')]
+    high = values[np.searchsorted(ends, total // 2, side='right')]
+    return (low + high) / 2
+
+
+def _robust_fit(x: np.ndarray, y: np.ndarray, huber_k: float = 1.345,
+                iterations: int = 50, counts: np.ndarray = None):
+    """
+    Huber regression of y ≈ intercept + constant · x on relative residuals.
+    
+    Relative residuals keep the large n from dominating the fit; Huber
+    weights (iteratively reweighted least squares) limit the influence of
+    single outlying configurations. counts gives the multiplicity of each
+    point, so repeated runs can be fitted as distinct points.
+    
+    Returns:
+        (constant, intercept)
+    """
+    counts = np.ones_like(y) if counts is None else counts
+    X = np.column_stack([np.ones_like(x), x])
+    weights = np.ones_like(y)
+    beta = np.zeros(2)
+    for _ in range(iterations):
+        scale_rows = np.sqrt(weights * counts) / y
+        new_beta = np.linalg.lstsq(X * scale_rows[:, None], y * scale_rows, rcond=None)[0]
+        residuals = (y - X @ new_beta) / y
+        center = _weighted_median(residuals, counts)
+        scale = _weighted_median(np.abs(residuals - center), counts) / 0.6745
+        converged = np.allclose(new_beta, beta, rtol=1e-9, atol=1e-12)
+        beta = new_beta
+        if scale == 0 or converged:
+            break
+        weights = np.minimum(1.0, huber_k * scale / np.maximum(np.abs(residuals), 1e-300))
+    return beta[1], beta[0]
+
+
+def fit_complexity(df: pd.DataFrame, models: Dict[str, Callable] = None,
+                   min_sizes: int = 3) -> pd.DataFrame:
+    """
+    Fit steps-vs-n of every strategy against candidate growth models.
+    
+    Only runs that returned the correct n are used. Each model is fitted as
+    steps ≈ intercept + constant · f(n) with robust regression.
+    
+    Args:
+        df: Simulation results (n, strategy, steps, success, correct)
+        models: Name -> f(n) (default: COMPLEXITY_MODELS)
+        min_sizes: Distinct n a strategy needs to be fitted
+    
+    Returns:
+        DataFrame with one row per (strategy, model): constant, intercept,
+        r2, median relative error, number of points and whether it is the
+        strategy's best model (smallest median relative error)
+    """
+    models = models or COMPLEXITY_MODELS
+    solved = df[df['success'] & df['correct']]
+    rows = []
+    for strategy, group in solved.groupby('strategy', sort=False, observed=True):
+        if group['n'].nunique() < min_sizes:
+            continue
+        # Repeated (n, steps) pairs are fitted once, weighted by their count
+        points = group.groupby(['n', 'steps'], observed=True).size()
+        n = points.index.get_level_values('n').to_numpy(dtype=float)
+        steps = points.index.get_level_values('steps').to_numpy(dtype=float)
+        counts = points.to_numpy(dtype=float)
+        mean = np.average(steps, weights=counts)
+        strategy_rows = []
+        for model, f in models.items():
+            constant, intercept = _robust_fit(f(n), steps, counts=counts)
+            predicted = intercept + constant * f(n)
+            total = np.sum(counts * (steps - mean) ** 2)
+            strategy_rows.append({
+                'strategy': strategy,
+                'model': model,
+                'constant': constant,
+                'intercept': intercept,
+                'r2': 1 - np.sum(counts * (steps - predicted) ** 2) / total if total > 0 else np.nan,
+                'median_rel_error': _weighted_median(np.abs(steps - predicted) / steps, counts),
+                'points': len(group),
+                'best': False,
+            })
+        # A model needs a growing cost; ties go to the simpler model
+        valid = [row for row in strategy_rows if row['constant'] > 0]
+        if valid:
+            min(valid, key=lambda row: row['median_rel_error'])['best'] = True
+        rows += strategy_rows
+    return pd.DataFrame(rows, columns=['strategy', 'model', 'constant', 'intercept', 'r2',
+                                       'median_rel_error', 'points', 'best'])
+
+
+def extrapolate_complexity(fits: pd.DataFrame, sizes: Iterable[int] = EXTRAPOLATE_TO,
+                           models: Dict[str, Callable] = None) -> pd.DataFrame:
+    """
+    Expected steps at unsimulated n from each strategy's best model.
+    
+    Returns:
+        DataFrame with columns strategy, model, n, expected_steps
+    """
+    models = models or COMPLEXITY_MODELS
+    rows = []
+    for _, fit in fits[fits['best'].astype(bool)].iterrows():
+        for n in sizes:
+            rows.append({
+                'strategy': fit['strategy'],
+                'model': fit['model'],
+                'n': n,
+                'expected_steps': fit['intercept'] + fit['constant'] * models[fit['model']](float(n)),
+            })
+    return pd.DataFrame(rows, columns=['strategy', 'model', 'n', 'expected_steps'])
+
+
+def print_complexity(fits: pd.DataFrame, sizes: Iterable[int] = EXTRAPOLATE_TO):
+    """Print the best model per strategy and its extrapolated cost."""
+    best = fits[fits['best'].astype(bool)].sort_values('median_rel_error')
+    if len(best) == 0:
+        print("  Not enough correct runs at different n to fit a model.")
+        return
+    sizes = list(sizes)
+    expected = extrapolate_complexity(fits, sizes)
+    print(f"  {'strategy':34s} {'model':>8s} {'constant':>9s} {'intercept':>10s} "
+          f"{'R²':>6s} {'rel.err':>7s}  " + " ".join(f"{f'n={n:.0e}':>9s}" for n in sizes))
+    for _, fit in best.iterrows():
+        costs = expected[expected['strategy'] == fit['strategy']]['expected_steps']
+        print(f"  {fit['strategy']:34s} {fit['model']:>8s} {fit['constant']:9.3f} "
+              f"{fit['intercept']:10.1f} {fit['r2']:6.3f} {fit['median_rel_error']:7.1%}  "
+              + " ".join(f"{cost:9.2e}" for cost in costs))
+
+
+def phase_breakdown(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand the JSON 'phases' column of profiled results into long format.
+    
+    Returns:
+        DataFrame with one row per (n, k, strategy, phase): steps, toggles,
+        reversals, seconds and the phase's share of the run's steps
+    """
+    rows = []
+    for _, result in df.iterrows():
+        profile = PhaseProfile.from_json(result.get('phases'))
+        for phase, values in profile.phases.items():
+            row = {'n': result['n'], 'k': result['k'], 'strategy': result['strategy'],
+                   'phase': phase}
+            row.update(zip(FIELDS, values))
+            row['step_share'] = values[0] / result['steps'] if result['steps'] else 0.0
+            rows.append(row)
+    return pd.DataFrame(rows, columns=['n', 'k', 'strategy', 'phase', *FIELDS, 'step_share'])
+
+
+def print_phase_breakdown(phases: pd.DataFrame):
+    """Print the share of steps and time per phase, totalled per strategy."""
+    if len(phases) == 0:
+        print("  No phase profiles recorded.")
+        return
+    totals = phases.groupby(['strategy', 'phase'], sort=False, observed=True)[list(FIELDS)].sum()
+    for strategy, group in totals.groupby(level=0, sort=False):
+        steps = group['steps'].sum()
+        seconds = group['seconds'].sum()
+        print(f"  {strategy}:")
+        for (_, phase), row in group.iterrows():
+            print(f"    {phase:20s} {row['steps'] / steps:6.1%} of steps, "
+                  f"{row['seconds'] / seconds if seconds else 0:6.1%} of time, "
+                  f"{int(row['toggles'])} toggles, {int(row['reversals'])} reversals")
+
+
+def generate_monte_carlo_report(df: pd.DataFrame):
+    """
+    Report Monte Carlo results (see utils.montecarlo) with confidence intervals.
+    """
+    confidence = df['confidence'].iloc[0] if len(df) > 0 else 0.95
+    print("\n" + "="*80)
+    print(f"MONTE CARLO REPORT ({confidence:.0%} confidence intervals)")
+    print("="*80)
+    
+    print("\n1. Success Rate on Random Configurations:")
+    for _, row in df.iterrows():
+        print(f"  n={row['n']:4d} {row['strategy']:35s}: {row['success_rate']:6.1%} "
+              f"[{row['success_ci_low']:.1%}, {row['success_ci_high']:.1%}] "
+              f"correct {row['correct_rate']:6.1%} ({row['samples']} samples)")
+    
+    print("\n2. Mean Steps of Successful Runs:")
+    for _, row in df.iterrows():
+        print(f"  n={row['n']:4d} {row['strategy']:35s}: {row['mean_steps']:9.1f} "
+              f"[{row['steps_ci_low']:.1f}, {row['steps_ci_high']:.1f}] "
+              f"(std {row['std_steps']:.1f}, {row['efficiency']:.1f} steps/wagon)")
+    
+    print("\n3. Not Converged (max_samples reached):")
+    open_rows = df[~df['converged']]
+    if len(open_rows) > 0:
+        for _, row in open_rows.iterrows():
+            print(f"  n={row['n']}, strategy={row['strategy']}")
+    else:
+        print("  None! All intervals reached the target width.")
+
+
+def generate_verification_report(df: pd.DataFrame):
+    """
+    Report exhaustive verification results (see utils.verify).
+    """
+    print("\n" + "="*80)
+    print("EXHAUSTIVE VERIFICATION REPORT (all 2^n initial configurations)")
+    print("="*80)
+    
+    print("\n1. Largest n Verified per Strategy:")
+    for strategy, group in df.groupby('strategy', sort=False, observed=True):
+        verified = group[group['verified']]
+        failed = group[~group['verified']]
+        largest = f"n <= {verified['n'].max()}" if len(verified) > 0 else "none"
+        note = f", fails at n={failed['n'].min()}" if len(failed) > 0 else ""
+        print(f"  {strategy:35s}: {largest}{note}")
+    
+    print("\n2. Counterexamples:")
+    failed = df[~df['verified']]
     if len(failed) > 0:
         for _, row in failed.iterrows():
-            print(f"  n={row['n']}, k={row['k']}, strategy={row['strategy']}")
+            print(f"  n={row['n']:3d} {row['strategy']:35s}: {row['wrong']} wrong, "
+                  f"{row['timeouts']} timeouts, e.g. lamps {row['counterexample']}")
     else:
-        print("  None! All simulations succeeded.")
\ No newline at end of file
+        print("  None! Every configuration returned the correct n.")
+    
+    print("\n3. Simulated Steps vs. Independent Simulations:")
+    largest = df.loc[df.groupby('strategy', sort=False, observed=True)['n'].idxmax()]
+    for _, row in largest.iterrows():
+        print(f"  n={row['n']:3d} {row['strategy']:35s}: {row['simulated_steps']:12d} "
+              f"of {row['independent_steps']:15d} steps ({row['step_ratio']:.4%})")
+
+
+def trace_phases(trace) -> pd.DataFrame:
+    """
+    Steps, toggles and direction reversals per phase of a recorded trace.
+    
+    Args:
+        trace: utils.trace.Trace or path of a trace file
+    
+    Returns:
+        DataFrame with one row per phase (in order of first use): steps,
+        toggles, reversals and the phase's share of the run's steps
+    """
+    if isinstance(trace, str):
+        from .trace import Trace
+        trace = Trace(trace)
+    codes = np.asarray(trace.records['phase'])
+    moves = np.asarray(trace.moves)
+    toggles = np.asarray(trace.toggles)
+    # A reversal is a move against the last non-zero move
+    moving = np.flatnonzero(moves)
+    reversed_at = moving[1:][moves[moving[1:]] != moves[moving[:-1]]]
+    labels = trace.phase_labels or ['main']
+    used = pd.unique(codes)
+    steps = np.bincount(codes, minlength=len(labels))
+    toggled = np.bincount(codes, weights=toggles, minlength=len(labels))
+    reversals = np.bincount(codes[reversed_at], minlength=len(labels))
+    return pd.DataFrame({
+        'phase': [labels[code] for code in used],
+        'steps': steps[used],
+        'toggles': toggled[used].astype(int),
+        'reversals': reversals[used],
+        'step_share': steps[used] / max(len(codes), 1),
+    })
+
+
+def print_trace_report(trace):
+    """Print the result and phase breakdown of a recorded trace."""
+    if isinstance(trace, str):
+        from .trace import Trace
+        trace = Trace(trace)
+    result = (f"n={trace.estimate} ({'correct' if trace.correct else 'wrong'})"
+              if trace.success else "no result")
+    print(f"  {trace.strategy or 'unknown strategy'}: {trace.n} wagons, "
+          f"{len(trace)} steps, {result}")
+    for _, row in trace_phases(trace).iterrows():
+        print(f"    {row['phase']:20s} {row['step_share']:6.1%} of steps, "
+              f"{int(row['toggles'])} toggles, {int(row['reversals'])} reversals")
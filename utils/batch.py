@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized batch engine for the built-in deterministic strategies.
+
+Many independent trains of the same length n are stepped in lockstep.
+Lamps live in a (batch, n) uint8 array and the strategy memory of every
+train is a set of NumPy columns, so one loop iteration advances the whole
+batch without a Python call per train. Each supported strategy is a
+column-wise port of the corresponding module in ``strategies/`` and yields
+exactly the same (success, estimate, correct, steps) as ``simulate()``.
+"""
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from strategies.base_strategy import Strategy
+from strategies.heimkehr_marker import HeimkehrMarker, simple_marker_strategy
+from strategies.optimized_powers import optimized_powers_strategy
+from strategies.powers_of_two import PowersOfTwo, powers_of_two_strategy
+
+from .rng import random_bits
+
+BatchResult = Tuple[bool, Optional[int], bool, int]
+
+
+def _columns(batch: int, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    return {name: np.zeros(batch, dtype=np.int64) for name in names}
+
+
+def _outputs(batch: int):
+    toggle = np.zeros(batch, dtype=bool)
+    move = np.ones(batch, dtype=np.int64)
+    done = np.zeros(batch, dtype=bool)
+    estimate = np.zeros(batch, dtype=np.int64)
+    return toggle, move, done, estimate
+
+
+# ---------------------------------------------------------------------------
+# Heimkehr-Marker: init_off=0, search_off=1, go_back=2
+# ---------------------------------------------------------------------------
+def _marker_init(batch: int) -> Dict[str, np.ndarray]:
+    return _columns(batch, ["phase", "steps_from_start", "last_cycle_length"])
+
+
+def _marker_step(lamp: np.ndarray, s: Dict[str, np.ndarray]):
+    toggle, move, done, estimate = _outputs(lamp.size)
+    phase = s["phase"]
+    sfs = s["steps_from_start"]
+    on = lamp == 1
+    init, search, back = phase == 0, phase == 1, phase == 2
+
+    # PHASE 1: turn start lamp OFF
+    toggle[init] = on[init]
+    phase[init] = 1
+    sfs[init] = 0
+
+    # PHASE 2: forward until an OFF lamp, switch it ON
+    sfs[search] += 1
+    found = search & ~on
+    toggle |= found
+    phase[found] = 2
+    s["last_cycle_length"][found] = sfs[found]
+    move[found] = -1
+
+    # PHASE 3: back to start
+    sfs[back] -= 1
+    home = back & (sfs == 0)
+    finished = home & on
+    done |= finished
+    estimate[finished] = s["last_cycle_length"][finished]
+    move[finished] = 0
+    phase[home & ~on] = 1
+    move[back & ~home] = -1
+    return toggle, move, done, estimate
+
+
+# ---------------------------------------------------------------------------
+# Powers-Of-Two: init_on=0, forward=1, return=2, count_prep=3, counting=4
+# ---------------------------------------------------------------------------
+def _powers_init(batch: int) -> Dict[str, np.ndarray]:
+    return _columns(batch, ["phase", "power", "steps_forward",
+                            "target_distance", "count"])
+
+
+def _powers_step(lamp: np.ndarray, s: Dict[str, np.ndarray]):
+    toggle, move, done, estimate = _outputs(lamp.size)
+    phase = s["phase"]
+    power = s["power"]
+    sf = s["steps_forward"]
+    target = s["target_distance"]
+    on = lamp == 1
+    init, fwd, ret, prep, cnt = (phase == 0, phase == 1, phase == 2,
+                                 phase == 3, phase == 4)
+
+    toggle[:] = ((init | prep) & ~on) | (fwd & on)
+
+    # PHASE 0: ensure cart 0 is ON
+    phase[init] = 1
+    target[init] = 1 << power[init]
+    sf[init] = 0
+
+    # PHASE 1: forward, switching lamps OFF
+    sf[fwd] += 1
+    reached = fwd & (sf >= target)
+    phase[reached] = 2
+    move[reached] = -1
+
+    # PHASE 2: return to cart 0
+    sf[ret] -= 1
+    home = ret & (sf == 0)
+    phase[home & ~on] = 3
+    again = home & on
+    power[again] += 1
+    phase[again] = 1
+    target[again] = 1 << power[again]
+    sf[again] = 0
+    move[ret & ~home] = -1
+
+    # PHASE 3: prepare counting
+    phase[prep] = 4
+    s["count"][prep] = 0
+
+    # PHASE 4: count until the ON lamp
+    s["count"][cnt] += 1
+    found = cnt & on
+    done |= found
+    estimate[found] = s["count"][found]
+    move[found] = 0
+    return toggle, move, done, estimate
+
+
+# ---------------------------------------------------------------------------
+# Optimized-Powers: init_on=0, forward=1, verify_all_off=2, return=3,
+#                   count_prep=4, counting=5
+# ---------------------------------------------------------------------------
+def _optimized_init(batch: int) -> Dict[str, np.ndarray]:
+    return _columns(batch, ["phase", "power", "steps_forward",
+                            "lights_turned_off", "consecutive_off", "count"])
+
+
+def _optimized_step(lamp: np.ndarray, s: Dict[str, np.ndarray]):
+    toggle, move, done, estimate = _outputs(lamp.size)
+    phase = s["phase"]
+    power = s["power"]
+    sf = s["steps_forward"]
+    lto = s["lights_turned_off"]
+    co = s["consecutive_off"]
+    count = s["count"]
+    on = lamp == 1
+    init, fwd, verify, ret, prep, cnt = (phase == 0, phase == 1, phase == 2,
+                                         phase == 3, phase == 4, phase == 5)
+
+    toggle[:] = ((init | prep) & ~on) | (fwd & on)
+
+    # PHASE 0: ensure cart 0 is ON
+    phase[init] = 1
+    sf[init] = 0
+    lto[init] = 0
+    co[init] = 0
+
+    # PHASE 1: forward, counting switched and consecutive OFF lamps
+    target = 1 << power
+    sf[fwd] += 1
+    lto[fwd & on] += 1
+    co[fwd & on] = 0
+    co[fwd & ~on] += 1
+    enough = fwd & (lto >= target)
+    phase[enough] = 3
+    gap = fwd & ~enough & (co >= target)
+    phase[gap] = 2
+    move[enough | gap] = -1
+
+    # PHASE 2/3: walk back to cart 0
+    sf[verify | ret] -= 1
+    walking = (verify & (sf > 0)) | (ret & (sf != 0))
+    move[walking] = -1
+    home = (verify | ret) & ~walking
+    phase[home & ~on] = 4
+    again = home & on
+    power[again] += 1
+    phase[again] = 1
+    lto[again] = 0
+    co[again] = 0
+    sf[again] = 0
+
+    # PHASE 4: prepare counting
+    phase[prep] = 5
+    count[prep] = 1
+
+    # PHASE 5: count until the ON lamp
+    found = cnt & on
+    done |= found
+    estimate[found] = count[found]
+    move[found] = 0
+    count[cnt & ~on] += 1
+    return toggle, move, done, estimate
+
+
+# Strategy function or v2 class -> (state initializer, vectorized step)
+BATCH_STRATEGIES: Dict[Callable, Tuple[Callable, Callable]] = {
+    simple_marker_strategy: (_marker_init, _marker_step),
+    HeimkehrMarker: (_marker_init, _marker_step),
+    powers_of_two_strategy: (_powers_init, _powers_step),
+    PowersOfTwo: (_powers_init, _powers_step),
+    optimized_powers_strategy: (_optimized_init, _optimized_step),
+}
+
+
+def _batch_port(strategy: Callable) -> Optional[Tuple[Callable, Callable]]:
+    """Vectorized port of a strategy; v2 instances are looked up by class."""
+    port = BATCH_STRATEGIES.get(strategy)
+    if port is None and isinstance(strategy, Strategy):
+        port = BATCH_STRATEGIES.get(type(strategy))
+    return port
+
+
+def supports_batch(strategy: Callable) -> bool:
+    """Whether a vectorized port of this strategy exists."""
+    return _batch_port(strategy) is not None
+
+
+def batch_lamps(n: int, ks: Iterable[Optional[int]],
+                seeds: Optional[Iterable[Optional[int]]] = None,
+                seeding: str = "legacy") -> np.ndarray:
+    """
+    Stack the initial lamp rings simulate() would build for each (k, seed).
+
+    Returns:
+        uint8 array of shape (len(ks), n)
+    """
+    ks = list(ks)
+    seeds = [None] * len(ks) if seeds is None else list(seeds)
+    rings = np.zeros((len(ks), n), dtype=np.uint8)
+    for row, (k, seed) in enumerate(zip(ks, seeds)):
+        rings[row] = random_bits(n, k, seed, seeding)
+    return rings
+
+
+def random_lamps(n: int, batch: int, seed: Optional[int] = None) -> np.ndarray:
+    """Uniformly random lamp rings for Monte Carlo runs, shape (batch, n)."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2, size=(batch, n), dtype=np.uint8)
+
+
+def simulate_batch(strategy: Callable, lamps, max_steps: int = 5000) -> List[BatchResult]:
+    """
+    Run one strategy on many trains of the same length in lockstep.
+
+    Args:
+        strategy: One of the strategies in BATCH_STRATEGIES
+        lamps: Initial lamp rings, array-like of shape (batch, n)
+        max_steps: Maximum steps before timeout
+
+    Returns:
+        List of (success, estimate, result_is_correct, steps_used) per train,
+        identical to the last four values returned by simulate()
+    """
+    port = _batch_port(strategy)
+    if port is None:
+        raise ValueError(f"No batch implementation for strategy {strategy!r}")
+    init, step_fn = port
+
+    lamps = np.array(lamps, dtype=np.uint8, ndmin=2)
+    batch, n = lamps.shape
+
+    success = np.zeros(batch, dtype=bool)
+    estimates = np.zeros(batch, dtype=np.int64)
+    steps = np.full(batch, max_steps, dtype=np.int64)
+
+    # Columns for trains that are still running
+    ids = np.arange(batch)
+    pos = np.zeros(batch, dtype=np.int64)
+    state = init(batch)
+
+    for step in range(max_steps):
+        if ids.size == 0:
+            break
+        lamp = lamps[ids, pos]
+        toggle, move, done, estimate = step_fn(lamp, state)
+
+        lamps[ids[toggle], pos[toggle]] ^= 1
+
+        if done.any():
+            finished = ids[done]
+            success[finished] = True
+            estimates[finished] = estimate[done]
+            steps[finished] = step + 1
+            keep = ~done
+            ids, pos, move = ids[keep], pos[keep], move[keep]
+            state = {name: column[keep] for name, column in state.items()}
+
+        pos = (pos + move) % n
+
+    return [(bool(ok), int(est) if ok else None, bool(ok) and int(est) == n, int(used))
+            for ok, est, used in zip(success, estimates, steps)]
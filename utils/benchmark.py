@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for simulator and strategy throughput.
+
+Runs a fixed (n, k, strategy) matrix through simulate() and reports steps
+per second, wall time, peak memory and history size. Strategies whose
+module defines memory_footprint(memory) (random-signature) also report the
+bytes their run memory holds at the end. Results are saved as
+JSON and can be compared against a stored baseline:
+
+    python -m utils.benchmark --save benchmark_baseline.json
+    python -m utils.benchmark --compare benchmark_baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .simulator import simulate, _config_seed
+
+# Default matrix: sizes from main.py, all three initial configuration modes
+DEFAULT_SIZES = [12, 48, 100, 200, 500]
+DEFAULT_KS = [0, 1, 2]
+
+
+def _footprint_recorder(strategy: Callable) -> Tuple[Callable, Callable[[], Optional[int]]]:
+    """
+    Wrap a strategy so the bytes its memory holds can be read after a run.
+
+    Only strategies whose module provides memory_footprint(memory) are
+    wrapped. Returns (strategy to simulate, function giving the bytes held
+    at the end of that run, or None).
+    """
+    footprint = getattr(sys.modules.get(getattr(strategy, "__module__", None)),
+                        "memory_footprint", None)
+    if footprint is None:
+        return strategy, lambda: None
+    last = {}
+
+    def recording(lamp_state, memory):
+        result = strategy(lamp_state, memory)
+        last["memory"] = result[2]
+        return result
+
+    return recording, lambda: footprint(last["memory"])["total"] if last else None
+
+
+def benchmark_simulation(n: int, k: int, strategy: Callable,
+                         max_steps: int = 5000, repeat: int = 3) -> Dict:
+    """
+    Time one (n, k, strategy) simulation.
+
+    Wall time is the best of ``repeat`` runs. Peak memory is measured in one
+    extra run under tracemalloc so the timing runs stay undisturbed; the
+    strategy memory footprint is read at the end of that same run.
+    """
+    seed = _config_seed(n, k)
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        history, success, estimate, correct, steps = simulate(n, strategy, max_steps, seed, k)
+        best = min(best, time.perf_counter() - start)
+
+    recorded, strategy_bytes = _footprint_recorder(strategy)
+    tracemalloc.start()
+    try:
+        simulate(n, recorded, max_steps, seed, k)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "n": n,
+        "k": k,
+        "steps": steps,
+        "success": success,
+        "correct": correct,
+        "wall_time": best,
+        "steps_per_sec": steps / best if best > 0 else None,
+        "peak_memory": peak,
+        "history_steps": len(history),
+        "history_bytes": history.nbytes(),
+        "strategy_bytes": strategy_bytes(),
+    }
+
+
+def run_benchmarks(strategies: Dict[str, Callable],
+                   configs: Optional[List[Tuple[int, int]]] = None,
+                   max_steps: int = 5000, repeat: int = 3,
+                   verbose: bool = True) -> pd.DataFrame:
+    """
+    Benchmark every strategy on every (n, k) config.
+
+    Args:
+        strategies: Dictionary of strategy_name -> strategy_function
+        configs: List of (n, k) tuples (default: DEFAULT_SIZES x DEFAULT_KS)
+        max_steps: Maximum steps per simulation
+        repeat: Timing runs per simulation (best is reported)
+
+    Returns:
+        DataFrame with one row per (n, k, strategy)
+    """
+    if configs is None:
+        configs = [(n, k) for n in DEFAULT_SIZES for k in DEFAULT_KS]
+
+    rows = []
+    for n, k in configs:
+        for strategy_name, strategy in strategies.items():
+            row = benchmark_simulation(n, k, strategy, max_steps, repeat)
+            row["strategy"] = strategy_name
+            rows.append(row)
+            if verbose:
+                # No rate when the run was too fast for the clock
+                rate = (f"{row['steps_per_sec']:12,.0f}" if row['steps_per_sec'] is not None
+                        else f"{'-':>12s}")
+                print(f"n={n:5d} k={k} {strategy_name:35s} "
+                      f"{row['steps']:7d} steps {row['wall_time'] * 1000:9.2f} ms "
+                      f"{rate} steps/s "
+                      f"{row['peak_memory'] / 1024:9.1f} KiB peak"
+                      + (f" {row['strategy_bytes']:8d} B strategy memory"
+                         if row['strategy_bytes'] is not None else ""))
+
+    df = pd.DataFrame(rows)
+    return df[["n", "k", "strategy"] + [c for c in df.columns if c not in ("n", "k", "strategy")]]
+
+
+def save_results(df: pd.DataFrame, path: str, max_steps: int = 5000):
+    """Write benchmark rows plus machine metadata as JSON."""
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "max_steps": max_steps,
+        "results": df.to_dict(orient="records"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+    print(f"Benchmark results saved to: {path}")
+
+
+def load_results(path: str) -> pd.DataFrame:
+    with open(path, encoding="utf-8") as f:
+        return pd.DataFrame(json.load(f)["results"])
+
+
+def compare_to_baseline(df: pd.DataFrame, baseline: pd.DataFrame,
+                        tolerance: float = 0.10) -> pd.DataFrame:
+    """
+    Compare a benchmark run with a baseline run.
+
+    Args:
+        df: Current results
+        baseline: Baseline results (e.g. from load_results)
+        tolerance: Relative throughput loss still counted as unchanged
+
+    Returns:
+        DataFrame with speedup (current/baseline steps per second), changes
+        in steps and history size, and a status column
+        (faster / slower / unchanged / behaviour changed / not timed).
+        Runs without a measured rate (steps_per_sec None) have speedup NaN
+        and are "not timed".
+    """
+    keys = ["n", "k", "strategy"]
+    cols = ["steps", "steps_per_sec", "peak_memory", "history_bytes"]
+    merged = df[keys + cols].merge(baseline[keys + cols], on=keys,
+                                   suffixes=("", "_baseline"))
+    rate = pd.to_numeric(merged["steps_per_sec"], errors="coerce")
+    baseline_rate = pd.to_numeric(merged["steps_per_sec_baseline"], errors="coerce")
+    merged["speedup"] = rate / baseline_rate
+    merged["memory_ratio"] = merged["peak_memory"] / merged["peak_memory_baseline"]
+
+    def status(row):
+        if row["steps"] != row["steps_baseline"]:
+            return "behaviour changed"
+        if pd.isna(row["speedup"]):
+            return "not timed"
+        if row["speedup"] < 1 - tolerance:
+            return "slower"
+        if row["speedup"] > 1 + tolerance:
+            return "faster"
+        return "unchanged"
+
+    merged["status"] = merged.apply(status, axis=1)
+    return merged
+
+
+def print_comparison(comparison: pd.DataFrame):
+    print("\n" + "="*80)
+    print("BENCHMARK COMPARISON (speedup = current / baseline steps per second)")
+    print("="*80)
+    summary = comparison.groupby("strategy").agg({
+        "speedup": "median",
+        "memory_ratio": "median",
+    }).round(2)
+    print(summary.to_string())
+    flagged = comparison[comparison["status"].isin(["slower", "behaviour changed"])]
+    if len(flagged) > 0:
+        print("\nRegressions:")
+        for _, row in flagged.iterrows():
+            print(f"  n={row['n']}, k={row['k']}, strategy={row['strategy']}: "
+                  f"{row['status']} (speedup {row['speedup']:.2f}, "
+                  f"steps {row['steps_baseline']} → {row['steps']})")
+    else:
+        print("\nNo regressions.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulator throughput benchmarks")
+    parser.add_argument("--strategies", nargs="*",
+                        help="strategy names to benchmark (default: all)")
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--ks", nargs="*", type=int, default=DEFAULT_KS)
+    parser.add_argument("--max-steps", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    from strategies import strategies
+    selected = {name: strategies[name] for name in (args.strategies or strategies)}
+    configs = [(n, k) for n in args.sizes for k in args.ks]
+
+    df = run_benchmarks(selected, configs, args.max_steps, args.repeat)
+    if args.save:
+        save_results(df, args.save, args.max_steps)
+    if args.compare:
+        comparison = compare_to_baseline(df, load_results(args.compare), args.tolerance)
+        print_comparison(comparison)
+        if comparison["status"].isin(["slower", "behaviour changed"]).any():
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive step budgets for simulation sweeps.
+
+Instead of one fixed max_steps for every train length, StepBudget fits
+steps ≈ c · n^p per strategy on the runs that already finished (worst case
+over k for every n) and gives the next run the prediction times a headroom
+factor. Strategies without enough data get the default budget.
+"""
+import math
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+
+class StepBudget:
+    """
+    Per-strategy step budget policy.
+
+    Args:
+        max_steps: Budget until a strategy has finished runs at two
+                   different train lengths
+        headroom: Factor applied to the predicted step count
+        max_budget: Upper bound for any budget (also bounds image heights)
+        min_exponent, max_exponent: Range the fitted exponent p is clipped to
+    """
+
+    def __init__(self, max_steps: int = 5000, headroom: float = 2.0,
+                 max_budget: int = 50000, min_exponent: float = 1.0,
+                 max_exponent: float = 3.0):
+        self.max_steps = max_steps
+        self.headroom = headroom
+        self.max_budget = max_budget
+        self.min_exponent = min_exponent
+        self.max_exponent = max_exponent
+        # strategy -> n -> most steps of a successful run
+        self._worst: Dict[str, Dict[int, int]] = defaultdict(dict)
+
+    def record(self, strategy_name: str, n: int, success: bool, steps: int):
+        """Add a finished run (timeouts carry no information about the fit)."""
+        if success:
+            worst = self._worst[strategy_name]
+            worst[n] = max(worst.get(n, 0), steps)
+
+    def fit(self, strategy_name: str) -> Optional[Tuple[float, float]]:
+        """
+        Fit steps ≈ c · n^p.
+
+        p is the least-squares slope of log(steps) over log(n), clipped to
+        [min_exponent, max_exponent]; c is then chosen so the curve covers
+        every observed point.
+
+        Returns:
+            (c, p), or None with fewer than two train lengths
+        """
+        points = self._worst.get(strategy_name, {})
+        if len(points) < 2:
+            return None
+        xs = [math.log(n) for n in points]
+        ys = [math.log(steps) for steps in points.values()]
+        x_mean = sum(xs) / len(xs)
+        y_mean = sum(ys) / len(ys)
+        p = (sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+             / sum((x - x_mean) ** 2 for x in xs))
+        p = min(max(p, self.min_exponent), self.max_exponent)
+        log_c = max(y - p * x for x, y in zip(xs, ys))
+        return math.exp(log_c), p
+
+    def predict(self, strategy_name: str, n: int) -> Optional[float]:
+        """Predicted worst-case steps at length n (None without a fit)."""
+        fit = self.fit(strategy_name)
+        if fit is None:
+            return None
+        c, p = fit
+        return c * n ** p
+
+    def budget(self, strategy_name: str, n: int) -> int:
+        """Step budget for the next run of a strategy at length n."""
+        prediction = self.predict(strategy_name, n)
+        if prediction is None:
+            return self.max_steps
+        budget = math.ceil(self.headroom * prediction)
+        return int(min(max(budget, 2 * n), self.max_budget))
+
+    def __repr__(self) -> str:
+        return (f"StepBudget(max_steps={self.max_steps}, headroom={self.headroom}, "
+                f"max_budget={self.max_budget})")
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed on-disk cache for simulation results.
+
+A result row is stored under a hash of everything that determines it: the
+source of the strategy and of the module-level helpers it uses, its
+parameters, the source of the simulation engine (simulator, seeding, v2
+protocol, transition tables), and n, k, seed and max_steps. Editing a
+strategy changes its hash, so stale entries are simply never looked up
+again and only that strategy is re-simulated; editing an unrelated
+strategy in the same module does not.
+"""
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import types
+from typing import Callable, Dict, List, Optional
+
+# Bump when the simulator itself changes in a way that alters results
+CACHE_VERSION = 1
+
+# Modules whose code decides the result of every simulation
+ENGINE_MODULES = ("utils.simulator", "utils.rng",
+                  "strategies.base_strategy", "strategies.transition_table")
+
+# Module-level values hashed by repr when a strategy refers to them
+_CONSTANT_TYPES = (int, float, str, bytes, bool, tuple, list, dict, frozenset, type(None))
+
+
+@functools.lru_cache(maxsize=None)
+def engine_fingerprint() -> str:
+    """Hash of the engine sources (ENGINE_MODULES)."""
+    sources = [inspect.getsource(importlib.import_module(name)) for name in ENGINE_MODULES]
+    return hashlib.sha256("\0".join(sources).encode("utf-8")).hexdigest()
+
+
+def _code_names(code: types.CodeType) -> List[str]:
+    """Global names used by a code object and the code nested in it."""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_code_names(const))
+    return names
+
+
+def _functions_of(obj) -> List[types.FunctionType]:
+    """The function itself, or every method of a class."""
+    if isinstance(obj, types.FunctionType):
+        return [obj]
+    functions = []
+    for member in vars(obj).values():
+        member = getattr(member, "__func__", getattr(member, "fget", member))
+        if isinstance(member, types.FunctionType):
+            functions.append(member)
+    return functions
+
+
+def _source_closure(target) -> Optional[List[str]]:
+    """
+    Sources of a function or class and of the module-level functions,
+    classes and constants of its module it refers to, transitively.
+    """
+    module_name = getattr(target, "__module__", None)
+    parts, seen, pending = [], set(), [target]
+    while pending:
+        obj = pending.pop()
+        try:
+            parts.append(inspect.getsource(obj))
+        except (OSError, TypeError):
+            return None
+        for function in _functions_of(obj):
+            namespace = function.__globals__
+            for name in sorted(set(_code_names(function.__code__))):
+                if name in seen or name not in namespace:
+                    continue
+                value = namespace[name]
+                if isinstance(value, (types.FunctionType, type)) \
+                        and getattr(value, "__module__", None) == module_name:
+                    seen.add(name)
+                    pending.append(value)
+                elif isinstance(value, _CONSTANT_TYPES):
+                    seen.add(name)
+                    parts.append(f"{name} = {value!r}")
+    return parts
+
+
+@functools.lru_cache(maxsize=None)
+def strategy_fingerprint(strategy: Callable) -> Optional[str]:
+    """
+    Hash of the code and parameters behind a strategy.
+
+    Returns None for callables whose source is not available; those are
+    never cached.
+    """
+    parts = [engine_fingerprint()]
+    target = strategy
+    while isinstance(target, functools.partial):
+        parts.append(repr((target.args, sorted(target.keywords.items()))))
+        target = target.func
+
+    spec = getattr(target, "spec", None)
+    if isinstance(spec, dict):
+        # Declarative tables: the table itself (the engine is hashed above)
+        parts.append(json.dumps(spec, sort_keys=True, default=repr))
+        parts.append(type(target).__qualname__)
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    if not isinstance(target, (types.FunctionType, type)):
+        # v2 instance: its class; an adapter also hashes the wrapped function
+        wrapped = getattr(target, "func", None)
+        if callable(wrapped):
+            inner = strategy_fingerprint(wrapped)
+            if inner is None:
+                return None
+            parts.append(inner)
+        target = type(target)
+
+    sources = _source_closure(target)
+    if sources is None:
+        return None
+    parts.extend(sources)
+    parts.append(target.__qualname__)
+    parts.append(repr(getattr(target, "__defaults__", None)))
+    parts.append(repr(sorted((getattr(target, "__kwdefaults__", None) or {}).items())))
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of JSON result rows, one file per content hash.
+
+    Args:
+        cache_dir: Directory holding the cache (created on first write)
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, strategy: Callable, n: int, k: int, seed: Optional[int],
+            max_steps: int, seeding: str = "legacy") -> Optional[str]:
+        """Cache key of one simulation, or None if it cannot be cached."""
+        fingerprint = strategy_fingerprint(strategy)
+        if fingerprint is None:
+            return None
+        fields = [CACHE_VERSION, fingerprint, n, k, seed, max_steps]
+        if seeding != "legacy":
+            # Legacy keys stay as they were, so existing caches remain valid
+            fields.append(seeding)
+        payload = json.dumps(fields)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        """Stored result row for key, or None."""
+        if key is not None:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    row = json.load(f)
+                self.hits += 1
+                return row
+            except (OSError, ValueError):
+                pass
+        self.misses += 1
+        return None
+
+    def put(self, key: Optional[str], row: Dict):
+        """Store a result row; written atomically so readers never see partial files."""
+        if key is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(row, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only results log for resumable sweeps.
+
+Every finished simulation is written as one JSON line and flushed to disk
+immediately, so an interrupted sweep keeps everything it has computed.
+A torn last line from a crash mid-write is ignored when the log is read.
+"""
+import json
+import os
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Tuple
+
+
+class ResultLog:
+    """
+    JSONL file of result rows.
+
+    Args:
+        path: Log file location
+        resume: Keep existing rows (True) or start a fresh log (False)
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not resume and os.path.exists(path):
+            os.remove(path)
+        self._file = None
+
+    def load(self) -> List[Dict]:
+        """All complete rows in the log, in the order they were written."""
+        rows = []
+        if not os.path.exists(self.path):
+            return rows
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # Torn write from an interrupted run
+                    continue
+        return rows
+
+    def index(self) -> Dict[Tuple, Deque[Dict]]:
+        """Rows grouped by (n, k, strategy, max_steps, seeding), oldest first."""
+        done = defaultdict(deque)
+        for row in self.load():
+            done[(row["n"], row["k"], row["strategy"], row["max_steps"],
+                  row.get("seeding", "legacy"))].append(row)
+        return done
+
+    def append(self, row: Dict):
+        """Write one row and force it to disk."""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            # Terminate a torn line left by a crash so the next row parses
+            if self._file.tell() > 0:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._file.write("\n")
+        self._file.write(json.dumps(row) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Compact step history for the Train Carriage Problem simulator.
+
+Instead of copying the whole lamp ring on every step, the history keeps the
+initial lamp configuration plus an append-only log of (pos, toggle) events.
+Lamp snapshots are rebuilt on demand, so consumers that expect the old
+list of (pos, lamps, toggle) tuples keep working through a lazy view.
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+HistoryEntry = Tuple[int, List[int], bool]
+
+
+class StepHistory(Sequence):
+    """
+    Sequence-like view over a delta-encoded simulation history.
+
+    ``history[i]`` returns ``(pos, lamps, toggle)`` exactly as the old
+    list-based history did: ``lamps`` is the ring *before* the toggle of
+    step ``i`` is applied. Every returned lamp list is a fresh copy.
+
+    A full snapshot is stored every ``checkpoint_interval`` steps, so random
+    access replays at most that many toggles.
+    """
+
+    def __init__(self, initial_lamps, checkpoint_interval: int = 1024):
+        self.initial_lamps = bytes(initial_lamps)
+        self.checkpoint_interval = max(1, int(checkpoint_interval))
+        self.positions = array('l')
+        self.toggles = bytearray()
+        self._checkpoints = [self.initial_lamps]
+        self._current = bytearray(self.initial_lamps)
+
+    @property
+    def n(self) -> int:
+        """Number of wagons in the ring."""
+        return len(self.initial_lamps)
+
+    def append(self, pos: int, toggle: bool):
+        """Record one step. Must be called before the toggle is applied."""
+        step = len(self.positions)
+        if step and step % self.checkpoint_interval == 0:
+            self._checkpoints.append(bytes(self._current))
+        self.positions.append(pos)
+        self.toggles.append(1 if toggle else 0)
+        if toggle:
+            self._current[pos] ^= 1
+
+    def extend_run(self, start: int, direction: int, toggles):
+        """
+        Record consecutive steps at start, start + direction, ...
+
+        ``toggles`` holds one 0/1 byte per step. The run must not wrap
+        around the ring.
+        """
+        interval = self.checkpoint_interval
+        total = len(toggles)
+        done = 0
+        while done < total:
+            step = len(self.positions)
+            if step and step % interval == 0:
+                self._checkpoints.append(bytes(self._current))
+            chunk = min(total - done, interval - step % interval)
+            part = toggles[done:done + chunk]
+            first = start + direction * done
+            last = first + direction * (chunk - 1)
+            self.positions.extend(range(first, last + direction, direction))
+            self.toggles += part
+            if part.count(0) != chunk:
+                # Apply the toggles to the current ring as one XOR
+                lo, hi = min(first, last), max(first, last) + 1
+                if direction < 0:
+                    part = part[::-1]
+                flipped = (int.from_bytes(self._current[lo:hi], "little")
+                           ^ int.from_bytes(part, "little"))
+                self._current[lo:hi] = flipped.to_bytes(hi - lo, "little")
+            done += chunk
+
+    def event_arrays(self):
+        """(initial lamps, positions, toggles) as NumPy arrays, for render()."""
+        positions = np.frombuffer(self.positions, dtype=self.positions.typecode)
+        return (np.frombuffer(self.initial_lamps, dtype=np.uint8),
+                positions.astype(np.intp),
+                np.frombuffer(bytes(self.toggles), dtype=np.uint8))
+
+    def lamps_at(self, step: int) -> List[int]:
+        """Rebuild the lamp ring as seen at the start of ``step``."""
+        if step < 0:
+            step += len(self)
+        if not 0 <= step <= len(self):
+            raise IndexError("history step out of range")
+        if step == len(self):
+            # Its checkpoint may not exist yet (created by the next append)
+            return list(self._current)
+        base = step // self.checkpoint_interval
+        lamps = bytearray(self._checkpoints[base])
+        positions = self.positions
+        toggles = self.toggles
+        for i in range(base * self.checkpoint_interval, step):
+            if toggles[i]:
+                lamps[positions[i]] ^= 1
+        return list(lamps)
+
+    def final_lamps(self) -> List[int]:
+        """Lamp ring after the last recorded step."""
+        return list(self._current)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the encoded history."""
+        return (len(self.initial_lamps)
+                + self.positions.itemsize * len(self.positions)
+                + len(self.toggles)
+                + sum(len(c) for c in self._checkpoints)
+                + len(self._current))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return (self.positions[index], self.lamps_at(index),
+                bool(self.toggles[index]))
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        lamps = bytearray(self.initial_lamps)
+        for pos, toggle in zip(self.positions, self.toggles):
+            yield pos, list(lamps), bool(toggle)
+            if toggle:
+                lamps[pos] ^= 1
+
+    def __repr__(self) -> str:
+        return f"StepHistory(n={self.n}, steps={len(self)})"
+
+
+class SparseHistory:
+    """
+    Sampled step log for very long runs (no lamp snapshots at all).
+
+    Every ``sample_every``-th step is kept as (step, pos, toggle); toggles
+    are counted for all steps. Used by the packed large-n engine.
+    """
+
+    def __init__(self, sample_every: int = 1000):
+        self.sample_every = max(1, int(sample_every))
+        self.steps = array('q')
+        self.positions = array('q')
+        self.toggles = bytearray()
+        self.total_steps = 0
+        self.total_toggles = 0
+
+    def append(self, pos: int, toggle: bool):
+        step = self.total_steps
+        if step % self.sample_every == 0:
+            self.steps.append(step)
+            self.positions.append(pos)
+            self.toggles.append(1 if toggle else 0)
+        self.total_steps = step + 1
+        if toggle:
+            self.total_toggles += 1
+
+    def nbytes(self) -> int:
+        return (self.steps.itemsize * len(self.steps)
+                + self.positions.itemsize * len(self.positions)
+                + len(self.toggles))
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, bool]]:
+        for step, pos, toggle in zip(self.steps, self.positions, self.toggles):
+            yield step, pos, bool(toggle)
+
+    def __repr__(self) -> str:
+        return (f"SparseHistory(steps={self.total_steps}, samples={len(self)}, "
+                f"toggles={self.total_toggles})")
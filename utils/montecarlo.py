@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo mode: many random lamp configurations per train length.
+
+For every (n, strategy) pair, batches of uniformly random lamp rings are
+simulated. Running statistics are kept for steps and success rate, and
+sampling stops as soon as both confidence intervals are narrow enough (or
+``max_samples`` is reached). All strategies see the same rings for a given
+n, so their results are directly comparable.
+"""
+import math
+from statistics import NormalDist
+from typing import Callable, Dict, Iterable, Tuple
+
+import pandas as pd
+
+from .batch import random_lamps, simulate_batch, supports_batch
+from .simulator import simulate
+
+
+class RunningStats:
+    """
+    Online success rate and steps statistics (Welford's algorithm).
+
+    Steps are only accumulated for successful runs; timeouts count against
+    the success rate instead.
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.successes = 0
+        self.correct = 0
+        self.finished = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, success: bool, correct: bool, steps: int):
+        self.samples += 1
+        self.successes += bool(success)
+        self.correct += bool(correct)
+        if success:
+            self.finished += 1
+            delta = steps - self.mean
+            self.mean += delta / self.finished
+            self._m2 += delta * (steps - self.mean)
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.samples if self.samples else math.nan
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.finished - 1) if self.finished > 1 else math.nan
+
+    def steps_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Normal-approximation interval for the mean steps of successful runs."""
+        if self.finished < 2:
+            return math.nan, math.nan
+        half = _z(confidence) * math.sqrt(self.variance / self.finished)
+        return self.mean - half, self.mean + half
+
+    def success_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Wilson score interval for the success rate."""
+        if not self.samples:
+            return math.nan, math.nan
+        z = _z(confidence)
+        m, p = self.samples, self.success_rate
+        denominator = 1 + z * z / m
+        center = (p + z * z / (2 * m)) / denominator
+        half = z * math.sqrt(p * (1 - p) / m + z * z / (4 * m * m)) / denominator
+        return max(0.0, center - half), min(1.0, center + half)
+
+    def converged(self, rel_width: float, rate_width: float,
+                  confidence: float = 0.95) -> bool:
+        """
+        Whether both intervals are narrow enough.
+
+        Args:
+            rel_width: Maximum half-width of the steps interval, relative
+                       to the mean (ignored when fewer than 2 runs succeeded)
+            rate_width: Maximum half-width of the success rate interval
+        """
+        low, high = self.success_interval(confidence)
+        if (high - low) / 2 > rate_width:
+            return False
+        if self.finished < 2:
+            return True
+        low, high = self.steps_interval(confidence)
+        return (high - low) / 2 <= rel_width * self.mean
+
+
+def _z(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _run_samples(n: int, strategy: Callable, rings, max_steps: int):
+    """(success, correct, steps) for each lamp ring."""
+    if supports_batch(strategy):
+        return [(success, correct, steps) for success, _, correct, steps
+                in simulate_batch(strategy, rings, max_steps)]
+    results = []
+    for ring in rings:
+        _, success, _, correct, steps = simulate(n, strategy, max_steps,
+                                                 lamps=ring, record=False)
+        results.append((success, correct, steps))
+    return results
+
+
+def monte_carlo(sizes: Iterable[int], strategies: Dict[str, Callable],
+                max_steps: int = 5000, rel_width: float = 0.02,
+                rate_width: float = 0.05, confidence: float = 0.95,
+                min_samples: int = 20, max_samples: int = 2000,
+                batch_size: int = 20, seed: int = 0,
+                verbose: bool = True) -> pd.DataFrame:
+    """
+    Estimate steps and success rate on random configurations.
+
+    Args:
+        sizes: Train lengths n to test
+        strategies: Dictionary of strategy_name -> strategy_function
+        max_steps: Maximum steps per simulation
+        rel_width: Target half-width of the mean steps interval (relative)
+        rate_width: Target half-width of the success rate interval
+        confidence: Confidence level of both intervals
+        min_samples: Samples drawn before the stopping rule is checked
+        max_samples: Upper bound on samples per (n, strategy)
+        batch_size: Samples added between two checks of the stopping rule
+        seed: Base seed; batch j for length n uses the stream (seed, n, j)
+
+    Returns:
+        DataFrame with one row per (n, strategy)
+    """
+    rows = []
+    for n in sizes:
+        rings: Dict[int, object] = {}
+        for strategy_name, strategy in strategies.items():
+            stats = RunningStats()
+            batch_index = 0
+            while stats.samples < max_samples:
+                if batch_index not in rings:
+                    rings[batch_index] = random_lamps(n, batch_size, (seed, n, batch_index))
+                batch = rings[batch_index][:max_samples - stats.samples]
+                for success, correct, steps in _run_samples(n, strategy, batch, max_steps):
+                    stats.add(success, correct, steps)
+                batch_index += 1
+                if stats.samples >= min_samples and \
+                        stats.converged(rel_width, rate_width, confidence):
+                    break
+
+            steps_low, steps_high = stats.steps_interval(confidence)
+            rate_low, rate_high = stats.success_interval(confidence)
+            row = {
+                'n': n,
+                'strategy': strategy_name,
+                'samples': stats.samples,
+                'success_rate': stats.success_rate,
+                'success_ci_low': rate_low,
+                'success_ci_high': rate_high,
+                'correct_rate': stats.correct / stats.samples,
+                'mean_steps': stats.mean if stats.finished else math.nan,
+                'std_steps': math.sqrt(stats.variance) if stats.finished > 1 else math.nan,
+                'steps_ci_low': steps_low,
+                'steps_ci_high': steps_high,
+                'efficiency': stats.mean / n if stats.finished else math.nan,
+                'converged': stats.converged(rel_width, rate_width, confidence),
+                'confidence': confidence,
+            }
+            rows.append(row)
+            if verbose:
+                print(f"Monte Carlo: n={n}, strategy={strategy_name}: "
+                      f"{stats.samples} samples, success {stats.success_rate:.1%}, "
+                      f"steps {row['mean_steps']:.1f} [{steps_low:.1f}, {steps_high:.1f}]")
+    return pd.DataFrame(rows)
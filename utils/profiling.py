@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Per-phase profiling of a simulation.
+
+Pass a PhaseProfile to simulate() and every step is attributed to the phase
+label the strategy keeps in memory (``memory["phase"]`` or
+``memory["state"]``, or the ``phase``/``state`` attribute of a v2
+strategy, named through its ``phase_names``). Without a profile simulate()
+runs its usual loops untouched.
+"""
+import json
+from typing import Dict, List, Optional
+
+# Label of the first step, before the strategy has set up its memory
+INIT_PHASE = "init"
+# Label of strategies that keep no phase in memory
+NO_PHASE = "main"
+
+FIELDS = ("steps", "toggles", "reversals", "seconds")
+
+
+def phase_label(memory: Dict) -> str:
+    """Phase label a strategy keeps in its memory."""
+    if "instance" in memory:
+        instance = memory["instance"]
+        label = getattr(instance, "phase", getattr(instance, "state", None))
+        names = getattr(instance, "phase_names", ())
+        if isinstance(label, int) and 0 <= label < len(names):
+            label = names[label]
+    else:
+        label = memory.get("phase", memory.get("state"))
+    return NO_PHASE if label is None else str(label)
+
+
+class PhaseProfile:
+    """
+    Steps, toggles, direction reversals and wall time per phase.
+
+    Phases are kept in the order they were first entered.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, List[float]] = {}
+
+    def entry(self, label: str) -> List[float]:
+        """Mutable [steps, toggles, reversals, seconds] counters of a phase."""
+        if label not in self.phases:
+            self.phases[label] = [0, 0, 0, 0.0]
+        return self.phases[label]
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {label: dict(zip(FIELDS, values)) for label, values in self.phases.items()}
+
+    def to_json(self) -> str:
+        """Compact form stored in the 'phases' column of result rows."""
+        return json.dumps(self.to_dict())
+
+    @staticmethod
+    def from_json(text: Optional[str]) -> "PhaseProfile":
+        profile = PhaseProfile()
+        if isinstance(text, str) and text:
+            for label, values in json.loads(text).items():
+                profile.phases[label] = [values[field] for field in FIELDS]
+        return profile
+
+    def __repr__(self) -> str:
+        parts = ", ".join(f"{label}: {int(values[0])} steps"
+                          for label, values in self.phases.items())
+        return f"PhaseProfile({parts})"
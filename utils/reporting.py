@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Consumers for the row stream of iter_results().
+
+Each consumer looks at one row at a time and keeps O(strategies) state, so
+a sweep can be watched while it runs and its memory does not grow with the
+number of configurations:
+
+    summary, progress = OnlineSummary(), Progress(total)
+    with CsvResultWriter("results.csv") as writer:
+        for row in iter_results(configs, strategies):
+            summary.add(row)
+            progress.update(row)
+            writer.write(row)
+    print(summary.table())
+"""
+import csv
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Columns of the aggregated statistics table and how they are combined
+SUMMARY_COLUMNS = [("success", "mean"), ("correct", "mean"), ("steps", "mean"),
+                   ("efficiency", "mean"), ("timeout", "sum"), ("wasted_steps", "sum")]
+
+
+class OnlineSummary:
+    """
+    Running per-strategy statistics, the same table compare_strategies prints.
+
+    Means skip missing values (efficiency of failed runs) like pandas does.
+    """
+
+    def __init__(self):
+        # strategy -> column -> [sum, count]
+        self._totals: Dict[str, Dict[str, List[float]]] = {}
+
+    def add(self, row: Dict):
+        totals = self._totals.setdefault(
+            row["strategy"], {column: [0.0, 0] for column, _ in SUMMARY_COLUMNS})
+        for column, _ in SUMMARY_COLUMNS:
+            value = row.get(column)
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            totals[column][0] += value
+            totals[column][1] += 1
+
+    def rows(self) -> int:
+        """Rows seen so far."""
+        return sum(int(totals["steps"][1]) for totals in self._totals.values())
+
+    def table(self, decimals: int = 2) -> pd.DataFrame:
+        """Aggregated statistics indexed by strategy (sorted by name)."""
+        data = {}
+        for strategy in sorted(self._totals):
+            totals = self._totals[strategy]
+            data[strategy] = {
+                column: (total if how == "sum" else total / count if count else math.nan)
+                for column, how in SUMMARY_COLUMNS
+                for total, count in [totals[column]]
+            }
+        df = pd.DataFrame.from_dict(data, orient="index",
+                                    columns=[column for column, _ in SUMMARY_COLUMNS])
+        df.index.name = "strategy"
+        for column, how in SUMMARY_COLUMNS:
+            if how == "sum":
+                df[column] = df[column].astype("int64")
+        return df.round(decimals)
+
+
+class Progress:
+    """
+    Progress line with ETA, printed at most every ``interval`` seconds.
+
+    The total counts every (config, strategy) task; tasks of strategies
+    dropped as incorrect never report, so the ETA is an upper bound.
+    Failed or wrong rows are always reported at once.
+    """
+
+    def __init__(self, total: int, interval: float = 5.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def update(self, row: Dict):
+        self.done += 1
+        broken = not (row["success"] and row["correct"])
+        if broken:
+            self.failed += 1
+        now = time.perf_counter()
+        if broken or now - self._last >= self.interval or self.done == self.total:
+            self._last = now
+            print(self.line(row, now))
+
+    def line(self, row: Optional[Dict] = None, now: Optional[float] = None) -> str:
+        now = time.perf_counter() if now is None else now
+        elapsed = now - self.started
+        remaining = elapsed / self.done * (self.total - self.done) if self.done else math.nan
+        text = (f"[{self.done}/{self.total}] {100 * self.done / max(self.total, 1):.0f}% "
+                f"elapsed {_clock(elapsed)}, ETA {_clock(remaining)}, {self.failed} failed")
+        if row is not None and not (row["success"] and row["correct"]):
+            text += f" (latest: {row['strategy']} at n={row['n']}, k={row['k']})"
+        return text
+
+
+def _clock(seconds: float) -> str:
+    if math.isnan(seconds):
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class CsvResultWriter:
+    """
+    CSV file written row by row and flushed, readable while the sweep runs.
+
+    Columns are those of the first row. A later row with a new key adds a
+    column: the file written so far is rewritten once with the wider
+    header, and rows without a column leave it empty.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = None
+        self._fieldnames: List[str] = []
+
+    def write(self, row: Dict):
+        new_columns = [key for key in row if key not in self._fieldnames]
+        if self._writer is None:
+            self._fieldnames = list(row)
+            self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames, restval="")
+            self._writer.writeheader()
+        elif new_columns:
+            self._add_columns(new_columns)
+        self._writer.writerow({key: "" if value is None else value
+                               for key, value in row.items()})
+        self._file.flush()
+
+    def _add_columns(self, columns: List[str]):
+        """Rewrite the rows so far under a header extended by columns."""
+        self._file.close()
+        with open(self.path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self._fieldnames = self._fieldnames + columns
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self._fieldnames, restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames, restval="")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "CsvResultWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
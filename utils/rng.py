@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Random initial lamp rings, one generator per simulation.
+
+Two seeding schemes build the ring of a (n, k, seed) configuration:
+
+- "legacy": the lamps random.seed(seed) + random.choice([0, 1]) used to
+  give, so old result files stay reproducible. The Mersenne Twister
+  stream is replayed with NumPy instead of the global random module.
+- "stream": a NumPy Generator of its own per simulation, seeded with the
+  SeedSequence child (n, k) of the seed. The stream depends only on the
+  configuration, never on the worker process or the order runs happen in,
+  and children of one seed are statistically independent.
+
+Neither scheme touches global random state.
+"""
+import random
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+SEEDINGS = ("legacy", "stream")
+
+# Lamps generated per chunk (bounds temporary memory for very long trains)
+CHUNK = 1 << 16
+
+
+def _mt_key(seed: int) -> List[int]:
+    """32-bit words random.seed(seed) feeds to the Mersenne Twister."""
+    seed = abs(seed)
+    key = []
+    while True:
+        key.append(seed & 0xFFFFFFFF)
+        seed >>= 32
+        if not seed:
+            return key
+
+
+def _legacy_chunks(n: int, seed, chunk: int = CHUNK) -> Iterator[np.ndarray]:
+    """Lamps of legacy_random_bits() in pieces of about ``chunk``."""
+    if not isinstance(seed, int):
+        rng = random.Random(seed)
+        for start in range(0, n, chunk):
+            size = min(chunk, n - start)
+            yield np.fromiter((rng.choice([0, 1]) for _ in range(size)),
+                              dtype=np.uint8, count=size)
+        return
+    state = np.random.RandomState(_mt_key(seed))
+    missing = n
+    while missing > 0:
+        # About half the words are accepted; a short chunk just loops again.
+        # Never draw past the stream simulate() consumes: surplus words
+        # would be lost for the next chunk.
+        words = state.randint(0, 2**32, size=min(2 * chunk, missing), dtype=np.uint32)
+        accepted = words[(words >> 31) == 0]
+        missing -= len(accepted)
+        yield ((accepted >> 30) & 1).astype(np.uint8)
+
+
+def legacy_random_bits(n: int, seed) -> np.ndarray:
+    """
+    Lamps of ``random.seed(seed); [random.choice([0, 1]) for _ in range(n)]``.
+
+    random.choice of two items draws getrandbits(2) from one 32-bit word
+    and rejects values >= 2, so the lamp is bit 30 of every word whose top
+    bit is 0. NumPy's legacy RandomState seeds the same generator.
+
+    Returns:
+        uint8 array of n lamp states
+    """
+    chunks = list(_legacy_chunks(n, seed))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+
+
+def stream_generator(n: int, k: Optional[int] = None,
+                     seed: Optional[int] = None) -> np.random.Generator:
+    """
+    Generator of one simulation under the "stream" scheme.
+
+    Its SeedSequence is the child (n, k) of ``seed`` (what spawn() yields
+    for that spawn key), so every configuration draws from an independent
+    stream. Without k and seed the ring is fresh entropy.
+    """
+    if seed is None and (k is None or k < 2):
+        return np.random.default_rng()
+    entropy = abs(seed) if seed is not None else 42
+    spawn_key = (n,) if k is None else (n, k)
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=spawn_key))
+
+
+def lamp_chunks(n: int, k: Optional[int] = None, seed: Optional[int] = None,
+                seeding: str = "legacy", chunk: int = CHUNK) -> Iterator[np.ndarray]:
+    """
+    Initial lamps of a configuration as uint8 arrays of about ``chunk``.
+
+    k selects the mode as in simulate(): 0 all OFF, 1 all ON, 2+ random
+    with seed (default 42 + k under "legacy"), None random.
+    """
+    if seeding not in SEEDINGS:
+        raise ValueError(f"Unknown seeding {seeding!r}, expected one of {SEEDINGS}.")
+    if k == 0 or k == 1:
+        for start in range(0, n, chunk):
+            yield np.full(min(chunk, n - start), k, dtype=np.uint8)
+        return
+    if seeding == "stream":
+        rng = stream_generator(n, k, seed)
+        for start in range(0, n, chunk):
+            yield rng.integers(0, 2, size=min(chunk, n - start), dtype=np.uint8)
+        return
+    if k is not None and k > 1 and seed is None:
+        seed = 42 + k
+    elif seed is None:
+        seed = int(np.random.SeedSequence().generate_state(2, np.uint64)[0])
+    yield from _legacy_chunks(n, seed, chunk)
+
+
+def random_bits(n: int, k: Optional[int] = None, seed: Optional[int] = None,
+                seeding: str = "legacy") -> np.ndarray:
+    """Initial lamps of a configuration as one uint8 array of length n."""
+    chunks = list(lamp_chunks(n, k, seed, seeding))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
@@ -8,21 +8,58 @@ Created on Sun Dec  7 18:14:05 2025
 """
 Simulation engine for the Train Carriage Problem
 """
-import random
 import pandas as pd
-from typing import List, Tuple, Dict, Callable, Optional
+from typing import List, Tuple, Dict, Callable, Iterator, Optional, Sequence
 import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from .visualizer import render
+from .history import StepHistory
+from .cache import ResultCache
+from .checkpoint import ResultLog
+from .budget import StepBudget
+from .profiling import PhaseProfile, phase_label, INIT_PHASE
+from .rng import random_bits
+from .reporting import CsvResultWriter, OnlineSummary, Progress
+from .trace import TraceWriter
+from strategies.transition_table import TransitionTable
+from strategies.base_strategy import Strategy, Walk
+
+
+def initial_lamps(n: int, k: Optional[int] = None,
+                  seed: Optional[int] = None, seeding: str = "legacy") -> List[int]:
+    """
+    Build the initial lamp ring exactly as simulate() does.
+    
+    Args:
+        n: Number of wagons
+        k: Initial lamp configuration mode (see simulate)
+        seed: Random seed for reproducibility
+        seeding: "legacy" (random.seed/random.choice lamps of older
+                 versions) or "stream" (own SeedSequence child per
+                 configuration), see utils.rng
+    
+    Returns:
+        List of n lamp states (0/1)
+    """
+    return random_bits(n, k, seed, seeding).tolist()
 
 
 def simulate(n: int, strategy: Callable, max_steps: int = 5000, 
-             seed: Optional[int] = None, k: Optional[int] = None) -> Tuple:
+             seed: Optional[int] = None, k: Optional[int] = None,
+             validate: bool = True, record: bool = True,
+             lamps: Optional[Sequence[int]] = None,
+             profile: Optional[PhaseProfile] = None,
+             seeding: str = "legacy", trace: Optional[str] = None) -> Tuple:
     """
     Simulates the agent walking through a ring of n wagons.
     
     Args:
         n: Number of wagons
-        strategy: Function(lamp_state, memory) → toggle, move, memory, done, estimate
+        strategy: Function(lamp_state, memory) → toggle, move, memory, done, estimate,
+                  a Strategy (protocol v2: reset() + step(lamp_state), may
+                  return Walk macro actions executed in bulk),
+                  or a TransitionTable (run without per-step calls)
         max_steps: Maximum steps before timeout
         seed: Random seed for reproducibility
         k: Initial lamp configuration mode:
@@ -30,36 +67,65 @@ def simulate(n: int, strategy: Callable, max_steps: int = 5000,
            0: All lamps OFF
            1: All lamps ON
            2+: Use as random seed offset
+        validate: Check that every move is -1, 0 or +1. Only v2 strategies
+                  may skip the check; a wrong move then wraps modulo n.
+        record: Keep the step history. Without it, history is None, which
+                makes very long runs (e.g. quadratic walks at large n) fit
+                in memory.
+        lamps: Explicit initial lamp ring of length n (overrides k and seed)
+        profile: PhaseProfile that receives steps, toggles, reversals and
+                 wall time per phase. Profiled runs call the strategy once
+                 per step (tables and walks are not run in bulk) but give
+                 the same results.
+        seeding: How random rings are drawn from seed: "legacy" gives the
+                 lamps of older versions, "stream" an independent NumPy
+                 stream per (n, k). Global random state is never touched.
+        trace: Path of a binary trace file (see utils.trace) the run is
+               streamed to, one (pos, toggle, move, phase) record per step.
+               Like profiling, this calls the strategy once per step.
     
     Returns:
         Tuple: (history, success, estimate, result_is_correct, steps_used)
+        history is a StepHistory: a lazy sequence of (pos, lamps, toggle)
+        rebuilt from the initial lamps and a (pos, toggle) event log.
     """
-    # Set random seed if provided
-    if seed is not None:
-        random.seed(seed)
-    
-    # Initialize lamps based on k
-    if k == 0:
-        lamps = [0] * n  # All OFF
-    elif k == 1:
-        lamps = [1] * n  # All ON
-    elif k is not None and k > 1:
-        # Use k as seed offset
-        random.seed(seed if seed is not None else 42 + k)
-        lamps = [random.choice([0, 1]) for _ in range(n)]
+    if lamps is None:
+        lamps = initial_lamps(n, k, seed, seeding)
     else:
-        # Completely random
-        lamps = [random.choice([0, 1]) for _ in range(n)]
+        lamps = [int(lamp) for lamp in lamps]
+        if len(lamps) != n:
+            raise ValueError(f"Expected {n} initial lamps, got {len(lamps)}.")
+    
+    history = StepHistory(lamps) if record else None
+    
+    if trace is not None:
+        name = getattr(strategy, "title", getattr(strategy, "__name__", ""))
+        with TraceWriter(trace, lamps, str(name)) as writer:
+            result = _simulate_stepwise(n, strategy, lamps, history, max_steps,
+                                        profile, writer)
+            writer.close(*result[1:4])
+        return result
+    
+    if profile is not None:
+        return _simulate_stepwise(n, strategy, lamps, history, max_steps, profile)
+    
+    # Transition tables run on their compiled fast path
+    if isinstance(strategy, TransitionTable):
+        success, estimate, steps = strategy.run(lamps, max_steps, history)
+        return history, success, estimate, success and estimate == n, steps
+    
+    if isinstance(strategy, Strategy):
+        return _simulate_v2(n, strategy, lamps, history, max_steps, validate)
     
     pos = 0
     memory = {}
-    history = []
+    append = history.append if record else _skip_record
     
     for step in range(max_steps):
         lamp_state = lamps[pos]
         toggle, move, memory, done, estimate = strategy(lamp_state, memory)
         
-        history.append((pos, lamps.copy(), toggle))
+        append(pos, toggle)
         if toggle:
             lamps[pos] ^= 1
         
@@ -73,14 +139,294 @@ def simulate(n: int, strategy: Callable, max_steps: int = 5000,
     return history, False, None, False, max_steps
 
 
-def compare_strategies(configs: List[Tuple[int, int]], 
-                      strategies: Dict[str, Callable],
-                      max_steps: int = 5000,
-                      save_images: bool = True,
-                      output_dir: str = "simulation_results",
-                      abort_incorrect_strategies = True):
+def _skip_record(pos: int, toggle: bool):
+    pass
+
+
+def _simulate_stepwise(n: int, strategy: Callable, lamps: List[int],
+                       history: Optional[StepHistory], max_steps: int,
+                       profile: Optional[PhaseProfile] = None,
+                       trace: Optional[TraceWriter] = None) -> Tuple:
     """
-    Compare multiple strategies on different configurations.
+    simulate() loop that calls the strategy once per step and follows its phase.
+    
+    Every step is attributed to the phase label it was taken in: counted in
+    profile and/or written to trace together with its move.
+    """
+    append = history.append if history is not None else _skip_record
+    profile = profile if profile is not None else PhaseProfile()
+    clock = time.perf_counter
+    pos = 0
+    memory = {}
+    last_move = 0
+    label = INIT_PHASE
+    entry = profile.entry(label)
+    since = clock()
+    result = (history, False, None, False, max_steps)
+    
+    for step in range(max_steps):
+        lamp_state = lamps[pos]
+        toggle, move, memory, done, estimate = strategy(lamp_state, memory)
+        
+        append(pos, toggle)
+        entry[0] += 1
+        if toggle:
+            lamps[pos] ^= 1
+            entry[1] += 1
+        
+        if done:
+            if trace is not None:
+                trace.append(pos, toggle, 0, label)
+            result = (history, True, estimate, estimate == n, step + 1)
+            break
+        
+        if move not in [-1, 0, +1]:
+            raise ValueError("Strategy move must be -1, 0, or +1.")
+        if trace is not None:
+            trace.append(pos, toggle, move, label)
+        if move:
+            if last_move and move != last_move:
+                entry[2] += 1
+            last_move = move
+        pos = (pos + move) % n
+        
+        new_label = phase_label(memory)
+        if new_label != label:
+            now = clock()
+            entry[3] += now - since
+            since = now
+            label = new_label
+            entry = profile.entry(label)
+    
+    entry[3] += clock() - since
+    return result
+
+
+def iter_steps(n: int, strategy: Callable, lamps: List[int],
+               max_steps: int = 5000) -> Iterator[Tuple]:
+    """
+    Run a strategy one step at a time (lamps is modified in place).
+    
+    Yields:
+        (pos, lamp_state, toggle, move, phase, done, estimate) per step,
+        phase being the label the step was taken in. Nothing is kept, so
+        two runs can be compared in lockstep at constant memory.
+    """
+    pos = 0
+    memory = {}
+    label = INIT_PHASE
+    for _ in range(max_steps):
+        lamp_state = lamps[pos]
+        toggle, move, memory, done, estimate = strategy(lamp_state, memory)
+        if toggle:
+            lamps[pos] ^= 1
+        if done:
+            yield pos, lamp_state, bool(toggle), 0, label, True, estimate
+            return
+        if move not in [-1, 0, +1]:
+            raise ValueError("Strategy move must be -1, 0, or +1.")
+        yield pos, lamp_state, bool(toggle), move, label, False, None
+        pos = (pos + move) % n
+        label = phase_label(memory)
+
+
+def _simulate_v2(n: int, strategy: Strategy, lamps: List[int],
+                 history: Optional[StepHistory], max_steps: int,
+                 validate: bool) -> Tuple:
+    """Lean simulate() loop for protocol v2 strategies."""
+    strategy.reset()
+    step_fn = strategy.step
+    record = history.append if history is not None else _skip_record
+    lamps = bytearray(lamps)
+    pos = 0
+    step = 0
+    
+    while step < max_steps:
+        lamp_state = lamps[pos]
+        toggle, move, done = step_fn(lamp_state)
+        
+        record(pos, toggle)
+        if toggle:
+            lamps[pos] = lamp_state ^ 1
+        step += 1
+        
+        if done and not isinstance(done, Walk):
+            estimate = strategy.estimate
+            return history, True, estimate, estimate == n, step
+        
+        if validate and move not in (-1, 0, 1):
+            raise ValueError("Strategy move must be -1, 0, or +1.")
+        
+        if done:
+            pos, taken = _walk(lamps, (pos + move) % n, done, max_steps - step, history)
+            step += taken
+            continue
+        
+        pos = (pos + move) % n
+    
+    return history, False, None, False, max_steps
+
+
+# Byte translation swapping lamp values 0 <-> 1
+_FLIP = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def _walk(lamps: bytearray, pos: int, walk: Walk, budget: int,
+          history: Optional[StepHistory]) -> Tuple[int, int]:
+    """
+    Execute a Walk from pos with byte search and slice assignment.
+    
+    The ring is processed in stretches that do not wrap around, so every
+    stretch is one find() and at most one slice write. Visited lamps are
+    re-read on every lap.
+    
+    Returns:
+        Tuple: (position where the walk ended, steps taken)
+    """
+    n = len(lamps)
+    direction = walk.direction
+    target = None if walk.until is None else bytes((walk.until,))
+    set_to = walk.set_to
+    remaining = budget if walk.limit is None else min(walk.limit, budget)
+    taken = 0
+    found = False
+    
+    while taken < remaining:
+        if direction > 0:
+            lo, hi = pos, min(n, pos + remaining - taken)
+            if target is not None:
+                j = lamps.find(target, lo, hi)
+                if j >= 0:
+                    hi, found = j, True
+            segment = lamps[lo:hi]
+            start, pos = lo, hi % n
+        else:
+            lo, hi = max(0, pos + 1 - (remaining - taken)), pos + 1
+            if target is not None:
+                j = lamps.rfind(target, lo, hi)
+                if j >= 0:
+                    lo, found = j + 1, True
+            segment = lamps[lo:hi][::-1]
+            start, pos = hi - 1, (lo - 1) % n
+        
+        count = len(segment)
+        if count:
+            if set_to is None:
+                toggles = bytes(count)
+            elif set_to == 0:
+                toggles = segment
+            else:
+                toggles = segment.translate(_FLIP)
+            if history is not None:
+                history.extend_run(start, direction, toggles)
+            if set_to is not None:
+                lamps[lo:hi] = bytes((set_to,)) * count
+            taken += count
+        if found:
+            break
+    
+    walk.distance = taken
+    walk.found = found
+    return pos, taken
+
+
+def _simulate_config(n: int, k: int, strategy_name: str, strategy: Callable,
+                     max_steps: int, save_images: bool, output_dir: str,
+                     profile_phases: bool = False, seeding: str = "legacy") -> Dict:
+    """
+    Run one (n, k, strategy) simulation and return its result row.
+    
+    Module-level so it can be shipped to worker processes; the image is
+    rendered where the simulation ran so the history never has to be pickled.
+    """
+    seed = _config_seed(n, k)
+    profile = PhaseProfile() if profile_phases else None
+    
+    history, success, estimate, correct, steps = simulate(
+        n, strategy, max_steps, seed, k, profile=profile, seeding=seeding
+    )
+    
+    # Save image if requested
+    if save_images and len(history) > 0:
+        render(history, _image_path(output_dir, n, k, strategy_name))
+    
+    row = {
+        "n": n,
+        "k": k,
+        "strategy": strategy_name,
+        "success": success,
+        "correct": correct,
+        "estimate": estimate,
+        "steps": steps,
+        "max_steps": max_steps,
+        "efficiency": steps / n if n > 0 and success else None,
+        "seed": seed
+    }
+    if seeding != "legacy":
+        row["seeding"] = seeding
+    if profile is not None:
+        row["phases"] = profile.to_json()
+    return _annotate_row(row)
+
+
+def _annotate_row(row: Dict) -> Dict:
+    """Add timeout and wasted_steps (also to rows from older logs/caches)."""
+    row["timeout"] = not row["success"] and row["steps"] >= row["max_steps"]
+    row["wasted_steps"] = 0 if row["success"] and row["correct"] else row["steps"]
+    return row
+
+
+def _config_seed(n: int, k: int) -> int:
+    # Create deterministic seed
+    return n * 1000 + k if k not in [0, 1] else n * 1000
+
+
+def _image_path(output_dir: str, n: int, k: int, strategy_name: str) -> str:
+    return f"{output_dir}/n{n}_k{k}_{strategy_name}.png"
+
+
+def _discard_future(future: Future, image_path: Optional[str] = None):
+    """Cancel a queued simulation, or drop the image of one already started."""
+    if future.cancel() or image_path is None:
+        return
+    
+    def remove_image(done: Future):
+        if not done.cancelled() and done.exception() is None \
+                and os.path.exists(image_path):
+            os.remove(image_path)
+    
+    future.add_done_callback(remove_image)
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """None/1 → serial, 0 or negative → one worker per CPU."""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def iter_results(configs: List[Tuple[int, int]],
+                 strategies: Dict[str, Callable],
+                 max_steps: int = 5000,
+                 save_images: bool = True,
+                 output_dir: str = "simulation_results",
+                 abort_incorrect_strategies = True,
+                 workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None,
+                 resume: bool = False,
+                 log_path: Optional[str] = None,
+                 budget: Optional[StepBudget] = None,
+                 profile_phases: bool = False,
+                 seeding: str = "legacy") -> Iterator[Dict]:
+    """
+    Run a strategy sweep and yield each result row as soon as it is known.
+    
+    Rows come in config order (with workers, a row is yielded once it and
+    all rows before it have finished). Nothing is accumulated, so memory
+    does not grow with the sweep; see utils.reporting for consumers.
+    Closing the generator early shuts the worker pool down.
     
     Args:
         configs: List of (n, k) tuples where n=wagon count, k=initial config
@@ -88,54 +434,198 @@ def compare_strategies(configs: List[Tuple[int, int]],
         max_steps: Maximum steps per simulation
         save_images: Whether to save visualization images
         output_dir: Directory to save results
+        abort_incorrect_strategies: Skip a strategy for all later configs
+            once it failed or returned a wrong n
+        workers: Number of worker processes. None or 1 runs serially,
+            0 or a negative value uses one process per CPU. Results are
+            yielded in config order, so the stream is identical to the
+            serial run.
+        cache_dir: Directory of the content-addressed result cache
+            (see utils.cache). Cached rows are reused instead of
+            re-simulating; None disables the cache.
+        resume: Continue an interrupted sweep from its results log.
+            Logged simulations are not re-run and incorrect_strategies is
+            rebuilt from them. Without resume the log is started afresh.
+        log_path: Append-only JSONL log that receives every finished row
+            immediately (default: output_dir/simulation_results.jsonl)
+        budget: Adaptive step budget (see utils.budget). Each run gets a
+            budget predicted from the strategy's finished runs at earlier
+            configs instead of max_steps. Runs are then dispatched one
+            config at a time.
+        seeding: Lamp seeding scheme passed to simulate(). "stream" rows
+            carry a 'seeding' column and never reuse logged or cached
+            legacy rows.
     
-    Returns:
-        DataFrame with comparison results
+    Yields:
+        Result rows (dicts) including the run's budget (max_steps),
+        whether it timed out and its wasted steps (steps of runs that did
+        not return the correct n).
     """
     # Create output directory
-    if save_images and not os.path.exists(output_dir):
+    if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    results = []
+    tasks = [(n, k, strategy_name, strategy)
+             for n, k in configs
+             for strategy_name, strategy in strategies.items()]
+    
+    count = 0
     incorrect_strategies = []
     
+    # Step budget per task: fixed, or set per config wave from finished rows
+    budgets = [max_steps if budget is None else None] * len(tasks)
+    wave = max(1, len(strategies))
+    
+    # Rows already known before simulating: (source, row) per task
+    known = [None] * len(tasks)
+    log = ResultLog(log_path or f"{output_dir}/simulation_results.jsonl", resume=resume)
+    logged = log.index() if resume else {}
+    
+    # Look up finished simulations; a changed strategy hashes to a new key
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    keys = [None] * len(tasks)
+    reused = 0
+    
+    def lookup(index):
+        n, k, strategy_name, strategy = tasks[index]
+        done = logged.get((n, k, strategy_name, budgets[index], seeding))
+        if done:
+            known[index] = ("Resumed", done.popleft())
+        if cache is None:
+            return
+        keys[index] = cache.key(strategy, n, k, _config_seed(n, k), budgets[index], seeding)
+        if known[index] is not None:
+            return
+        row = cache.get(keys[index])
+        if row is not None and save_images and \
+                not os.path.exists(_image_path(output_dir, n, k, strategy_name)):
+            row = None  # image requested but missing → simulate again
+        if row is not None and profile_phases and not row.get("phases"):
+            row = None  # cached without a phase profile
+        if row is not None:
+            known[index] = ("Cached", row)
+    
+    workers = _resolve_workers(workers)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    futures = [None] * len(tasks)
+    
+    def submit(index):
+        n, k, strategy_name, strategy = tasks[index]
+        if executor is not None and known[index] is None:
+            futures[index] = executor.submit(_simulate_config, n, k, strategy_name, strategy,
+                                             budgets[index], save_images, output_dir,
+                                             profile_phases, seeding)
     
+    if budget is None:
+        for index in range(len(tasks)):
+            lookup(index)
+        for index in range(len(tasks)):
+            submit(index)
     
-    for n, k in configs:
-        for strategy_name, strategy in strategies.items():
-            # Create deterministic seed
-            seed = n * 1000 + k if k not in [0, 1] else n * 1000
+    try:
+        for index, (n, k, strategy_name, strategy) in enumerate(tasks):
+            if budget is not None and index % wave == 0:
+                # All earlier configs are finished: budget this config's runs
+                for later in range(index, min(index + wave, len(tasks))):
+                    name = tasks[later][2]
+                    if name in incorrect_strategies and abort_incorrect_strategies:
+                        continue
+                    budgets[later] = budget.budget(name, tasks[later][0])
+                    lookup(later)
+                    submit(later)
             if not strategy_name in incorrect_strategies or abort_incorrect_strategies == False:
-                print(f"Simulating: n={n}, k={k}, strategy={strategy_name}")
-                
-                history, success, estimate, correct, steps = simulate(
-                    n, strategy, max_steps, seed, k
-                )
-                
-                # Save image if requested
-                if save_images and len(history) > 0:
-                    filename = f"{output_dir}/n{n}_k{k}_{strategy_name}.png"
-                    render(history, filename)
+                if known[index] is not None:
+                    source, row = known[index]
+                    print(f"{source}: n={n}, k={k}, strategy={strategy_name}")
+                    row = _annotate_row(dict(row, strategy=strategy_name))
+                    if source == "Cached":
+                        reused += 1
+                        log.append(row)
+                else:
+                    print(f"Simulating: n={n}, k={k}, strategy={strategy_name}"
+                          + (f", budget={budgets[index]}" if budget is not None else ""))
+                    if futures[index] is None:
+                        row = _simulate_config(n, k, strategy_name, strategy,
+                                               budgets[index], save_images, output_dir,
+                                               profile_phases, seeding)
+                    else:
+                        row = futures[index].result()
+                    log.append(row)
+                    if cache is not None:
+                        cache.put(keys[index], row)
                 
                 # Store results
-                results.append({
-                    "n": n,
-                    "k": k,
-                    "strategy": strategy_name,
-                    "success": success,
-                    "correct": correct,
-                    "estimate": estimate,
-                    "steps": steps,
-                    "max_steps": max_steps,
-                    "efficiency": steps / n if n > 0 and success else None,
-                    "seed": seed
-                })
-                if not correct or not success:
+                count += 1
+                yield row
+                if budget is not None:
+                    budget.record(strategy_name, n, row["success"], row["steps"])
+                if not row["correct"] or not row["success"]:
                     if not strategy_name in incorrect_strategies:
                         incorrect_strategies.append(strategy_name)
                         print(f"adding strategy={strategy_name} to incorrect_strategies")
-                    
-                
+                        if executor is not None and abort_incorrect_strategies:
+                            # Free the pool from work that will be discarded
+                            for later, task in enumerate(tasks[index + 1:], index + 1):
+                                if task[2] == strategy_name and futures[later] is not None:
+                                    futures[later].cancel()
+            elif futures[index] is not None:
+                # The serial run would never have simulated this config
+                _discard_future(futures[index],
+                                _image_path(output_dir, n, k, strategy_name)
+                                if save_images else None)
+            # Rows are streamed, not kept: drop the finished future and lookup
+            futures[index] = known[index] = None
+        if cache is not None:
+            print(f"Result cache: {reused} of {count} rows reused from {cache_dir} "
+                  f"({cache.hits} hits, {cache.misses} misses)")
+    finally:
+        log.close()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+
+
+def compare_strategies(configs: List[Tuple[int, int]], 
+                      strategies: Dict[str, Callable],
+                      max_steps: int = 5000,
+                      save_images: bool = True,
+                      output_dir: str = "simulation_results",
+                      abort_incorrect_strategies = True,
+                      workers: Optional[int] = None,
+                      cache_dir: Optional[str] = None,
+                      resume: bool = False,
+                      log_path: Optional[str] = None,
+                      budget: Optional[StepBudget] = None,
+                      profile_phases: bool = False,
+                      seeding: str = "legacy"):
+    """
+    Compare multiple strategies on different configurations.
+    
+    Consumes iter_results() (all arguments are passed on): a progress line
+    with ETA is printed while the sweep runs, failing strategies are
+    reported at once and output_dir/simulation_results.csv is written row
+    by row. Use iter_results() directly to process sweeps too large to
+    keep in memory.
+    
+    Returns:
+        DataFrame with comparison results. Rows include the run's budget
+        (max_steps), whether it timed out and its wasted steps (steps of
+        runs that did not return the correct n).
+    """
+    csv_path = f"{output_dir}/simulation_results.csv"
+    tasks = len(configs) * len(strategies)
+    summary = OnlineSummary()
+    progress = Progress(tasks)
+    results = []
+    with CsvResultWriter(csv_path) as writer:
+        rows = iter_results(configs, strategies, max_steps, save_images, output_dir,
+                            abort_incorrect_strategies, workers, cache_dir, resume,
+                            log_path, budget, profile_phases, seeding)
+        for row in rows:
+            results.append(row)
+            summary.add(row)
+            writer.write(row)
+            progress.update(row)
     
     # Create DataFrame
     df = pd.DataFrame(results)
@@ -150,19 +640,7 @@ def compare_strategies(configs: List[Tuple[int, int]],
     print("\n" + "="*80)
     print("AGGREGATED STATISTICS")
     print("="*80)
-    
-    stats = df.groupby('strategy').agg({
-        'success': 'mean',
-        'correct': 'mean',
-        'steps': 'mean',
-        'efficiency': 'mean'
-    }).round(2)
-    
-    print(stats.to_string())
-    
-    # Save results to CSV
-    csv_path = f"{output_dir}/simulation_results.csv"
-    df.to_csv(csv_path, index=False)
+    print(summary.table().to_string())
     print(f"\nDetailed results saved to: {csv_path}")
     
-    return df
\ No newline at end of file
+    return df
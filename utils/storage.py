@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar storage of result tables, partitioned by run.
+
+Every sweep is written to its own partition directory,
+
+    simulation_results/runs/run=<run>/results.parquet
+
+with compact dtypes: strategy names are categorical, integer columns use the
+smallest integer type that holds them (nullable where values are missing).
+load_results() reads any subset of runs and columns back into one frame
+with a categorical 'run' column.
+
+Parquet needs pyarrow (see requirements.txt) or fastparquet, Feather needs
+pyarrow. Without either, partitions are written as pickled frames, which
+keep the same dtypes but are not columnar; save_results() warns when it
+has to fall back.
+"""
+import importlib.util
+import os
+import time
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Extension per format, in order of preference
+FORMATS = {"parquet": ".parquet", "feather": ".feather", "pickle": ".pkl"}
+
+# Columns stored as categories
+CATEGORICAL_COLUMNS = ("strategy", "seeding", "model", "phase")
+
+# Columns holding whole numbers (floats only because of missing values)
+INTEGER_COLUMNS = ("n", "k", "estimate", "steps", "max_steps", "seed",
+                   "wasted_steps", "samples")
+
+_NULLABLE = {np.dtype("int8"): "Int8", np.dtype("int16"): "Int16",
+             np.dtype("int32"): "Int32", np.dtype("int64"): "Int64"}
+
+
+def available_formats() -> List[str]:
+    """Formats the installed engines can write, best first."""
+    has_arrow = importlib.util.find_spec("pyarrow") is not None
+    has_fastparquet = importlib.util.find_spec("fastparquet") is not None
+    formats = []
+    if has_arrow or has_fastparquet:
+        formats.append("parquet")
+    if has_arrow:
+        formats.append("feather")
+    return formats + ["pickle"]
+
+
+def _smallest_int(values: np.ndarray) -> np.dtype:
+    """Smallest signed type holding values (unsigned ones underflow on n - steps)."""
+    low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for name in ("int8", "int16", "int32"):
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return np.dtype(name)
+    return np.dtype("int64")
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of a result frame with compact dtypes.
+
+    Strategy (and similar label) columns become categorical; whole-number
+    columns get the smallest fitting signed integer type, a nullable one where
+    values are missing. Other columns are kept as they are.
+    """
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if column in CATEGORICAL_COLUMNS and not isinstance(series.dtype, pd.CategoricalDtype):
+            df[column] = series.astype("category")
+        elif column in INTEGER_COLUMNS and series.dtype.kind in "iuf":
+            present = series.dropna().to_numpy()
+            if len(present) and not np.all(np.mod(present, 1) == 0):
+                continue
+            dtype = _smallest_int(present)
+            if series.isna().any():
+                df[column] = series.astype(_NULLABLE[dtype])
+            else:
+                df[column] = series.astype(dtype)
+    return df
+
+
+def new_run_id() -> str:
+    """Default partition name: the local start time of the sweep."""
+    return time.strftime("%Y%m%d-%H%M%S")
+
+
+def save_results(df: pd.DataFrame, root: str = "simulation_results/runs",
+                 run: Optional[str] = None, name: str = "results",
+                 file_format: Optional[str] = None) -> str:
+    """
+    Write a result frame as one run partition.
+
+    Args:
+        df: Result rows (compare_strategies or monte_carlo output)
+        root: Directory holding the run partitions
+        run: Partition name (default: new_run_id()); an existing
+             partition file of the same name is replaced
+        name: File name inside the partition ("results", "monte_carlo", ...)
+        file_format: "parquet", "feather" or "pickle" (default: best available)
+
+    Returns:
+        Path of the written file
+    """
+    formats = available_formats()
+    if file_format is None:
+        file_format = formats[0]
+        if file_format == "pickle":
+            print("WARNING: no Parquet engine installed (pip install pyarrow); "
+                  "storing results as a pickled DataFrame instead of Parquet.")
+    elif file_format not in formats:
+        raise ValueError(f"Format {file_format!r} is not available here "
+                         f"(install pyarrow); available: {formats}")
+    run = run or new_run_id()
+    directory = os.path.join(root, f"run={run}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name + FORMATS[file_format])
+
+    df = optimize_dtypes(df).reset_index(drop=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if file_format == "parquet":
+        df.to_parquet(tmp_path, index=False)
+    elif file_format == "feather":
+        df.to_feather(tmp_path)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    print(f"Results stored as {file_format} in: {path}")
+    return path
+
+
+def list_runs(root: str = "simulation_results/runs") -> List[str]:
+    """Names of the stored runs, oldest first (run ids sort by time)."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(entry[len("run="):] for entry in os.listdir(root)
+                  if entry.startswith("run=") and os.path.isdir(os.path.join(root, entry)))
+
+
+def _read(path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    if path.endswith(".feather"):
+        return pd.read_feather(path, columns=columns)
+    df = pd.read_pickle(path)
+    return df[columns] if columns is not None else df
+
+
+def load_results(root: str = "simulation_results/runs",
+                 runs: Optional[Iterable[str]] = None, name: str = "results",
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read stored runs into one frame.
+
+    Args:
+        root: Directory holding the run partitions
+        runs: Run names to read (default: all)
+        name: File name inside the partitions
+        columns: Columns to read (default: all); only these are loaded from
+                 Parquet and Feather files. 'run' is always included.
+
+    Returns:
+        DataFrame with a categorical 'run' column; categorical columns of
+        different runs are merged into one category set
+    """
+    runs = list_runs(root) if runs is None else list(runs)
+    # 'run' comes from the partition name, not from the stored file
+    stored_columns = None if columns is None else [c for c in columns if c != "run"]
+    frames = []
+    for run in runs:
+        directory = os.path.join(root, f"run={run}")
+        for extension in FORMATS.values():
+            path = os.path.join(directory, name + extension)
+            if os.path.exists(path):
+                frame = _read(path, stored_columns)
+                frame.insert(0, "run", run)
+                frames.append(frame)
+                break
+    if not frames:
+        return pd.DataFrame(columns=["run"] + list(stored_columns or []))
+    df = pd.concat(frames, ignore_index=True)
+    # concat falls back to plain strings when category sets differ between runs
+    for column in ("run",) + CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
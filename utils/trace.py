@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Binary trace files of single simulations.
+
+A trace keeps everything needed to replay a run without simulating it again:
+
+    header        64 bytes, see HEADER (magic, version, n, steps, result)
+    strategy      UTF-8 name, header.name_length bytes
+    initial ring  ceil(n / 8) bytes, lamp i is bit i % 8 of byte i // 8
+    records       one fixed-width record per step: pos (uint32),
+                  toggle (uint8), move (int8), phase (uint8, index into
+                  the phase labels)
+    phase labels  JSON list of label strings, at header.labels_offset
+
+simulate(..., trace=path) streams the records to disk while it runs (in
+blocks of TraceWriter.buffer_steps), so memory does not grow with the run.
+Trace(path) memory-maps the records: any step is random access, and
+positions/toggles/moves are NumPy views on the file. A Trace can be passed
+to render() like a history.
+
+    python -m utils.trace record 200 2 "Powers-Of-Two" run.trace
+    python -m utils.trace info run.trace
+    python -m utils.trace render run.trace run.png
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"TCTRACE\0"
+VERSION = 2
+
+# magic, version, flags, n, steps, estimate, success, correct, name length,
+# labels offset; padded to 64 bytes
+HEADER = struct.Struct("<8sHHQQqBBHQ16x")
+
+# Header flags: the estimate field holds a result (any int, even negative)
+FLAG_ESTIMATE = 1
+
+RECORD = np.dtype([("pos", "<u4"), ("toggle", "u1"), ("move", "i1"), ("phase", "u1")])
+
+# Phase labels a trace can hold (the phase field is one byte)
+MAX_PHASES = 256
+
+
+class TraceWriter:
+    """
+    Streams the steps of one simulation to a trace file.
+
+    Args:
+        path: File to write (replaced)
+        initial_lamps: Ring before the first step
+        strategy_name: Stored in the header for reference
+        buffer_steps: Records collected before they are written out
+    """
+
+    def __init__(self, path: str, initial_lamps: Sequence[int],
+                 strategy_name: str = "", buffer_steps: int = 65536):
+        self.path = path
+        self.n = len(initial_lamps)
+        if self.n >= 2**32:
+            raise ValueError("Traces hold rings of fewer than 2**32 wagons.")
+        self.name = strategy_name.encode("utf-8")
+        self.steps = 0
+        self._labels: List[str] = []
+        self._label_index = {}
+        self._buffer = np.zeros(max(1, buffer_steps), dtype=RECORD)
+        self._fill = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.n, 0, 0, 0, 0, len(self.name), 0))
+        self._file.write(self.name)
+        lamps = np.asarray(initial_lamps, dtype=np.uint8)
+        self._file.write(np.packbits(lamps, bitorder="little").tobytes())
+
+    def append(self, pos: int, toggle: bool, move: int = 0, phase: str = "main"):
+        """Record one step (before its toggle is applied)."""
+        index = self._label_index.get(phase)
+        if index is None:
+            if len(self._labels) == MAX_PHASES:
+                raise ValueError(f"A trace holds at most {MAX_PHASES} phase labels.")
+            index = self._label_index[phase] = len(self._labels)
+            self._labels.append(phase)
+        self._buffer[self._fill] = (pos, 1 if toggle else 0, move, index)
+        self._fill += 1
+        self.steps += 1
+        if self._fill == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._fill:
+            self._file.write(self._buffer[:self._fill].tobytes())
+            self._fill = 0
+        self._file.flush()
+
+    def close(self, success: bool = False, estimate: Optional[int] = None,
+              correct: bool = False):
+        """Write the phase labels and the result into the header."""
+        if self._file is None:
+            return
+        self.flush()
+        labels_offset = self._file.tell()
+        self._file.write(json.dumps(self._labels).encode("utf-8"))
+        self._file.seek(0)
+        flags = 0 if estimate is None else FLAG_ESTIMATE
+        self._file.write(HEADER.pack(MAGIC, VERSION, flags, self.n, self.steps,
+                                     0 if estimate is None else estimate,
+                                     bool(success), bool(correct),
+                                     len(self.name), labels_offset))
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Trace:
+    """
+    Read-only, memory-mapped trace file.
+
+    Behaves like a StepHistory: ``trace[i]`` is ``(pos, lamps, toggle)``
+    with the ring before step i's toggle, and iteration replays all steps.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size or header[:8] != MAGIC:
+                raise ValueError(f"{path} is not a trace file.")
+            (_, version, flags, self.n, self.steps, estimate, success, correct,
+             name_length, labels_offset) = HEADER.unpack(header)
+            if version != VERSION:
+                raise ValueError(f"Unsupported trace version {version} in {path}.")
+            self.strategy = f.read(name_length).decode("utf-8")
+            packed = np.frombuffer(f.read((self.n + 7) // 8), dtype=np.uint8)
+            self.initial_lamps = np.unpackbits(packed, count=self.n, bitorder="little")
+            records_offset = f.tell()
+            if labels_offset:
+                f.seek(labels_offset)
+                self.phase_labels = json.loads(f.read().decode("utf-8"))
+            else:
+                # Unfinished trace: no result, labels unknown
+                self.phase_labels = []
+                size = os.path.getsize(path) - records_offset
+                self.steps = size // RECORD.itemsize
+        self.success = bool(success)
+        self.estimate = estimate if flags & FLAG_ESTIMATE else None
+        self.correct = bool(correct)
+        self.records = (np.memmap(path, dtype=RECORD, mode="r", offset=records_offset,
+                                  shape=(self.steps,))
+                        if self.steps else np.zeros(0, dtype=RECORD))
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.records["pos"]
+
+    @property
+    def toggles(self) -> np.ndarray:
+        return self.records["toggle"]
+
+    @property
+    def moves(self) -> np.ndarray:
+        return self.records["move"]
+
+    def phases(self) -> np.ndarray:
+        """Phase label of every step."""
+        labels = np.array(self.phase_labels or ["main"], dtype=object)
+        return labels[self.records["phase"]]
+
+    def phase_at(self, step: int) -> str:
+        index = int(self.records["phase"][step])
+        return self.phase_labels[index] if index < len(self.phase_labels) else "main"
+
+    def event_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(initial lamps, positions, toggles) as used by render()."""
+        return (self.initial_lamps, self.positions.astype(np.intp),
+                np.asarray(self.toggles, dtype=np.uint8))
+
+    def lamps_at(self, step: int) -> List[int]:
+        """Ring at the start of ``step`` (the initial ring XOR earlier toggles)."""
+        if step < 0:
+            step += self.steps
+        if not 0 <= step <= self.steps:
+            raise IndexError("trace step out of range")
+        toggled = self.positions[:step][self.toggles[:step] == 1]
+        flips = np.bincount(toggled, minlength=self.n) & 1
+        return (self.initial_lamps ^ flips.astype(np.uint8)).tolist()
+
+    def final_lamps(self) -> List[int]:
+        return self.lamps_at(self.steps)
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.steps
+        if not 0 <= index < self.steps:
+            raise IndexError("trace index out of range")
+        record = self.records[index]
+        return int(record["pos"]), self.lamps_at(index), bool(record["toggle"])
+
+    def __iter__(self) -> Iterator[Tuple[int, List[int], bool]]:
+        lamps = bytearray(self.initial_lamps.tobytes())
+        for pos, toggle in zip(self.positions.tolist(), self.toggles.tolist()):
+            yield pos, list(lamps), bool(toggle)
+            if toggle:
+                lamps[pos] ^= 1
+
+    def __repr__(self) -> str:
+        result = f"estimate={self.estimate}" if self.success else "no result"
+        return f"Trace({self.strategy!r}, n={self.n}, steps={self.steps}, {result})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and inspect simulation traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="simulate one configuration into a trace")
+    record.add_argument("n", type=int)
+    record.add_argument("k", type=int)
+    record.add_argument("strategy")
+    record.add_argument("path")
+    record.add_argument("--max-steps", type=int, default=5000)
+    info = commands.add_parser("info", help="print the result and phase breakdown")
+    info.add_argument("path")
+    image = commands.add_parser("render", help="render a trace like a simulation image")
+    image.add_argument("path")
+    image.add_argument("image")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        from strategies import strategies
+        from .simulator import simulate, _config_seed
+        simulate(args.n, strategies[args.strategy], args.max_steps,
+                 _config_seed(args.n, args.k), args.k, record=False, trace=args.path)
+        print(Trace(args.path))
+    elif args.command == "info":
+        from .analyzer import print_trace_report
+        print_trace_report(Trace(args.path))
+    else:
+        from .visualizer import render
+        render(Trace(args.path), args.image)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Find where two strategy versions start to behave differently.
+
+diff_runs() runs two strategies on the same initial ring in lockstep and
+stops comparing at the first step where position, toggle, move or the
+done flag differ; both runs then continue to the end to collect summary
+counters. No history is kept, so long runs cost constant memory.
+diff_traces() does the same for two recorded trace files, comparing the
+memory-mapped records block by block.
+
+    python -m utils.tracediff run 50 3 "Random Signature a=0.5 b=0.8 n=7" \
+        "Random Signature a=0.5 b=0.9 n=7"
+    python -m utils.tracediff traces old.trace new.trace
+"""
+import argparse
+import sys
+from itertools import zip_longest
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .simulator import initial_lamps, iter_steps
+from .trace import Trace
+
+# Records compared per block when diffing trace files
+BLOCK = 1 << 20
+
+
+class RunSummary:
+    """Counters of one run: steps, toggles, reversals, steps per phase, result."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.steps = 0
+        self.toggles = 0
+        self.reversals = 0
+        self.phases: Dict[str, int] = {}
+        self.success = False
+        self.estimate: Optional[int] = None
+        self.correct = False
+        self._last_move = 0
+
+    def add(self, toggle: bool, move: int, phase: str):
+        self.steps += 1
+        self.toggles += bool(toggle)
+        if move:
+            if self._last_move and move != self._last_move:
+                self.reversals += 1
+            self._last_move = move
+        self.phases[phase] = self.phases.get(phase, 0) + 1
+
+    @staticmethod
+    def from_trace(trace: Trace, name: Optional[str] = None) -> "RunSummary":
+        from .analyzer import trace_phases
+        summary = RunSummary(name or trace.strategy or trace.path)
+        phases = trace_phases(trace)
+        summary.steps = len(trace)
+        summary.toggles = int(phases['toggles'].sum())
+        summary.reversals = int(phases['reversals'].sum())
+        summary.phases = dict(zip(phases['phase'], phases['steps'].astype(int)))
+        summary.success, summary.estimate, summary.correct = \
+            trace.success, trace.estimate, trace.correct
+        return summary
+
+
+class TraceDiff:
+    """
+    Outcome of a diff: the first divergent step and both run summaries.
+
+    ``step`` is None when the runs are identical. ``a`` and ``b`` describe
+    that step in each run as dicts (pos, lamp, toggle, move, phase, done);
+    None for a run that had already stopped.
+    """
+
+    def __init__(self, step: Optional[int], a: Optional[Dict], b: Optional[Dict],
+                 summary_a: RunSummary, summary_b: RunSummary):
+        self.step = step
+        self.a = a
+        self.b = b
+        self.summary_a = summary_a
+        self.summary_b = summary_b
+
+    @property
+    def identical(self) -> bool:
+        return self.step is None
+
+    def summary(self) -> pd.DataFrame:
+        """Steps, toggles, reversals and result of both runs and their delta."""
+        rows = []
+        for field in ("steps", "toggles", "reversals", "success", "estimate", "correct"):
+            value_a = getattr(self.summary_a, field)
+            value_b = getattr(self.summary_b, field)
+            numeric = field in ("steps", "toggles", "reversals")
+            rows.append({"metric": field, "a": value_a, "b": value_b,
+                         "delta": value_b - value_a if numeric else None})
+        return pd.DataFrame(rows, dtype=object)
+
+    def phase_deltas(self) -> pd.DataFrame:
+        """Steps per phase in both runs (phases of a first)."""
+        phases = list(self.summary_a.phases)
+        phases += [phase for phase in self.summary_b.phases if phase not in phases]
+        steps_a = [self.summary_a.phases.get(phase, 0) for phase in phases]
+        steps_b = [self.summary_b.phases.get(phase, 0) for phase in phases]
+        return pd.DataFrame({"phase": phases, "steps_a": steps_a, "steps_b": steps_b,
+                             "delta": np.subtract(steps_b, steps_a, dtype=np.int64)})
+
+    def __repr__(self) -> str:
+        where = "identical" if self.identical else f"diverge at step {self.step}"
+        return f"TraceDiff({self.summary_a.name!r} vs {self.summary_b.name!r}: {where})"
+
+
+def _event(pos, lamp, toggle, move, phase, done) -> Dict:
+    return {"pos": int(pos), "lamp": None if lamp is None else int(lamp),
+            "toggle": bool(toggle), "move": int(move), "phase": phase, "done": bool(done)}
+
+
+def diff_runs(n: int, strategy_a: Callable, strategy_b: Callable,
+              k: Optional[int] = None, seed: Optional[int] = None,
+              max_steps: int = 5000, seeding: str = "legacy",
+              names=("a", "b")) -> TraceDiff:
+    """
+    Run two strategies in lockstep on the same (n, k, seed) ring.
+
+    Args:
+        n, k, seed, max_steps, seeding: As for simulate()
+        strategy_a, strategy_b: The versions to compare
+        names: Labels of the two runs in the report
+
+    Returns:
+        TraceDiff with the first step where (pos, toggle, move, done)
+        differ, or step None if the runs are identical
+    """
+    lamps = initial_lamps(n, k, seed, seeding)
+    summary_a, summary_b = RunSummary(names[0]), RunSummary(names[1])
+    first = None
+    for step, (event_a, event_b) in enumerate(zip_longest(
+            iter_steps(n, strategy_a, list(lamps), max_steps),
+            iter_steps(n, strategy_b, list(lamps), max_steps))):
+        for summary, event in ((summary_a, event_a), (summary_b, event_b)):
+            if event is not None:
+                pos, lamp, toggle, move, phase, done, estimate = event
+                summary.add(toggle, move, phase)
+                if done:
+                    summary.success, summary.estimate = True, estimate
+                    summary.correct = estimate == n
+        if first is None and (event_a is None or event_b is None
+                              or event_a[:4] != event_b[:4] or event_a[5] != event_b[5]):
+            first = (step,
+                     None if event_a is None else _event(*event_a[:6]),
+                     None if event_b is None else _event(*event_b[:6]))
+    if first is None:
+        return TraceDiff(None, None, None, summary_a, summary_b)
+    return TraceDiff(*first, summary_a, summary_b)
+
+
+def diff_traces(trace_a, trace_b) -> TraceDiff:
+    """
+    Compare two recorded traces (Trace objects or paths) record by record.
+
+    The traces should start from the same ring; a different initial ring
+    is reported as a divergence at step 0.
+    """
+    trace_a = Trace(trace_a) if isinstance(trace_a, str) else trace_a
+    trace_b = Trace(trace_b) if isinstance(trace_b, str) else trace_b
+    summary_a = RunSummary.from_trace(trace_a)
+    summary_b = RunSummary.from_trace(trace_b)
+
+    common = min(len(trace_a), len(trace_b))
+    step = None
+    if trace_a.n != trace_b.n or not np.array_equal(trace_a.initial_lamps, trace_b.initial_lamps):
+        step = 0
+    for start in range(0, common, BLOCK) if step is None else ():
+        stop = min(start + BLOCK, common)
+        block_a, block_b = trace_a.records[start:stop], trace_b.records[start:stop]
+        differs = ((block_a["pos"] != block_b["pos"])
+                   | (block_a["toggle"] != block_b["toggle"])
+                   | (block_a["move"] != block_b["move"]))
+        if differs.any():
+            step = start + int(np.argmax(differs))
+            break
+    if step is None and len(trace_a) != len(trace_b):
+        # Equal prefix: the shorter run stopped; a finished run's last step
+        # is where it said done while the other went on
+        shorter = trace_a if len(trace_a) < len(trace_b) else trace_b
+        step = common - 1 if shorter.success and common else common
+    if step is None:
+        return TraceDiff(None, None, None, summary_a, summary_b)
+    return TraceDiff(step, _trace_event(trace_a, step), _trace_event(trace_b, step),
+                     summary_a, summary_b)
+
+
+def _trace_event(trace: Trace, step: int) -> Optional[Dict]:
+    if step >= len(trace):
+        return None
+    record = trace.records[step]
+    lamps = trace.lamps_at(step)
+    done = trace.success and step == len(trace) - 1
+    return _event(record["pos"], lamps[int(record["pos"])], record["toggle"],
+                  record["move"], trace.phase_at(step), done)
+
+
+def print_diff(diff: TraceDiff):
+    """Print the first divergence and the summary deltas of a diff."""
+    a, b = diff.summary_a.name, diff.summary_b.name
+    print("\n" + "="*80)
+    print(f"TRACE DIFF: {a} vs {b}")
+    print("="*80)
+    if diff.identical:
+        print("\nIdentical: both runs take the same steps.")
+    else:
+        print(f"\nFirst divergent step: {diff.step}")
+        for name, event in ((a, diff.a), (b, diff.b)):
+            if event is None:
+                print(f"  {name:30s}: stopped before this step")
+            else:
+                print(f"  {name:30s}: pos={event['pos']} lamp={event['lamp']} "
+                      f"toggle={int(event['toggle'])} move={event['move']:+d} "
+                      f"done={event['done']} phase={event['phase']}")
+    print("\nSummary (delta = b - a):")
+    print(diff.summary().to_string(index=False))
+    print("\nSteps per phase:")
+    print(diff.phase_deltas().to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find where two strategy runs diverge")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="simulate two strategies in lockstep")
+    run.add_argument("n", type=int)
+    run.add_argument("k", type=int)
+    run.add_argument("strategy_a")
+    run.add_argument("strategy_b")
+    run.add_argument("--max-steps", type=int, default=5000)
+    traces = commands.add_parser("traces", help="compare two trace files")
+    traces.add_argument("trace_a")
+    traces.add_argument("trace_b")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        from strategies import strategies
+        from .simulator import _config_seed
+        diff = diff_runs(args.n, strategies[args.strategy_a], strategies[args.strategy_b],
+                         args.k, _config_seed(args.n, args.k), args.max_steps,
+                         names=(args.strategy_a, args.strategy_b))
+    else:
+        diff = diff_traces(args.trace_a, args.trace_b)
+    print_diff(diff)
+    return 0 if diff.identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Hyperparameter search for the Random-Signature strategy (a, b, min_l).
+
+Candidates are compared with successive halving: every candidate runs on a
+small part of the (n, k) grid, the better half (1/eta) moves on to a grid
+eta times larger, and so on until the survivors have run the full grid.
+Correctness is a hard constraint (a single failed or wrong run drops the
+candidate), mean steps is the objective. Simulations of a rung run in
+parallel, and results already in the result cache are reused.
+
+    python -m utils.tuning --candidates 27 --jobs 0 --save tuning_results.json
+    python main.py --tuned tuning_results.json      # register the winners
+"""
+import argparse
+import functools
+import json
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from strategies.random_signature import train_strategy_random_signature
+
+from .cache import ResultCache
+from .simulator import simulate, _config_seed, _resolve_workers
+
+# (n, k) grid candidates are judged on: small to large trains, all k modes
+DEFAULT_GRID = [(n, k) for n in (12, 48, 100, 200, 500) for k in (0, 1, 2, 3)]
+
+# Parameter ranges searched (min_l must be at least 1)
+DEFAULT_SPACE = {"a": (0.1, 1.0), "b": (0.3, 1.0), "min_l": (1, 16)}
+
+# Hand-picked variants from strategies/random_signature.py, always included
+BASELINE_PARAMS = [(0.5, 0.5, 3), (0.9, 0.6, 8), (0.6, 0.6, 10),
+                   (0.5, 0.9, 7), (0.5, 0.8, 7)]
+
+Params = Tuple[float, float, int]
+
+
+def signature_strategy(a: float, b: float, min_l: int) -> Callable:
+    """Random-Signature strategy with fixed parameters (picklable)."""
+    if min_l < 1:
+        raise ValueError("min_l must be at least 1.")
+    return functools.partial(train_strategy_random_signature, a=a, b=b, min_l=min_l)
+
+
+def tuned_name(a: float, b: float, min_l: int) -> str:
+    """Registry name of a tuned variant (full precision, unlike the title)."""
+    return f"Random Signature a={a:g} b={b:g} n={min_l} (tuned)"
+
+
+def sample_candidates(count: int, space: Optional[Dict] = None, seed: int = 0,
+                      include_baseline: bool = True) -> List[Params]:
+    """Random (a, b, min_l) candidates, a and b rounded to two decimals."""
+    space = space or DEFAULT_SPACE
+    rng = random.Random(seed)
+    candidates = list(BASELINE_PARAMS) if include_baseline else []
+    while len(candidates) < count:
+        params = (round(rng.uniform(*space["a"]), 2),
+                  round(rng.uniform(*space["b"]), 2),
+                  rng.randint(max(1, space["min_l"][0]), space["min_l"][1]))
+        if params not in candidates:
+            candidates.append(params)
+    return candidates[:count]
+
+
+def _evaluate(params: Params, n: int, k: int, max_steps: int) -> Dict:
+    """Run one candidate on one config (module-level for worker processes)."""
+    seed = _config_seed(n, k)
+    _, success, estimate, correct, steps = simulate(
+        n, signature_strategy(*params), max_steps, seed, k, record=False)
+    return {"n": n, "k": k, "success": success, "correct": correct,
+            "estimate": estimate, "steps": steps, "max_steps": max_steps,
+            "seed": seed}
+
+
+def pareto_front(df: pd.DataFrame, objectives: Sequence[str]) -> pd.Series:
+    """Boolean mask of rows not dominated in all (minimized) objectives."""
+    values = df[list(objectives)].to_numpy()
+    mask = []
+    for i, row in enumerate(values):
+        dominated = any((other <= row).all() and (other < row).any()
+                        for j, other in enumerate(values) if j != i)
+        mask.append(not dominated)
+    return pd.Series(mask, index=df.index)
+
+
+def successive_halving(candidates: Sequence[Params],
+                       grid: Sequence[Tuple[int, int]] = DEFAULT_GRID,
+                       max_steps: int = 20000, eta: int = 3,
+                       min_configs: int = 4, min_survivors: int = 4,
+                       workers: Optional[int] = None, grid_seed: int = 0,
+                       cache_dir: Optional[str] = None,
+                       verbose: bool = True) -> pd.DataFrame:
+    """
+    Successive halving over (a, b, min_l) candidates.
+
+    Args:
+        candidates: (a, b, min_l) tuples to compare
+        grid: (n, k) configs; shuffled once, rung r uses the first
+              min_configs * eta**r of them
+        max_steps: Step budget per simulation
+        eta: Only the best 1/eta of a rung are promoted
+        min_configs: Configs of the first rung
+        min_survivors: Candidates promoted at least (for the Pareto front)
+        workers: Worker processes (None/1 serial, 0 one per CPU)
+        grid_seed: Seed for the order of the grid
+        cache_dir: Result cache directory shared with compare_strategies
+
+    Returns:
+        DataFrame with one row per candidate: a, b, min_l, rung reached,
+        configs run, feasible, mean_steps, mean_efficiency,
+        worst_efficiency, and pareto (front over mean steps and worst
+        steps per wagon among candidates that ran the full grid)
+    """
+    grid = list(grid)
+    random.Random(grid_seed).shuffle(grid)
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    results: Dict[Params, List[Dict]] = {params: [] for params in candidates}
+    reached: Dict[Params, int] = {params: 0 for params in candidates}
+    alive = list(candidates)
+
+    workers = _resolve_workers(workers)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        rung = 0
+        while alive:
+            size = min(len(grid), min_configs * eta ** rung)
+            jobs = [(params, n, k) for params in alive
+                    for n, k in grid[len(results[params]):size]]
+            rows = _run_jobs(jobs, max_steps, executor, cache)
+            for (params, _, _), row in zip(jobs, rows):
+                results[params].append(row)
+                reached[params] = rung
+
+            # Correctness is a hard constraint, then rank by mean steps
+            feasible = [params for params in alive
+                        if all(r["success"] and r["correct"] for r in results[params])]
+            feasible.sort(key=lambda params: _mean_steps(results[params]))
+            if verbose:
+                best = (f", best {tuned_name(*feasible[0])}: "
+                        f"{_mean_steps(results[feasible[0]]):.1f} steps" if feasible else "")
+                print(f"Rung {rung}: {len(alive)} candidates on {size} configs, "
+                      f"{len(feasible)} correct{best}")
+            if size == len(grid):
+                break
+            alive = feasible[:max(min_survivors, math.ceil(len(feasible) / eta))]
+            rung += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    final_rung = rung
+    rows = []
+    for params in candidates:
+        runs = results[params]
+        feasible = bool(runs) and all(r["success"] and r["correct"] for r in runs)
+        rows.append({
+            "a": params[0],
+            "b": params[1],
+            "min_l": params[2],
+            "name": tuned_name(*params),
+            "rung": reached[params],
+            "configs": len(runs),
+            "feasible": feasible,
+            "mean_steps": _mean_steps(runs),
+            "mean_efficiency": sum(r["steps"] / r["n"] for r in runs) / len(runs) if runs else math.nan,
+            "worst_efficiency": max((r["steps"] / r["n"] for r in runs), default=math.nan),
+        })
+    df = pd.DataFrame(rows)
+    finalists = df["feasible"] & (df["rung"] == final_rung) & (df["configs"] == len(grid))
+    df["pareto"] = False
+    if finalists.any():
+        df.loc[finalists, "pareto"] = pareto_front(df[finalists], ["mean_steps", "worst_efficiency"])
+    return df.sort_values(["pareto", "feasible", "rung", "mean_steps"],
+                          ascending=[False, False, False, True]).reset_index(drop=True)
+
+
+def _mean_steps(runs: List[Dict]) -> float:
+    return sum(r["steps"] for r in runs) / len(runs) if runs else math.nan
+
+
+def _run_jobs(jobs: List[Tuple[Params, int, int]], max_steps: int,
+              executor: Optional[ProcessPoolExecutor],
+              cache: Optional[ResultCache]) -> List[Dict]:
+    """Result rows for (params, n, k) jobs, in job order."""
+    rows: List[Optional[Dict]] = [None] * len(jobs)
+    keys: List[Optional[str]] = [None] * len(jobs)
+    if cache is not None:
+        for index, (params, n, k) in enumerate(jobs):
+            keys[index] = cache.key(signature_strategy(*params), n, k,
+                                    _config_seed(n, k), max_steps)
+            rows[index] = cache.get(keys[index])
+    missing = [index for index, row in enumerate(rows) if row is None]
+    if executor is None:
+        computed = [_evaluate(*jobs[index], max_steps) for index in missing]
+    else:
+        futures = [executor.submit(_evaluate, *jobs[index], max_steps) for index in missing]
+        computed = [future.result() for future in futures]
+    for index, row in zip(missing, computed):
+        rows[index] = row
+        if cache is not None:
+            cache.put(keys[index], row)
+    return rows
+
+
+def save_tuning(df: pd.DataFrame, path: str):
+    """Write the tuning table (all candidates, Pareto flags) as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"candidates": df.to_dict(orient="records")}, f, indent=1)
+    print(f"Tuning results saved to: {path}")
+
+
+def register_winners(source, registry=None) -> List[str]:
+    """
+    Register the Pareto-optimal candidates as strategies.
+
+    Args:
+        source: Tuning DataFrame or path of a file written by save_tuning
+        registry: Strategy mapping (default: strategies.strategies)
+
+    Returns:
+        Names of the registered strategies
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            source = pd.DataFrame(json.load(f)["candidates"])
+    if registry is None:
+        from strategies import strategies as registry
+    names = []
+    for _, row in source[source["pareto"]].iterrows():
+        name = tuned_name(row["a"], row["b"], int(row["min_l"]))
+        registry[name] = signature_strategy(row["a"], row["b"], int(row["min_l"]))
+        names.append(name)
+    return names
+
+
+def print_tuning(df: pd.DataFrame):
+    print("\n" + "="*80)
+    print("RANDOM SIGNATURE TUNING (Pareto front: mean steps vs. worst steps/wagon)")
+    print("="*80)
+    for _, row in df[df["pareto"]].iterrows():
+        print(f"  {row['name']:45s} mean steps {row['mean_steps']:9.1f}  "
+              f"mean {row['mean_efficiency']:.2f} / worst {row['worst_efficiency']:.2f} steps/wagon")
+    eliminated = len(df) - int(df["feasible"].sum())
+    print(f"\n{len(df)} candidates, {eliminated} eliminated for failed or wrong results")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune Random-Signature parameters")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sizes", nargs="*", type=int,
+                        default=sorted({n for n, _ in DEFAULT_GRID}))
+    parser.add_argument("--ks", nargs="*", type=int, default=[0, 1, 2, 3])
+    parser.add_argument("--max-steps", type=int, default=20000)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes (1 = serial, 0 = one per CPU)")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--save", help="write the tuning table to this JSON file")
+    args = parser.parse_args(argv)
+
+    candidates = sample_candidates(args.candidates, seed=args.seed)
+    grid = [(n, k) for n in args.sizes for k in args.ks]
+    df = successive_halving(candidates, grid, args.max_steps, args.eta,
+                            workers=args.jobs, grid_seed=args.seed,
+                            cache_dir=args.cache_dir)
+    print_tuning(df)
+    if args.save:
+        save_tuning(df, args.save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
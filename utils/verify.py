@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Exhaustive correctness check over all 2^n initial lamp rings.
+
+Instead of simulating every ring on its own, the strategy runs on a ring
+whose lamps are unknown. The run only forks when the agent reads a wagon
+it has not seen before: one branch continues with the lamp OFF, the other
+(a copy of the strategy memory and ring) with the lamp ON. Everything
+before that read is simulated once for both. A finished branch stands for
+all 2^(n - wagons read) rings that agree on the wagons it read, since the
+strategy never saw the others.
+
+Branches also merge: many strategies overwrite the lamps they pass, so
+different prefixes often fork again in exactly the same state (position,
+step, ring, wagons read, pickled memory). The subtree below such a state
+is explored once and its result reused.
+
+With workers, the first forks are expanded in the parent and the
+resulting subtrees are explored in worker processes. The counts do not
+depend on the number of workers; simulated_steps does, as subtrees in
+different processes cannot share merged states.
+"""
+import copy
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# Subtrees handed out per worker process
+SUBTREES_PER_WORKER = 8
+
+# Explored states remembered for merging branches (per process)
+MEMO_LIMIT = 50000
+
+
+class Verification:
+    """
+    Outcome of exploring (part of) the configuration tree of one n.
+
+    Counts are in configurations (initial rings), not branches.
+    simulated_steps is what the tree cost, independent_steps what 2^n
+    separate simulations would have cost.
+    """
+
+    def __init__(self, n: int, examples: int = 5):
+        self.n = n
+        self.examples = examples
+        self.configurations = 0
+        self.correct = 0
+        self.wrong = 0
+        self.timeouts = 0
+        self.branches = 0
+        self.merged = 0
+        self.max_steps_used = 0
+        self.simulated_steps = 0
+        self.independent_steps = 0
+        self.counterexamples: List[Dict] = []
+
+    def add_leaf(self, first: bytearray, read: int, success: bool,
+                 estimate: Optional[int], steps: int):
+        """Record a finished branch; first holds the initial lamps it read."""
+        covered = 1 << (self.n - read)
+        self.configurations += covered
+        self.branches += 1
+        self.independent_steps += steps * covered
+        if success and estimate == self.n:
+            self.correct += covered
+            self.max_steps_used = max(self.max_steps_used, steps)
+            return
+        if success:
+            self.wrong += covered
+        else:
+            self.timeouts += covered
+        if len(self.counterexamples) < self.examples:
+            # Wagons never read are reported OFF; any value fails the same way
+            self.counterexamples.append({"lamps": list(first), "success": success,
+                                         "estimate": estimate, "steps": steps,
+                                         "unread_wagons": self.n - read})
+
+    def merge(self, other: "Verification"):
+        """Add the counts of another part of the tree (taken in tree order)."""
+        for field in ("configurations", "correct", "wrong", "timeouts", "branches",
+                      "merged", "simulated_steps", "independent_steps"):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.max_steps_used = max(self.max_steps_used, other.max_steps_used)
+        room = self.examples - len(self.counterexamples)
+        self.counterexamples.extend(other.counterexamples[:max(0, room)])
+
+    def reused(self, first: bytearray, seen: bytearray) -> "Verification":
+        """
+        This subtree's result for another branch that reached the same state.
+
+        Nothing is simulated again; counterexamples take the other
+        branch's initial lamps on the wagons read before the state.
+        """
+        result = copy.copy(self)
+        result.simulated_steps = 0
+        result.merged += 1
+        result.counterexamples = [
+            dict(example, lamps=[lamp if not known else initial for lamp, known, initial
+                                 in zip(example["lamps"], seen, first)])
+            for example in self.counterexamples]
+        return result
+
+    @property
+    def verified(self) -> bool:
+        """Every one of the 2^n configurations returned the correct n."""
+        return self.correct == 1 << self.n
+
+    def __repr__(self) -> str:
+        status = "verified" if self.verified else f"{self.wrong + self.timeouts} failing"
+        return (f"Verification(n={self.n}, {status}, {self.configurations} configurations, "
+                f"{self.branches} branches)")
+
+
+def _root(n: int) -> tuple:
+    # (pos, steps, memory, lamps, read flags, initial lamps, wagons read)
+    return 0, 0, {}, bytearray(n), bytearray(n), bytearray(n), 0
+
+
+def _advance(n: int, strategy: Callable, branch: tuple, max_steps: int,
+             result: Verification) -> Optional[tuple]:
+    """
+    Run a branch until it ends or reads an unseen wagon.
+
+    A finished branch is added to result and None returned. At an unseen
+    wagon the branch continues as the lamp-OFF child (its objects are
+    reused) and the lamp-ON child is returned.
+    """
+    pos, steps, memory, lamps, seen, first, read = branch
+    start = steps
+    while steps < max_steps:
+        if not seen[pos]:
+            seen[pos] = 1
+            other = (pos, steps, copy.deepcopy(memory), bytearray(lamps),
+                     bytearray(seen), bytearray(first), read + 1)
+            other[3][pos] = other[5][pos] = 1
+            result.simulated_steps += steps - start
+            return (pos, steps, memory, lamps, seen, first, read + 1), other
+        toggle, move, memory, done, estimate = strategy(lamps[pos], memory)
+        steps += 1
+        if toggle:
+            lamps[pos] ^= 1
+        if done:
+            result.simulated_steps += steps - start
+            result.add_leaf(first, read, True, estimate, steps)
+            return None
+        if move not in [-1, 0, +1]:
+            raise ValueError("Strategy move must be -1, 0, or +1.")
+        pos = (pos + move) % n
+    result.simulated_steps += steps - start
+    result.add_leaf(first, read, False, None, steps)
+    return None
+
+
+def _state_key(branch: tuple) -> Optional[bytes]:
+    """Everything the rest of a branch depends on; None if memory won't pickle."""
+    pos, steps, memory, lamps, seen = branch[:5]
+    try:
+        state = pickle.dumps(memory, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    return b"%d:%d:" % (pos, steps) + bytes(lamps) + bytes(seen) + state
+
+
+def _explore(n: int, strategy: Callable, branch: tuple, max_steps: int,
+             examples: int, memo: Optional[Dict] = None) -> Verification:
+    """Depth-first exploration of one subtree (lamp OFF before ON)."""
+    memo = {} if memo is None else memo
+    result = Verification(n, examples)
+    fork = _advance(n, strategy, branch, max_steps, result)
+    for child in fork or ():
+        key = _state_key(child)
+        known = memo.get(key) if key is not None else None
+        if known is not None:
+            result.merge(known.reused(child[5], child[4]))
+            continue
+        part = _explore(n, strategy, child, max_steps, examples, memo)
+        if key is not None and len(memo) < MEMO_LIMIT:
+            memo[key] = part
+        result.merge(part)
+    return result
+
+
+def _split(n: int, strategy: Callable, max_steps: int, target: int,
+           examples: int) -> list:
+    """
+    Expand the tree breadth-first until there are target open branches.
+
+    Returns the frontier in tree order: open branches and Verification
+    objects of branches that already finished.
+    """
+    frontier = [_root(n)]
+    while True:
+        open_branches = sum(isinstance(item, tuple) for item in frontier)
+        if open_branches == 0 or open_branches >= target:
+            return frontier
+        expanded = []
+        for item in frontier:
+            if not isinstance(item, tuple):
+                expanded.append(item)
+                continue
+            result = Verification(n, examples)
+            fork = _advance(n, strategy, item, max_steps, result)
+            if result.simulated_steps or result.branches:
+                expanded.append(result)
+            if fork is not None:
+                expanded.extend(fork)
+        frontier = expanded
+
+
+def verify(n: int, strategy: Callable, max_steps: int = 5000,
+           workers: Optional[int] = None, examples: int = 5) -> Verification:
+    """
+    Run a strategy on every initial configuration of n wagons.
+
+    Args:
+        n: Number of wagons
+        strategy: Any strategy simulate() accepts through the
+                  (lamp_state, memory) protocol; its memory must be
+                  deep-copyable (and picklable with workers)
+        max_steps: Step limit per configuration; longer runs count as
+                   timeouts
+        workers: Worker processes (None or 1 = serial, 0 = one per CPU)
+        examples: Failing configurations kept as counterexamples
+
+    Returns:
+        Verification; verified is True if all 2^n rings return n
+    """
+    from .simulator import _resolve_workers
+    workers = _resolve_workers(workers)
+    if workers == 1:
+        return _explore(n, strategy, _root(n), max_steps, examples)
+
+    total = Verification(n, examples)
+    frontier = _split(n, strategy, max_steps, workers * SUBTREES_PER_WORKER, examples)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = [executor.submit(_explore, n, strategy, item, max_steps, examples)
+                 if isinstance(item, tuple) else item for item in frontier]
+        for part in parts:
+            total.merge(part if isinstance(part, Verification) else part.result())
+    return total
+
+
+def verify_strategies(sizes: Iterable[int], strategies: Dict[str, Callable],
+                      max_steps: int = 5000, workers: Optional[int] = None,
+                      abort_incorrect_strategies: bool = True,
+                      verbose: bool = True) -> pd.DataFrame:
+    """
+    Exhaustively verify strategies for several train lengths.
+
+    Args:
+        sizes: Train lengths n, ascending (2^n configurations each)
+        strategies: Dictionary of strategy_name -> strategy_function
+        max_steps: Step limit per configuration
+        workers: Worker processes per verification
+        abort_incorrect_strategies: Skip a strategy at larger n once it
+            failed a configuration
+
+    Returns:
+        DataFrame with one row per (n, strategy); 'counterexample' holds
+        the first failing ring as a 0/1 string (None if verified)
+    """
+    rows = []
+    failed = set()
+    for n in sizes:
+        for strategy_name, strategy in strategies.items():
+            if strategy_name in failed and abort_incorrect_strategies:
+                continue
+            result = verify(n, strategy, max_steps, workers, examples=1)
+            example = result.counterexamples[0] if result.counterexamples else None
+            rows.append({
+                'n': n,
+                'strategy': strategy_name,
+                'verified': result.verified,
+                'configurations': result.configurations,
+                'wrong': result.wrong,
+                'timeouts': result.timeouts,
+                'max_steps_used': result.max_steps_used,
+                'branches': result.branches,
+                'simulated_steps': result.simulated_steps,
+                'independent_steps': result.independent_steps,
+                'step_ratio': result.simulated_steps / result.independent_steps
+                              if result.independent_steps else None,
+                'counterexample': ''.join(map(str, example['lamps'])) if example else None,
+            })
+            if not result.verified:
+                failed.add(strategy_name)
+            if verbose:
+                print(f"Verify: n={n}, strategy={strategy_name}: "
+                      + ("all correct" if result.verified else
+                         f"{result.wrong} wrong, {result.timeouts} timeouts")
+                      + f" ({result.configurations} configurations, "
+                        f"{result.simulated_steps} steps simulated)")
+    return pd.DataFrame(rows)
@@ -9,7 +9,7 @@ Created on Sun Dec  7 18:14:35 2025
 Visualization functions for simulation results
 """
 
-from PIL import Image, ImageDraw
+from PIL import Image
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -17,34 +17,64 @@ import os
 from matplotlib.lines import Line2D
 
 
+# Palette index -> RGB colour used by render()
+RENDER_PALETTE = [
+    (255, 255, 255),  # 0: background between wagons
+    (60, 60, 60),     # 1: OFF, no agent
+    (200, 200, 200),  # 2: ON, no agent
+    (50, 60, 150),    # 3: OFF with agent
+    (140, 160, 255),  # 4: ON with agent
+    (180, 40, 40),    # 5: toggle OFF→ON
+    (255, 120, 120),  # 6: toggle ON→OFF
+]
+
+# Above this many rows, visualize_results() draws every distinct point once
+MAX_PLOT_ROWS = 20000
+
+
+def _history_arrays(history):
+    """
+    Return (lamps, positions, toggles) arrays for a history.
+    
+    lamps has shape (steps, n) and holds the ring before each step's toggle.
+    A StepHistory or Trace is expanded from its initial lamps and toggle
+    log without rebuilding a list per step.
+    """
+    if hasattr(history, "event_arrays"):
+        initial, positions, toggles = history.event_arrays()
+        steps = len(positions)
+        # Toggles applied before step i = exclusive running XOR of the log
+        flips = np.zeros((steps, history.n), dtype=np.uint8)
+        flips[np.arange(steps)[1:], positions[:-1]] = toggles[:-1]
+        np.bitwise_xor.accumulate(flips, axis=0, out=flips)
+        return flips ^ initial, positions, toggles
+    
+    positions = np.array([pos for pos, _, _ in history], dtype=np.intp)
+    lamps = np.array([lamps for _, lamps, _ in history], dtype=np.uint8)
+    toggles = np.array([bool(t) for _, _, t in history], dtype=np.uint8)
+    return lamps, positions, toggles
+
+
 def render(history, filename: str = None):
     """
     Produces an image where:
-      - each wagon = 4 pixels wide
+      - each wagon = 4 pixels wide (3 coloured + 1 white gap)
       - each step = 1 pixel high
+    
+    The image is built as one palette-index array and saved as an
+    indexed ("P" mode) PNG with RENDER_PALETTE.
     """
-    n = len(history[0][1])
-    h = len(history)
-    width = n * 4
-    height = h
-    img = Image.new("RGB", (width, height), "white")
-    draw = ImageDraw.Draw(img)
-    
-    for y, (pos, lamps, toggled) in enumerate(history):
-        for i, lamp in enumerate(lamps):
-            x = i * 4
-            if lamp == 1:
-                color = (200, 200, 200)
-            else:
-                color = (60, 60, 60)
-            
-            if i == pos:
-                if toggled:
-                    color = (255, 120, 120) if lamp else (180, 40, 40)
-                else:
-                    color = (140, 160, 255) if lamp else (50, 60, 150)
-            
-            draw.rectangle([x, y, x + 2, y], fill=color)
+    lamps, positions, toggles = _history_arrays(history)
+    h, n = lamps.shape
+    
+    codes = lamps + 1
+    rows = np.arange(h)
+    codes[rows, positions] = 3 + lamps[rows, positions] + 2 * toggles
+    
+    pixels = np.zeros((h, n, 4), dtype=np.uint8)
+    pixels[:, :, :3] = codes[:, :, None]
+    img = Image.fromarray(pixels.reshape(h, n * 4))
+    img.putpalette([channel for color in RENDER_PALETTE for channel in color])
     
     if filename:
         img.save(filename)
@@ -73,43 +103,36 @@ def visualize_results(df: pd.DataFrame, output_dir: str = "simulation_results"):
     # Prepare data for plotting
     df_plot = df.copy()
     
-    # Find max steps for scaling error positions
-    max_steps = df_plot['steps'].max() if df_plot['steps'].notna().any() else 100
-    
-    # Assign y-values with jitter for error cases
-    def get_y_value(row, strategy_index, total_strategies):
-        if not row['success']:
-            # No solution - position based on strategy index with jitter
-            base_y = -max_steps * 0.015
-            jitter = -(strategy_index/total_strategies) * (max_steps * 0.005)
-            return base_y + jitter
-        elif not row['correct']:
-            # Wrong result - different level
-            base_y = -max_steps * 0.005
-            jitter = -(strategy_index/total_strategies) * (max_steps * 0.005)
-            return base_y + jitter
-        else:
-            # Success with correct result
-            return row['steps']
+    # Find max steps for scaling error positions (float: stored results
+    # may use compact integer dtypes)
+    max_steps = float(df_plot['steps'].max()) if df_plot['steps'].notna().any() else 100
     
     strategy_to_index = {s: i for i, s in enumerate(strategy_list)}
-    
-    # Apply y-value calculation
-    df_plot['plot_y'] = df_plot.apply(
-        lambda row: get_y_value(row, strategy_to_index[row['strategy']], len(strategy_list)), 
-        axis=1
+    strategy_index = df_plot['strategy'].map(strategy_to_index).to_numpy(dtype=int)
+    df_plot['strategy_index'] = strategy_index
+    
+    # Assign y-values with jitter for error cases (whole columns at once)
+    success = df_plot['success'].to_numpy(dtype=bool)
+    correct = df_plot['correct'].to_numpy(dtype=bool)
+    jitter = -(strategy_index / len(strategy_list)) * (max_steps * 0.005)
+    df_plot['plot_y'] = np.select(
+        [~success, ~correct],
+        # No solution / wrong result: two levels below zero, by strategy index
+        [-max_steps * 0.015 + jitter, -max_steps * 0.005 + jitter],
+        # Success with correct result
+        default=df_plot['steps'].to_numpy(dtype=float)
     )
     
     # Add result type for coloring
-    def get_result_type(row):
-        if not row['success']:
-            return 'no_solution'
-        elif not row['correct']:
-            return 'wrong_result'
-        else:
-            return 'correct'
+    df_plot['result_type'] = np.select([~success, ~correct],
+                                       ['no_solution', 'wrong_result'],
+                                       default='correct')
     
-    df_plot['result_type'] = df_plot.apply(get_result_type, axis=1)
+    # Millions of stored rows (e.g. Monte Carlo runs) repeat the same points;
+    # drawing each once keeps the plots fast and looking the same
+    points = df_plot
+    if len(df_plot) > MAX_PLOT_ROWS:
+        points = df_plot.drop_duplicates(['strategy_index', 'n', 'result_type', 'plot_y'])
     
     # Create figure with 5 subplots (4 plots + 1 ranking)
     fig = plt.figure(figsize=(16, 14))
@@ -130,14 +153,14 @@ def visualize_results(df: pd.DataFrame, output_dir: str = "simulation_results"):
     ax1 = plt.subplot(3, 2, 1)
     
     # Calculate which strategies are 100% correct
-    strategy_success = df.groupby('strategy')['correct'].mean()
+    strategy_success = df.groupby('strategy', observed=True)['correct'].mean()
     perfect_strategies = strategy_success[strategy_success == 1.0].index.tolist()
     
     if perfect_strategies:
         # Plot only perfect strategies
         for strategy in perfect_strategies:
-            mask = (df_plot['strategy'] == strategy) & (df_plot['result_type'] == 'correct')
-            subset = df_plot[mask]
+            mask = (points['strategy'] == strategy) & (points['result_type'] == 'correct')
+            subset = points[mask]
             
             if len(subset) > 0:
                 # Sort by n for better line connections
@@ -214,24 +237,15 @@ def visualize_results(df: pd.DataFrame, output_dir: str = "simulation_results"):
     error_counts_data = []
     error_types = ['correct', 'wrong_result', 'no_solution']
     
-    # Initialize counts for each strategy
-    for strategy in strategy_list:
+    # Count rows per (strategy, result type)
+    counts_table = pd.crosstab(df_plot['strategy_index'], df_plot['result_type'])
+    for index, strategy in enumerate(strategy_list):
         counts = {'strategy': strategy}
         for error_type in error_types:
-            counts[error_type] = 0
+            counts[error_type] = int(counts_table.at[index, error_type]) \
+                if index in counts_table.index and error_type in counts_table.columns else 0
         error_counts_data.append(counts)
     
-    # Fill counts from dataframe
-    for _, row in df_plot.iterrows():
-        strategy = row['strategy']
-        result_type = row['result_type']
-        
-        # Find the index of this strategy in our list
-        for counts in error_counts_data:
-            if counts['strategy'] == strategy:
-                counts[result_type] += 1
-                break
-    
     # Convert to arrays for plotting
     correct_counts = [c['correct'] for c in error_counts_data]
     wrong_counts = [c['wrong_result'] for c in error_counts_data]
@@ -277,13 +291,13 @@ def visualize_results(df: pd.DataFrame, output_dir: str = "simulation_results"):
     
     # Add small jitter to x-position to separate points
     np.random.seed(42)  # For reproducible jitter
-    df_plot['n_jittered'] = df_plot['n'] + np.random.uniform(-0.2, 0.2, len(df_plot))
+    points = points.assign(n_jittered=points['n'] + np.random.uniform(-0.2, 0.2, len(points)))
     
     # Plot different result types
     for result_type, color in result_colors.items():
-        mask = df_plot['result_type'] == result_type
+        mask = points['result_type'] == result_type
         if mask.any():
-            subset = df_plot[mask]
+            subset = points[mask]
             
             # Different markers for different result types
             marker = 'o' if result_type == 'correct' else 's' if result_type == 'wrong_result' else 'X'
@@ -292,7 +306,7 @@ def visualize_results(df: pd.DataFrame, output_dir: str = "simulation_results"):
                         'no_solution': 'No Solution'}
             
             ax4.scatter(subset['n_jittered'], subset['plot_y'],
-                       c=[color_dict[s] for s in subset['strategy']],
+                       c=strategy_colors[subset['strategy_index'].to_numpy()],
                        marker=marker,
                        s=80,
                        edgecolors='black',